@@ -1,8 +1,14 @@
 from .auth import get_user_repository, get_auth_service, get_current_user, restrict_to_role
-from .db import get_db_session
-from .customer import get_customer_repository, get_customer_service
-from .product import get_product_repository, get_product_service
-from .order import get_order_repository, get_order_service, get_customer_repository
-from .whatsapp import get_whatsapp_service
+from .db import get_db_session, get_read_db_session
+from .customer import get_customer_repository, get_customer_service, get_read_customer_repository, get_read_customer_service
+from .product import get_product_repository, get_product_service, get_read_product_repository, get_read_product_service
+from .order import get_order_repository, get_order_service, get_customer_repository, get_read_order_repository, get_read_order_service
+from .whatsapp import get_whatsapp_service, close_whatsapp_service
 from .permissions import require_admin
 
+
+from .idempotency import get_idempotency_repository, get_idempotency_service
+from .report import get_report_repository, get_read_report_repository, get_read_report_service
+from .order_event import (
+    get_order_event_repository, get_dead_letter_repository, get_order_event_dispatcher, get_running_order_event_dispatcher
+)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.api.dependencies.db import get_db_session
@@ -19,7 +20,7 @@ async def get_current_user(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> UserModel:
     try:
-        user = auth_service.verify_token(token) 
+        user = await run_in_threadpool(auth_service.verify_token, token)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
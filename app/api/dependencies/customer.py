@@ -1,6 +1,6 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from app.api.dependencies.db import get_db_session
+from app.api.dependencies.db import get_db_session, get_read_db_session
 from app.services.customer import CustomerService
 from app.db.repositories.customers import CustomerRepository
 
@@ -9,4 +9,10 @@ def get_customer_repository(db: Session = Depends(get_db_session)):
     return CustomerRepository(db)
 
 def get_customer_service(customer_repo: CustomerRepository = Depends(get_customer_repository)):
-    return CustomerService(customer_repo)
\ No newline at end of file
+    return CustomerService(customer_repo)
+
+def get_read_customer_repository(db: Session = Depends(get_read_db_session)):
+    return CustomerRepository(db)
+
+def get_read_customer_service(customer_repo: CustomerRepository = Depends(get_read_customer_repository)):
+    return CustomerService(customer_repo)
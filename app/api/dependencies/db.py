@@ -1,15 +1,36 @@
-from fastapi import Depends
+import hashlib
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
-from app.db.connection import session
+from app.db.connection import session, replica_router
 from sqlalchemy.orm import Session
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="user/login")
 
 def get_db_session():
+    db = session()
     try:
-        db = session()
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+def get_client_key(request: Request) -> str:
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return request.client.host if request.client else "anonymous"
+
+def get_read_db_session(request: Request, db: Session = Depends(get_db_session)):
+    replica_db = replica_router.session_for_read(get_client_key(request))
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
     
@@ -0,0 +1,28 @@
+from typing import Annotated
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.db import get_db_session
+from app.db.connection import session
+from app.db.repositories.idempotency import IdempotencyRepository
+from app.models.domain.user import UserModel
+from app.services.idempotency import IdempotencyKeyPurger, IdempotencyService
+
+_idempotency_key_purger_instance = None
+
+def get_idempotency_repository(db: Annotated[Session, Depends(get_db_session)]) -> IdempotencyRepository:
+    return IdempotencyRepository(db)
+
+def get_idempotency_service(
+    idempotency_repository: Annotated[IdempotencyRepository, Depends(get_idempotency_repository)],
+    current_user: Annotated[UserModel, Depends(get_current_user)]
+) -> IdempotencyService:
+    return IdempotencyService(idempotency_repository, current_user.id, session_factory=session)
+
+
+def get_idempotency_key_purger() -> IdempotencyKeyPurger:
+    global _idempotency_key_purger_instance
+    if _idempotency_key_purger_instance is None:
+        _idempotency_key_purger_instance = IdempotencyKeyPurger(session)
+    return _idempotency_key_purger_instance
@@ -1,15 +1,20 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
-from app.api.dependencies.db import get_db_session
-from app.api.dependencies.product import get_product_service 
-from app.api.dependencies.customer import get_customer_repository
+from app.api.dependencies.db import get_db_session, get_read_db_session
+from app.api.dependencies.product import get_product_service, get_read_product_service
+from app.api.dependencies.customer import get_customer_repository, get_read_customer_repository
+from app.api.dependencies.report import get_report_repository
+from app.api.dependencies.order_event import get_order_event_repository, get_running_order_event_dispatcher
 from app.services.products import ProductService
 
 from app.db.repositories.orders import OrderRepository
 from app.db.repositories.customers import CustomerRepository 
+from app.db.repositories.reports import ReportRepository
+from app.db.repositories.order_events import OrderEventRepository
 from app.services.order import OrderService
+from app.services.order_events import OrderEventDispatcher
 from app.services.whatsapp_service import WhatsappService
 from app.api.dependencies.whatsapp import get_whatsapp_service
 
@@ -20,6 +25,23 @@ def get_order_service(
     order_repository: Annotated[OrderRepository, Depends(get_order_repository)],
     product_service: Annotated[ProductService, Depends(get_product_service)], 
     customer_repository: Annotated[CustomerRepository, Depends(get_customer_repository)], 
+    report_repository: Annotated[ReportRepository, Depends(get_report_repository)],
+    event_repository: Annotated[Optional[OrderEventRepository], Depends(get_order_event_repository)],
+    event_dispatcher: Annotated[Optional[OrderEventDispatcher], Depends(get_running_order_event_dispatcher)],
     whatsapp_service: Annotated[WhatsappService, Depends(get_whatsapp_service)] = None
 ) -> OrderService:
-    return OrderService(order_repository, product_service, customer_repository, whatsapp_service)
\ No newline at end of file
+    return OrderService(
+        order_repository, product_service, customer_repository, whatsapp_service,
+        report_repository, event_repository, event_dispatcher
+    )
+
+def get_read_order_repository(db: Annotated[Session, Depends(get_read_db_session)]) -> OrderRepository:
+    return OrderRepository(db)
+
+def get_read_order_service(
+    order_repository: Annotated[OrderRepository, Depends(get_read_order_repository)],
+    product_service: Annotated[ProductService, Depends(get_read_product_service)],
+    customer_repository: Annotated[CustomerRepository, Depends(get_read_customer_repository)],
+    whatsapp_service: Annotated[WhatsappService, Depends(get_whatsapp_service)] = None
+) -> OrderService:
+    return OrderService(order_repository, product_service, customer_repository, whatsapp_service)
@@ -0,0 +1,34 @@
+from typing import Annotated, Optional
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.api.dependencies.db import get_db_session
+from app.api.dependencies.whatsapp import get_whatsapp_service
+from app.core.config import settings
+from app.db.connection import session
+from app.db.repositories.order_events import OrderEventRepository
+from app.services.order_events import OrderEventDispatcher
+
+_order_event_dispatcher_instance = None
+
+def get_order_event_repository(db: Annotated[Session, Depends(get_db_session)]) -> Optional[OrderEventRepository]:
+    # The outbox table is only written with the database backend.
+    if settings.ORDER_EVENTS_BACKEND != "database":
+        return None
+    return OrderEventRepository(db)
+
+def get_dead_letter_repository(db: Annotated[Session, Depends(get_db_session)]) -> OrderEventRepository:
+    # Dead letters are written with either backend.
+    return OrderEventRepository(db)
+
+def get_order_event_dispatcher() -> OrderEventDispatcher:
+    global _order_event_dispatcher_instance
+    if _order_event_dispatcher_instance is None:
+        _order_event_dispatcher_instance = OrderEventDispatcher(session, get_whatsapp_service())
+    return _order_event_dispatcher_instance
+
+def get_running_order_event_dispatcher() -> Optional[OrderEventDispatcher]:
+    """The dispatcher of this process, or None when it is not started here."""
+    if not settings.ORDER_EVENTS_DISPATCHER_ENABLED:
+        return None
+    return get_order_event_dispatcher()
@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, List, Optional
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_cursor(sort: str, values: List[Any]) -> str:
+    payload = json.dumps({"s": sort, "v": [_jsonable(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[List[Any]]:
+    """Returns the sort key values stored in ``cursor``, or None when no cursor was sent.
+
+    A cursor is only valid for the ordering it was issued for.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    if cursor_sort != sort or not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match the requested ordering"
+        )
+    return values
+
+
+def set_next_cursor(response: Response, items: list, limit: int, sort: str, sort_key: Callable[[Any], List[Any]]) -> None:
+    """Adds the cursor for the page after ``items`` when the page came back full."""
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, sort_key(items[-1]))
@@ -0,0 +1,18 @@
+from typing import Annotated
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.api.dependencies.db import get_db_session, get_read_db_session
+from app.db.repositories.reports import ReportRepository
+from app.services.reports import ReportService
+
+def get_report_repository(db: Annotated[Session, Depends(get_db_session)]) -> ReportRepository:
+    return ReportRepository(db)
+
+def get_read_report_repository(db: Annotated[Session, Depends(get_read_db_session)]) -> ReportRepository:
+    return ReportRepository(db)
+
+def get_read_report_service(
+    report_repository: Annotated[ReportRepository, Depends(get_read_report_repository)]
+) -> ReportService:
+    return ReportService(report_repository)
@@ -6,4 +6,9 @@ def get_whatsapp_service() -> WhatsappService:
     global _whatsapp_service_instance
     if _whatsapp_service_instance is None:
         _whatsapp_service_instance = WhatsappService()
-    return _whatsapp_service_instance
\ No newline at end of file
+    return _whatsapp_service_instance
+
+async def close_whatsapp_service() -> None:
+    # Only the instance that was actually created holds pooled connections.
+    if _whatsapp_service_instance is not None:
+        await _whatsapp_service_instance.close()
\ No newline at end of file
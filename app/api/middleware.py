@@ -0,0 +1,43 @@
+import logging
+import time
+
+from starlette.requests import Request
+
+from app.api.dependencies.db import get_client_key
+from app.core.config import settings
+from app.db.connection import replica_router
+from app.db.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if replica_router.enabled and request.method in WRITE_METHODS:
+        replica_router.mark_write(get_client_key(request))
+    return response
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_query_stats.reset(token)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    if settings.SERVER_TIMING_ENABLED:
+        response.headers.append(
+            "Server-Timing",
+            f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}'
+        )
+    if stats.count > settings.SQL_QUERY_BUDGET or stats.duration_ms > settings.SQL_TIME_BUDGET_MS:
+        logger.warning(
+            f"{request.method} {request.url.path} exceeded the SQL budget: "
+            f"{stats.count} queries, {stats.duration_ms:.2f} ms in the database, {total_ms:.2f} ms total"
+        )
+    return response
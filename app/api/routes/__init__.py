@@ -2,6 +2,8 @@ from .auth_route import auth_route
 from .customer_route import customer_route
 from .product_route import product_route
 from .order_route import order_route
+from .admin_route import admin_route
+from .report_route import report_route
 from fastapi import APIRouter
 
 router = APIRouter()
@@ -9,4 +11,6 @@ router = APIRouter()
 router.include_router(auth_route)
 router.include_router(customer_route)
 router.include_router(product_route)
-router.include_router(order_route)
\ No newline at end of file
+router.include_router(order_route)
+router.include_router(admin_route)
+router.include_router(report_route)
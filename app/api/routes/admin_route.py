@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, List, Optional
+
+from app.api.dependencies import get_dead_letter_repository, get_whatsapp_service, require_admin
+from app.db.connection import get_pool_stats
+from app.db.repositories.order_events import OrderEventRepository
+from app.models.schemas.admin import DeadLetterReplayResponse, DeadLetterResponse, PoolStatsResponse, WhatsappStatsResponse
+from app.services.dead_letters import REPLAY_BATCH_SIZE, replay_dead_letters
+from app.services.whatsapp_service import WhatsappService
+
+admin_route = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+@admin_route.get("/db/pool", response_model=Dict[str, PoolStatsResponse])
+def database_pool_stats():
+    return get_pool_stats()
+
+@admin_route.get("/whatsapp", response_model=WhatsappStatsResponse)
+async def whatsapp_stats(whatsapp_service: WhatsappService = Depends(get_whatsapp_service)):
+    # On the event loop, like the sends whose limiter and breaker it reads.
+    return whatsapp_service.stats()
+
+@admin_route.get("/notifications/dead-letters", response_model=List[DeadLetterResponse])
+def list_dead_letters(
+    limit: int = Query(50, ge=1, le=500),
+    include_replayed: bool = Query(False),
+    repository: OrderEventRepository = Depends(get_dead_letter_repository)
+):
+    return repository.get_dead_letters(limit, include_replayed)
+
+@admin_route.post("/notifications/dead-letters/replay", response_model=DeadLetterReplayResponse)
+async def replay_notifications(
+    limit: int = Query(100, ge=1, le=1000),
+    batch_size: int = Query(REPLAY_BATCH_SIZE, ge=1, le=500),
+    rate: Optional[float] = Query(None, gt=0, description="Messages per second"),
+    repository: OrderEventRepository = Depends(get_dead_letter_repository),
+    whatsapp_service: WhatsappService = Depends(get_whatsapp_service)
+):
+    return await replay_dead_letters(repository, whatsapp_service, limit, batch_size, rate)
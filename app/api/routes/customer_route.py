@@ -1,27 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from app.services.customer import CustomerService
-from app.api.dependencies import get_customer_service
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from typing import List, Optional
+from app.services.customer import CUSTOMER_CURSOR_FIELDS, CustomerService
+from app.api.dependencies import get_customer_service, get_read_customer_service
 from app.api.dependencies import get_current_user
 from app.api.dependencies.permissions import require_admin
+from app.api.dependencies.pagination import decode_cursor, set_next_cursor
 from app.models.schemas.customer import CustomerSchema, CustomerResponse
 
 customer_route = APIRouter(prefix="/clients", tags=["Clients"], dependencies=[Depends(get_current_user)])
 
 @customer_route.get("/", response_model=List[CustomerResponse])
 def get_clients(
+    response: Response,
     order_by: str = None,
     skip: int = 0,
     limit: int = 100,
-    customer_service: CustomerService = Depends(get_customer_service)
+    cursor: Optional[str] = None,
+    customer_service: CustomerService = Depends(get_read_customer_service)
 ):
-    clients = customer_service.get_customers(order_by=order_by, skip=skip, limit=limit)
+    sort = order_by or "id"
+    clients = customer_service.get_customers(
+        order_by=order_by, skip=skip, limit=limit, after=decode_cursor(cursor, sort)
+    )
+    if sort in CUSTOMER_CURSOR_FIELDS:
+        sort_key = (lambda client: [client.id]) if sort == "id" else (lambda client: [getattr(client, sort), client.id])
+        set_next_cursor(response, clients, limit, sort, sort_key)
     return [CustomerResponse.model_validate(client) for client in clients]
 
 @customer_route.get("/{id}", response_model=CustomerResponse)
 def get_client_by_id(
     id: int,
-    customer_service: CustomerService = Depends(get_customer_service)
+    customer_service: CustomerService = Depends(get_read_customer_service)
 ):
     client = customer_service.get_customer_by_id(id)
     if not client:
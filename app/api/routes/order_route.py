@@ -1,12 +1,27 @@
-from fastapi import APIRouter, Depends, Response, status, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from typing import List, Optional, Union
 from datetime import date as PyDate 
+from pydantic import TypeAdapter
 
 from app.api.dependencies import get_current_user
-from app.api.dependencies import get_order_service 
+from app.api.dependencies import get_order_service, get_read_order_service
 from app.api.dependencies import require_admin
-from app.services.order import OrderService
-from app.models.schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate
+from app.api.dependencies import get_idempotency_service
+from app.api.dependencies.pagination import decode_cursor, set_next_cursor
+from app.services.idempotency import IdempotencyService
+from app.services.order import ORDER_CURSOR_FIELDS, OrderService
+from app.models.schemas.order import (
+    OrderBulkCreate, OrderBulkResponse, OrderBulkStatusResponse, OrderBulkStatusUpdate,
+    OrderCreate, OrderResponse, OrderStatusUpdate, OrderSummaryResponse
+)
+
+# Serializers of GET /orders, one per ``view``.
+ORDER_LIST_VIEWS = {
+    "full": TypeAdapter(List[OrderResponse]),
+    "summary": TypeAdapter(List[OrderSummaryResponse]),
+}
 
 order_route = APIRouter(
     prefix="/orders",
@@ -17,12 +32,41 @@ order_route = APIRouter(
 @order_route.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_order( 
     order_data: OrderCreate,
+    order_service: OrderService = Depends(get_order_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255)
+):
+    return await idempotency_service.run(
+        idempotency_key, "POST /orders/", order_data,
+        lambda stage_response: order_service.create_order(order_data, stage_response),
+        OrderResponse, status.HTTP_201_CREATED
+    )
+
+@order_route.post("/bulk", response_model=OrderBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_orders_in_bulk(
+    bulk_data: OrderBulkCreate,
+    response: Response,
+    order_service: OrderService = Depends(get_order_service)
+):
+    results = await order_service.create_orders_bulk(bulk_data.orders)
+    created = sum(1 for result in results if result.order_id is not None)
+    if created < len(results):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return OrderBulkResponse(created=created, failed=len(results) - created, results=results)
+
+@order_route.patch("/status", response_model=OrderBulkStatusResponse)
+async def update_orders_status_in_bulk(
+    status_update_data: OrderBulkStatusUpdate,
+    response: Response,
     order_service: OrderService = Depends(get_order_service)
 ):
-    order_model = await order_service.create_order(order_data)
-    return order_model 
+    result = await order_service.update_orders_status(status_update_data)
+    if result.not_found:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
 
-@order_route.get("/", response_model=List[OrderResponse])
+# The union only documents both shapes: the page is serialized below with the requested view's model.
+@order_route.get("/", response_model=Union[List[OrderResponse], List[OrderSummaryResponse]])
 def list_orders( 
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
@@ -33,40 +77,60 @@ def list_orders(
     order_by: Optional[str] = Query("created_at", description="Field to order by, e.g., 'created_at', 'total_amount'"),
     order_direction: Optional[str] = Query("desc", pattern="^(asc|desc)$"),
     product_section: Optional[str] = Query(None, alias="section"), 
-    order_service: OrderService = Depends(get_order_service)
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page; replaces skip"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' returns only the order columns and customer name"),
+    order_service: OrderService = Depends(get_read_order_service)
 ):
+    sort = f"{order_by}:{order_direction}"
     order_models = order_service.get_orders(
         skip=skip, limit=limit, customer_id=customer_id, status_filter=status_filter,
         start_date_str=start_date, end_date_str=end_date, 
-        order_by_field=order_by, order_direction=order_direction, product_section=product_section
+        order_by_field=order_by, order_direction=order_direction, product_section=product_section,
+        after=decode_cursor(cursor, sort), summary=view == "summary"
     )
-    return order_models
+    listing = ORDER_LIST_VIEWS[view]
+    response = JSONResponse(content=listing.dump_python(listing.validate_python(order_models, from_attributes=True), mode="json"))
+    if order_by in ORDER_CURSOR_FIELDS:
+        sort_key = (lambda order: [order.id]) if order_by == "id" else (lambda order: [getattr(order, order_by), order.id])
+        set_next_cursor(response, order_models, limit, sort, sort_key)
+    return response
 
 @order_route.get("/{order_id}", response_model=OrderResponse) 
 def retrieve_order( 
     order_id: int,
-    order_service: OrderService = Depends(get_order_service)
+    order_service: OrderService = Depends(get_read_order_service)
 ):
     order_model = order_service.get_order_by_id(order_id)
     return order_model
 
 @order_route.put("/{order_id}", response_model=OrderResponse) 
-def update_existing_order( 
+async def update_existing_order( 
     order_id: int,
     order_data: OrderCreate,
-    order_service: OrderService = Depends(get_order_service)
+    order_service: OrderService = Depends(get_order_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255)
 ):
-    order_model = order_service.update_order(order_id, order_data)
-    return order_model
+    return await idempotency_service.run(
+        idempotency_key, f"PUT /orders/{order_id}", order_data,
+        # update_order leaves the commit to the caller: the response is committed along with it.
+        lambda stage_response: run_in_threadpool(order_service.update_order, order_id, order_data),
+        OrderResponse, status.HTTP_200_OK
+    )
 
 @order_route.patch("/{order_id}/status", response_model=OrderResponse) 
 async def update_order_status_only( 
     order_id: int,
     status_update_data: OrderStatusUpdate,
-    order_service: OrderService = Depends(get_order_service)
+    order_service: OrderService = Depends(get_order_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255)
 ):
-    order_model = await order_service.update_order_status(order_id, status_update_data)
-    return order_model
+    return await idempotency_service.run(
+        idempotency_key, f"PATCH /orders/{order_id}/status", status_update_data,
+        lambda stage_response: order_service.update_order_status(order_id, status_update_data, stage_response),
+        OrderResponse, status.HTTP_200_OK
+    )
 
 @order_route.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)]) 
 def remove_order( 
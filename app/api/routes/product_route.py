@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, Response, status
 from typing import List, Optional
 
 from app.api.dependencies import get_current_user
-from app.api.dependencies import get_product_service
+from app.api.dependencies import get_product_service, get_read_product_service
 from app.api.dependencies import require_admin
+from app.api.dependencies.pagination import decode_cursor, set_next_cursor
 from app.services.products import ProductService
 from app.models.schemas.product import ProductSchema, ProductResponse
 
@@ -15,24 +16,28 @@ product_route = APIRouter(
 
 @product_route.get("/", response_model=List[ProductResponse])
 def list_products(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
     section: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     available: Optional[bool] = None,
-    product_service: ProductService = Depends(get_product_service),
+    cursor: Optional[str] = None,
+    product_service: ProductService = Depends(get_read_product_service),
 ):
     product_models = product_service.get_products(
         skip=skip, limit=limit, section=section,
-        min_price=min_price, max_price=max_price, available=available
+        min_price=min_price, max_price=max_price, available=available,
+        after=decode_cursor(cursor, "id")
     )
+    set_next_cursor(response, product_models, limit, "id", lambda product: [product.id])
     return product_models
 
 @product_route.get("/{product_id}", response_model=ProductResponse)
 def retrieve_product(
     product_id: int,
-    product_service: ProductService = Depends(get_product_service)
+    product_service: ProductService = Depends(get_read_product_service)
 ):
     product_model = product_service.get_product_by_id(product_id)
     return product_model
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+
+from app.api.dependencies import get_current_user
+from app.api.dependencies import get_read_report_service
+from app.services.reports import ReportService
+from app.models.schemas.report import SalesReportRow, TopProductRow
+
+report_route = APIRouter(
+    prefix="/reports",
+    tags=["Reports"],
+    dependencies=[Depends(get_current_user)]
+)
+
+@report_route.get("/sales", response_model=List[SalesReportRow])
+def sales_report(
+    start_date: Optional[str] = Query(None, description="Format YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Format YYYY-MM-DD"),
+    section: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    report_service: ReportService = Depends(get_read_report_service)
+):
+    return report_service.get_sales(
+        start_date_str=start_date, end_date_str=end_date, section=section, status_filter=status_filter
+    )
+
+@report_route.get("/top-products", response_model=List[TopProductRow])
+def top_products_report(
+    limit: int = Query(10, ge=1, le=100),
+    start_date: Optional[str] = Query(None, description="Format YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Format YYYY-MM-DD"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Defaults to every status except canceled"),
+    order_by: str = Query("revenue", pattern="^(revenue|units)$"),
+    report_service: ReportService = Depends(get_read_report_service)
+):
+    return report_service.get_top_products(
+        limit=limit, start_date_str=start_date, end_date_str=end_date,
+        status_filter=status_filter, order_by_field=order_by
+    )
@@ -1,10 +1,14 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     JWT_SECRET: str
     ALGORITHM: str = "HS256"
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
     SENTRY_DSN: str = ""
     ENVIRONMENT: str
     ALLOWED_ORIGINS: list[str]
@@ -12,6 +16,40 @@ class Settings(BaseSettings):
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_WHATSAPP_FROM_NUMBER: Optional[str] = None
     TWILIO_WHATSAPP_TO_NUMBER: Optional[str] = None
+    TWILIO_API_BASE_URL: str = "https://api.twilio.com"
+    TWILIO_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    TWILIO_HTTP_TIMEOUT_SECONDS: float = 10.0
+    TWILIO_HTTP_MAX_CONNECTIONS: int = 20
+    TWILIO_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    TWILIO_RATE_LIMIT_PER_SECOND: float = 10.0
+    TWILIO_RATE_LIMIT_BURST: int = 20
+    TWILIO_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    TWILIO_CIRCUIT_RESET_SECONDS: float = 30.0
+    TWILIO_CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQL_QUERY_BUDGET: int = 20
+    SQL_TIME_BUDGET_MS: float = 250.0
+    SERVER_TIMING_ENABLED: bool = True
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: float = 10.0
+    IDEMPOTENCY_PURGE_ENABLED: bool = True
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 300.0
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+    ORDER_EVENTS_DISPATCHER_ENABLED: bool = True
+    ORDER_EVENTS_BACKEND: Literal["database", "memory"] = "database"
+    ORDER_EVENTS_WORKERS: int = 8
+    ORDER_EVENTS_QUEUE_SIZE: int = 10000
+    ORDER_EVENTS_BATCH_SIZE: int = 50
+    ORDER_EVENTS_POLL_INTERVAL: float = 0.5
+    ORDER_EVENTS_LEASE_SECONDS: float = 120.0
+    ORDER_EVENTS_MAX_ATTEMPTS: int = 5
+    ORDER_EVENTS_BACKOFF_BASE_SECONDS: float = 2.0
+    ORDER_EVENTS_BACKOFF_MAX_SECONDS: float = 300.0
+    ORDER_EVENTS_COALESCE_SECONDS: float = 5.0
 
     class Config:
         env_file = ".env"
@@ -1,11 +1,48 @@
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 import os
 
+from app.core.config import settings
+from app.db.replicas import ReplicaRouter
+from app.db.pool_metrics import InstrumentedQueuePool, pool_stats
+
 load_dotenv()
 
 DB_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DB_URL, pool_pre_ping=True)
-session = sessionmaker(bind=engine)
\ No newline at end of file
+def pool_options(url: str, poolclass: type) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+engine = create_engine(DB_URL, **pool_options(DB_URL, InstrumentedQueuePool))
+session = sessionmaker(bind=engine, expire_on_commit=False)
+
+replica_engines = [
+    create_engine(url, **pool_options(url, InstrumentedQueuePool))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+replica_router = ReplicaRouter(
+    replica_engines,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    lag_check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+)
+
+def get_pool_stats() -> dict:
+    stats = {
+        "primary": pool_stats(engine.pool),
+    }
+    for index, replica_engine in enumerate(replica_engines):
+        stats[f"replica_{index}"] = pool_stats(replica_engine.pool)
+    return stats
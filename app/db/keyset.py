@@ -0,0 +1,35 @@
+from datetime import date, datetime
+from typing import Any, List, Sequence
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+
+def _coerce(column, value: Any) -> Any:
+    # Cursors come from the client: anything that does not fit the column is a ValueError.
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        if not isinstance(value, str):
+            raise ValueError(f"Invalid cursor value for {column.key}: {value!r}")
+        return python_type.fromisoformat(value)
+    if python_type in (int, float, str):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"Invalid cursor value for {column.key}: {value!r}")
+        return value if isinstance(value, python_type) else python_type(value)
+    return value
+
+
+def apply_keyset(query: Query, columns: Sequence, values: List[Any], descending: bool = False) -> Query:
+    """Seeks past the row whose sort key is ``values`` instead of using OFFSET.
+
+    ``columns`` must end with a unique column (the primary key) so the seek is exact.
+    Raises ValueError when the values do not fit the columns.
+    """
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Cursor does not match the sort key")
+    bound = [literal(_coerce(column, value), type_=column.type) for column, value in zip(columns, values)]
+    if len(columns) == 1:
+        left, right = columns[0], bound[0]
+    else:
+        left, right = tuple_(*columns), tuple_(*bound)
+    return query.filter(left < right if descending else left > right)
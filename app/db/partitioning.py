@@ -0,0 +1,394 @@
+"""Monthly range partitioning of ``orders`` by ``created_at`` and archival of closed orders.
+
+PostgreSQL only, and opt-in: the table is converted either by the migration
+(``alembic -x partition_orders=true upgrade head``) or from the command line, which also
+creates the upcoming monthly partitions and runs the archival job:
+
+    python -m app.db.partitioning partition
+    python -m app.db.partitioning ensure-partitions --months-ahead 3
+    python -m app.db.partitioning archive --older-than-months 12 [--tablespace cold]
+
+Once partitioned, a ``created_at`` range filter only scans the months it covers. The
+primary key becomes ``(id, created_at)`` (a partition key must be part of it; ids still
+come from the same sequence) and ``order_products.order_id`` loses its foreign key, since
+PostgreSQL can only reference a unique constraint that includes the partition key. Without
+it the application keeps the lines consistent: they are only written together with their
+order, deleted through the ORM cascade on ``OrderModel.order_products`` and archived in
+the same statement as their order. ``unpartition_orders`` checks them and restores the key.
+"""
+import argparse
+import logging
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models.enum.order import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+ORDERS_TABLE = "orders"
+ORDER_LINES_TABLE = "order_products"
+ORDERS_ARCHIVE_TABLE = "orders_archive"
+ORDER_LINES_ARCHIVE_TABLE = "order_products_archive"
+ORDER_LINES_FOREIGN_KEY = "order_products_order_id_fkey"
+CLOSED_STATUSES = (OrderStatus.COMPLETED.value, OrderStatus.CANCELED.value)
+DEFAULT_MONTHS_AHEAD = 3
+ARCHIVE_BATCH_SIZE = 10_000
+
+# Secondary indexes of ``orders``, created again on the partitioned table (and so on every partition).
+ORDER_INDEXES = {
+    "ix_orders_id": "id",
+    "ix_orders_created_at_id": "created_at, id",
+    "ix_orders_customer_id_created_at_id": "customer_id, created_at, id",
+    "ix_orders_status_created_at_id": "status, created_at, id",
+}
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` away from ``month``'s."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def month_range(first: date, last: date) -> List[date]:
+    """First day of every month from ``first``'s through ``last``'s, inclusive."""
+    months = []
+    month = first.replace(day=1)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month.year:04d}_{month.month:02d}"
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Inverse of ``partition_name``; None for the default partition or any other table."""
+    prefix = f"{table}_"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split("_")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+def archive_cutoff(today: date, older_than_months: int) -> date:
+    """Orders created before this day are archived: whole months, so their partitions empty out."""
+    if older_than_months < 1:
+        raise ValueError("older_than_months must be at least 1")
+    return add_months(today, -older_than_months)
+
+
+def _table_exists(connection: Connection, table: str) -> bool:
+    return connection.scalar(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": table})
+
+def is_partitioned(connection: Connection, table: str = ORDERS_TABLE) -> bool:
+    return bool(connection.scalar(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ))
+
+def _tablespace_clause(connection: Connection, tablespace: Optional[str]) -> str:
+    if not tablespace:
+        return ""
+    return f" TABLESPACE {connection.dialect.identifier_preparer.quote(tablespace)}"
+
+def _today(connection: Connection) -> date:
+    return connection.scalar(text("SELECT CURRENT_DATE"))
+
+def _create_order_indexes(connection: Connection, table: str) -> None:
+    for index_name, columns in ORDER_INDEXES.items():
+        connection.execute(text(f"CREATE INDEX {index_name} ON {table} ({columns})"))
+
+def _drop_order_indexes(connection: Connection, table: str) -> None:
+    connection.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {ORDERS_TABLE}_pkey"))
+    for index_name in ORDER_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+
+def create_month_partition(
+    connection: Connection, table: str, month: date, tablespace: Optional[str] = None
+) -> Optional[str]:
+    """Creates ``table``'s partition for ``month``; returns its name, or None if it already existed.
+
+    Rows of that month already sitting in the default partition are moved into the new one,
+    which PostgreSQL requires before the range can be attached.
+    """
+    name = partition_name(table, month)
+    if _table_exists(connection, name):
+        return None
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    tablespace_clause = _tablespace_clause(connection, tablespace)
+    default_partition = f"{table}_default"
+    in_month = "created_at >= :start AND created_at < :end"
+    params = {"start": month, "end": add_months(month, 1)}
+
+    stray_rows = _table_exists(connection, default_partition) and connection.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default_partition} WHERE {in_month})"), params
+    )
+    if not stray_rows:
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}{tablespace_clause}"))
+        return name
+
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS){tablespace_clause}"))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {default_partition} WHERE {in_month} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), params)
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    return name
+
+def ensure_month_partitions(connection: Connection, months_ahead: int = DEFAULT_MONTHS_AHEAD) -> List[str]:
+    """Creates the partitions of ``orders`` from the current month through ``months_ahead`` months ahead.
+
+    Meant to run on a schedule; anything outside the existing months lands in the default partition.
+    """
+    current_month = _today(connection).replace(day=1)
+    created = []
+    for month in month_range(current_month, add_months(current_month, months_ahead)):
+        name = create_month_partition(connection, ORDERS_TABLE, month)
+        if name is not None:
+            created.append(name)
+    return created
+
+
+def partition_orders(connection: Connection, months_ahead: int = DEFAULT_MONTHS_AHEAD) -> bool:
+    """Rebuilds ``orders`` as a table partitioned by ``created_at`` month and copies the rows over.
+
+    Holds an ACCESS EXCLUSIVE lock on ``orders`` until the transaction commits, so run it in
+    a maintenance window on large tables. Returns False when the table is already partitioned.
+    """
+    if is_partitioned(connection):
+        return False
+
+    connection.execute(text(f"LOCK TABLE {ORDERS_TABLE} IN ACCESS EXCLUSIVE MODE"))
+    sequence = connection.scalar(text(f"SELECT pg_get_serial_sequence('{ORDERS_TABLE}', 'id')"))
+    first_order_at = connection.scalar(text(f"SELECT min(created_at) FROM {ORDERS_TABLE}"))
+    today = _today(connection)
+
+    connection.execute(text(f"ALTER TABLE {ORDER_LINES_TABLE} DROP CONSTRAINT IF EXISTS {ORDER_LINES_FOREIGN_KEY}"))
+    connection.execute(text(f"ALTER TABLE {ORDERS_TABLE} RENAME TO {ORDERS_TABLE}_unpartitioned"))
+    _drop_order_indexes(connection, f"{ORDERS_TABLE}_unpartitioned")
+
+    connection.execute(text(
+        f"CREATE TABLE {ORDERS_TABLE} (LIKE {ORDERS_TABLE}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)"
+    ))
+    connection.execute(text(f"ALTER TABLE {ORDERS_TABLE} ADD PRIMARY KEY (id, created_at)"))
+    connection.execute(text(
+        f"ALTER TABLE {ORDERS_TABLE} ADD CONSTRAINT {ORDERS_TABLE}_customer_id_fkey "
+        f"FOREIGN KEY (customer_id) REFERENCES customers (id)"
+    ))
+    _create_order_indexes(connection, ORDERS_TABLE)
+    if sequence is not None:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {ORDERS_TABLE}.id"))
+
+    first_month = (first_order_at.date() if first_order_at is not None else today).replace(day=1)
+    for month in month_range(first_month, add_months(today, months_ahead)):
+        create_month_partition(connection, ORDERS_TABLE, month)
+    connection.execute(text(f"CREATE TABLE {ORDERS_TABLE}_default PARTITION OF {ORDERS_TABLE} DEFAULT"))
+
+    connection.execute(text(f"INSERT INTO {ORDERS_TABLE} SELECT * FROM {ORDERS_TABLE}_unpartitioned"))
+    connection.execute(text(f"DROP TABLE {ORDERS_TABLE}_unpartitioned"))
+    connection.execute(text(f"ANALYZE {ORDERS_TABLE}"))
+    logger.info(f"Tabela {ORDERS_TABLE} particionada por mês de created_at a partir de {first_month}")
+    return True
+
+def unpartition_orders(connection: Connection) -> bool:
+    """Reverses ``partition_orders``: one plain ``orders`` table with the original keys and indexes.
+
+    Archived orders stay in ``orders_archive``. Returns False when the table is not partitioned.
+    """
+    if not is_partitioned(connection):
+        return False
+
+    connection.execute(text(f"LOCK TABLE {ORDERS_TABLE} IN ACCESS EXCLUSIVE MODE"))
+    sequence = connection.scalar(text(f"SELECT pg_get_serial_sequence('{ORDERS_TABLE}', 'id')"))
+    connection.execute(text(f"ALTER TABLE {ORDERS_TABLE} RENAME TO {ORDERS_TABLE}_partitioned"))
+    _drop_order_indexes(connection, f"{ORDERS_TABLE}_partitioned")
+
+    connection.execute(text(
+        f"CREATE TABLE {ORDERS_TABLE} (LIKE {ORDERS_TABLE}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    connection.execute(text(f"INSERT INTO {ORDERS_TABLE} SELECT * FROM {ORDERS_TABLE}_partitioned"))
+    connection.execute(text(f"ALTER TABLE {ORDERS_TABLE} ADD PRIMARY KEY (id)"))
+    connection.execute(text(
+        f"ALTER TABLE {ORDERS_TABLE} ADD CONSTRAINT {ORDERS_TABLE}_customer_id_fkey "
+        f"FOREIGN KEY (customer_id) REFERENCES customers (id)"
+    ))
+    _create_order_indexes(connection, ORDERS_TABLE)
+    if sequence is not None:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {ORDERS_TABLE}.id"))
+
+    connection.execute(text(f"DROP TABLE {ORDERS_TABLE}_partitioned"))
+    restore_order_lines_foreign_key(connection)
+    logger.info(f"Particionamento da tabela {ORDERS_TABLE} desfeito")
+    return True
+
+def restore_order_lines_foreign_key(connection: Connection) -> bool:
+    """Adds back the ``order_products.order_id`` foreign key dropped by ``partition_orders``.
+
+    A no-op, returning False, while ``orders`` is partitioned or when the key is in place.
+    Lines written while it was missing are checked first: if any points at an order that
+    does not exist, nothing is changed and a RuntimeError says how many there are.
+    """
+    if is_partitioned(connection):
+        return False
+    if connection.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :name AND conrelid = to_regclass(:table))"),
+        {"name": ORDER_LINES_FOREIGN_KEY, "table": ORDER_LINES_TABLE}
+    ):
+        return False
+    orphaned = connection.scalar(text(
+        f"SELECT count(*) FROM {ORDER_LINES_TABLE} op "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {ORDERS_TABLE} o WHERE o.id = op.order_id)"
+    ))
+    if orphaned:
+        raise RuntimeError(
+            f"{orphaned} {ORDER_LINES_TABLE} rows reference orders that do not exist; "
+            f"delete them before restoring {ORDER_LINES_FOREIGN_KEY}"
+        )
+    connection.execute(text(
+        f"ALTER TABLE {ORDER_LINES_TABLE} ADD CONSTRAINT {ORDER_LINES_FOREIGN_KEY} "
+        f"FOREIGN KEY (order_id) REFERENCES {ORDERS_TABLE} (id)"
+    ))
+    return True
+
+
+def _ensure_archive_tables(connection: Connection, tablespace: Optional[str]) -> None:
+    tablespace_clause = _tablespace_clause(connection, tablespace)
+    if not _table_exists(connection, ORDERS_ARCHIVE_TABLE):
+        connection.execute(text(
+            f"CREATE TABLE {ORDERS_ARCHIVE_TABLE} (LIKE {ORDERS_TABLE} INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        ))
+        connection.execute(text(f"ALTER TABLE {ORDERS_ARCHIVE_TABLE} ADD PRIMARY KEY (id, created_at)"))
+        connection.execute(text(
+            f"CREATE TABLE {ORDERS_ARCHIVE_TABLE}_default PARTITION OF {ORDERS_ARCHIVE_TABLE} DEFAULT{tablespace_clause}"
+        ))
+    if not _table_exists(connection, ORDER_LINES_ARCHIVE_TABLE):
+        connection.execute(text(
+            f"CREATE TABLE {ORDER_LINES_ARCHIVE_TABLE} (LIKE {ORDER_LINES_TABLE} INCLUDING CONSTRAINTS){tablespace_clause}"
+        ))
+        connection.execute(text(f"ALTER TABLE {ORDER_LINES_ARCHIVE_TABLE} ADD PRIMARY KEY (order_id, product_id)"))
+
+def drop_empty_partitions(connection: Connection, before: date) -> List[str]:
+    """Drops the monthly partitions of ``orders`` that end on or before ``before`` and hold no rows."""
+    partitions = connection.scalars(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": ORDERS_TABLE}).all()
+    dropped = []
+    for name in sorted(partitions):
+        month = partition_month(ORDERS_TABLE, name)
+        if month is None or add_months(month, 1) > before:
+            continue
+        if connection.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {name})")):
+            continue
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+def archive_closed_orders(
+    connection: Connection,
+    older_than_months: int,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    tablespace: Optional[str] = None
+) -> int:
+    """Moves completed and canceled orders from before the cutoff month, with their lines, to the archive.
+
+    ``orders_archive`` is partitioned by month like ``orders`` (optionally in a cheaper
+    ``tablespace``) and ``order_products_archive`` holds the lines. Each batch is one
+    statement and is committed on its own, so the job can be interrupted and re-run.
+    Archived orders leave the API, while ``sales_daily`` and ``product_sales_daily`` keep
+    counting them. Returns the number of orders archived.
+    """
+    cutoff = archive_cutoff(_today(connection), older_than_months)
+    closed = ", ".join(f"'{order_status}'" for order_status in CLOSED_STATUSES)
+    candidates = f"created_at < :cutoff AND status IN ({closed})"
+
+    _ensure_archive_tables(connection, tablespace)
+    first_order_at = connection.scalar(text(f"SELECT min(created_at) FROM {ORDERS_TABLE} WHERE {candidates}"), {"cutoff": cutoff})
+    if first_order_at is not None:
+        for month in month_range(first_order_at.date(), add_months(cutoff, -1)):
+            create_month_partition(connection, ORDERS_ARCHIVE_TABLE, month, tablespace)
+    connection.commit()
+
+    archived = 0
+    while first_order_at is not None:
+        moved = connection.scalar(text(f"""
+            WITH batch AS (
+                SELECT id, created_at FROM {ORDERS_TABLE}
+                WHERE {candidates}
+                ORDER BY created_at, id
+                LIMIT :batch_size
+            ),
+            moved_orders AS (
+                DELETE FROM {ORDERS_TABLE} o USING batch b
+                WHERE o.id = b.id AND o.created_at = b.created_at
+                RETURNING o.*
+            ),
+            moved_lines AS (
+                DELETE FROM {ORDER_LINES_TABLE} op USING batch b
+                WHERE op.order_id = b.id
+                RETURNING op.*
+            ),
+            archived_lines AS (
+                INSERT INTO {ORDER_LINES_ARCHIVE_TABLE} SELECT * FROM moved_lines
+            ),
+            archived_orders AS (
+                INSERT INTO {ORDERS_ARCHIVE_TABLE} SELECT * FROM moved_orders RETURNING 1
+            )
+            SELECT count(*) FROM archived_orders
+        """), {"cutoff": cutoff, "batch_size": batch_size})
+        connection.commit()
+        archived += moved
+        if moved < batch_size:
+            break
+
+    if is_partitioned(connection):
+        dropped = drop_empty_partitions(connection, cutoff)
+        connection.commit()
+        if dropped:
+            logger.info(f"Partições vazias removidas: {', '.join(dropped)}")
+    logger.info(f"{archived} pedidos fechados anteriores a {cutoff} arquivados")
+    return archived
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partitioning and archival maintenance of the orders table.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    partition = commands.add_parser("partition", help="convert orders into a table partitioned by month")
+    partition.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    commands.add_parser("unpartition", help="convert orders back into a plain table")
+    ensure = commands.add_parser("ensure-partitions", help="create the upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="move old closed orders into the archive partitions")
+    archive.add_argument("--older-than-months", type=int, required=True)
+    archive.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    archive.add_argument("--tablespace", default=None, help="tablespace for new archive partitions")
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="defaults to DATABASE_URL")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(args.url)
+    with engine.connect() as connection:
+        if args.command == "partition":
+            if not partition_orders(connection, args.months_ahead):
+                print(f"{ORDERS_TABLE} is already partitioned.")
+        elif args.command == "unpartition":
+            if not unpartition_orders(connection):
+                print(f"{ORDERS_TABLE} is not partitioned.")
+        elif args.command == "ensure-partitions":
+            if not is_partitioned(connection):
+                parser.error(f"{ORDERS_TABLE} is not partitioned; run the partition command first")
+            print("Created: " + (", ".join(ensure_month_partitions(connection, args.months_ahead)) or "nothing"))
+        else:
+            print(f"Archived {archive_closed_orders(connection, args.older_than_months, args.batch_size, args.tablespace)} orders.")
+        connection.commit()
+
+
+if __name__ == "__main__":
+    main()
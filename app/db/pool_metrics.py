@@ -0,0 +1,91 @@
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Checkout wait-time histogram and timeout counter for one connection pool."""
+
+    def __init__(self, buckets_ms: tuple = CHECKOUT_WAIT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(buckets_ms) + 1)
+        self._wait_count = 0
+        self._wait_sum_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._timeouts = 0
+
+    def observe_checkout_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self._bucket_counts[bisect_left(self.buckets_ms, wait_ms)] += 1
+            self._wait_count += 1
+            self._wait_sum_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = 0
+            buckets = []
+            for upper_bound, count in zip(self.buckets_ms + (None,), self._bucket_counts):
+                cumulative += count
+                buckets.append({"le_ms": upper_bound, "count": cumulative})
+            return {
+                "count": self._wait_count,
+                "sum_ms": round(self._wait_sum_ms, 3),
+                "max_ms": round(self._wait_max_ms, 3),
+                "timeouts": self._timeouts,
+                "buckets": buckets,
+            }
+
+
+class InstrumentedPoolMixin:
+    """Times how long each checkout waits for a free connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        finally:
+            self.metrics.observe_checkout_wait((time.perf_counter() - start) * 1000)
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+def pool_stats(pool: Pool) -> dict:
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow_in_use": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats["checkout_wait"] = metrics.snapshot()
+    return stats
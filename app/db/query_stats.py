@@ -0,0 +1,55 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+
+
+# Set per request by the query stats middleware. The object itself is shared, so
+# queries issued from threadpool workers (sync routes and dependencies) count too.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _record_statement(conn) -> None:
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(duration_ms)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(conn)
+
+
+def _handle_error(exception_context):
+    # A failing statement never reaches after_cursor_execute: pop its start time here, or it
+    # stays on the pooled connection and pairs with the next statement's end.
+    if exception_context.connection is not None and exception_context.execution_context is not None:
+        _record_statement(exception_context.connection)
+
+
+def instrument_engines() -> None:
+    """Counts every statement run by any engine, including the ones that fail."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
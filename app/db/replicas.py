@@ -0,0 +1,101 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# On an idle primary the last replayed transaction gets old while the replica is
+# fully caught up, so compare WAL positions before falling back to the timestamp.
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaRouter:
+    """Picks the session a read-only request should use.
+
+    Reads go to a replica (round robin) unless the client wrote something in the
+    last ``sticky_seconds`` (read-your-writes) or every replica is lagging more than
+    ``max_lag_seconds``; in both cases the caller falls back to the primary.
+    """
+
+    def __init__(
+        self,
+        replica_engines: List[Engine],
+        max_lag_seconds: float = 5.0,
+        sticky_seconds: float = 5.0,
+        lag_check_interval: float = 2.0,
+    ):
+        self.replica_engines = replica_engines
+        self.replica_sessions = [sessionmaker(bind=engine) for engine in replica_engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.lag_check_interval = lag_check_interval
+        self._round_robin = itertools.count()
+        self._lag_cache: Dict[int, Tuple[float, Optional[float]]] = {}
+        self._recent_writers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replica_sessions)
+
+    def mark_write(self, client_key: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._recent_writers[client_key] = now + self.sticky_seconds
+            expired = [key for key, until in self._recent_writers.items() if until <= now]
+            for key in expired:
+                del self._recent_writers[key]
+
+    def is_sticky(self, client_key: str) -> bool:
+        with self._lock:
+            until = self._recent_writers.get(client_key)
+        return until is not None and until > time.monotonic()
+
+    def _measure_lag(self, engine: Engine) -> Optional[float]:
+        try:
+            with engine.connect() as connection:
+                return float(connection.execute(REPLICATION_LAG_QUERY).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Could not measure replication lag for {engine.url.host}: {e}")
+            return None
+
+    def replica_lag(self, index: int) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._lag_cache.get(index)
+        if cached and now - cached[0] < self.lag_check_interval:
+            return cached[1]
+        lag = self._measure_lag(self.replica_engines[index])
+        with self._lock:
+            self._lag_cache[index] = (now, lag)
+        return lag
+
+    def _is_healthy(self, index: int) -> bool:
+        lag = self.replica_lag(index)
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def session_for_read(self, client_key: Optional[str] = None) -> Optional[Session]:
+        """Returns a replica session, or None when the read must go to the primary."""
+        if not self.enabled:
+            return None
+        if client_key and self.is_sticky(client_key):
+            return None
+
+        start = next(self._round_robin)
+        for offset in range(len(self.replica_sessions)):
+            index = (start + offset) % len(self.replica_sessions)
+            if self._is_healthy(index):
+                return self.replica_sessions[index]()
+        logger.warning("No replica within the lag budget, reading from the primary.")
+        return None
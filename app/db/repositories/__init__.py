@@ -1,4 +1,8 @@
 from .auth import AuthRepository
 from .customers import CustomerRepository
 from .orders import OrderRepository
-from .products import ProductRepository
\ No newline at end of file
+from .products import ProductRepository
+
+from .idempotency import IdempotencyRepository
+from .reports import ReportRepository
+from .order_events import OrderEventRepository
\ No newline at end of file
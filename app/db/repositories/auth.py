@@ -1,16 +1,13 @@
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.domain.user import UserModel
 from app.models.domain.refresh_token import RefreshTokenModel
 from passlib.context import CryptContext
+from app.db.repositories.base import Repository
 
 crypt_context = CryptContext(schemes=["sha256_crypt"])
 
-class AuthRepository:
-    def __init__(self, db: Session):
-        self.db = db
-
+class AuthRepository(Repository):
     def get_user_by_id(self, user_id: int):
         return self.db.query(UserModel).filter(UserModel.id == user_id).first()
 
@@ -19,17 +16,17 @@ class AuthRepository:
 
     def create_user(self, user: UserModel):
         try:
-            self.db.add(user)
-            self.db.commit()
+            # Only the savepoint is rolled back on a duplicate, not the rest of the request.
+            with self.db.begin_nested():
+                self.db.add(user)
             return user
         except IntegrityError:
-            self.db.rollback()
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User already exists")
 
     def create_refresh_token(self, user_id: int, token: str, expires_at):
         refresh_token = RefreshTokenModel(user_id=user_id, token=token, expires_at=expires_at)
         self.db.add(refresh_token)
-        self.db.commit()
+        self.db.flush()
         return refresh_token
 
     def get_refresh_token(self, token: str):
@@ -39,4 +36,4 @@ class AuthRepository:
         token_model = self.get_refresh_token(token)
         if token_model:
             self.db.delete(token_model)
-            self.db.commit()
\ No newline at end of file
+            self.db.flush()
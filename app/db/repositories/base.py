@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Session
+
+
+class Repository:
+    """Base for the synchronous repositories.
+
+    Repositories only ``flush()``: the request's unit of work is committed (or rolled
+    back) once by ``get_db_session``. ``commit()`` is there for the few places that
+    must end the unit of work early, e.g. before notifying a customer.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def commit(self) -> None:
+        self.db.commit()
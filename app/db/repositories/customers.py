@@ -1,21 +1,29 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
 from app.models.domain.customer import CustomerModel
+from app.db.repositories.base import Repository
+from app.db.keyset import apply_keyset
 
-class CustomerRepository:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def get_customers(self, order_by: str = None, skip: int = 0, limit: int = 100) -> List[CustomerModel]:
+class CustomerRepository(Repository):
+    def get_customers(
+        self, order_by: str = None, skip: int = 0, limit: int = 100, after: Optional[List[Any]] = None
+    ) -> List[CustomerModel]:
         query = self.db.query(CustomerModel)
-        if order_by:
-            query = query.order_by(getattr(CustomerModel, order_by))
-        query = query.offset(skip).limit(limit)
-        return query.all()
+        sort_columns = [CustomerModel.id]
+        if order_by and order_by != "id":
+            sort_columns.insert(0, getattr(CustomerModel, order_by))
+        query = query.order_by(*sort_columns)
+        if after is not None:
+            query = apply_keyset(query, sort_columns, after)
+        else:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     def get_customer_by_id(self, id: int) -> CustomerModel:
         return self.db.query(CustomerModel).filter(CustomerModel.id == id).first()
 
+    def get_customers_by_ids(self, ids: List[int]) -> List[CustomerModel]:
+        return self.db.query(CustomerModel).filter(CustomerModel.id.in_(ids)).all()
+
     def get_customer_by_email(self, email: str) -> CustomerModel:
         return self.db.query(CustomerModel).filter(CustomerModel.email == email).first()
 
@@ -24,17 +32,15 @@ class CustomerRepository:
 
     def create_customer(self, customer: CustomerModel) -> CustomerModel:
         self.db.add(customer)
-        self.db.commit()
-        self.db.refresh(customer)
+        self.db.flush()
         return customer
 
     def update_customer(self, customer: CustomerModel) -> CustomerModel:
-        self.db.commit()
-        self.db.refresh(customer)
+        self.db.flush()
         return customer
 
     def delete_customer(self, id: int) -> None:
         customer = self.get_customer_by_id(id)
         if customer:
             self.db.delete(customer)
-            self.db.commit()
\ No newline at end of file
+            self.db.flush()
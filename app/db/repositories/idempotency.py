@@ -0,0 +1,153 @@
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.domain.idempotency_key import IdempotencyKeyModel
+from app.db.repositories.base import Repository
+
+
+class IdempotencyRepository(Repository):
+    def get_key(self, user_id: int, key: str) -> Optional[IdempotencyKeyModel]:
+        # populate_existing: callers poll this while another request finishes the key.
+        return self.db.query(IdempotencyKeyModel).populate_existing().filter(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.key == key
+        ).first()
+
+    def claim_key(
+        self,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        locked_until: datetime,
+        expires_at: datetime
+    ) -> Tuple[Optional[IdempotencyKeyModel], bool]:
+        """Inserts the key locked until ``locked_until`` and commits it right away.
+
+        Returns ``(record, True)`` when this call owns the key. When the key already
+        exists it is taken over if it has expired or its lock was abandoned; otherwise
+        ``(existing_record, False)`` is returned.
+        """
+        record = IdempotencyKeyModel(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            locked_until=locked_until,
+            expires_at=expires_at
+        )
+        try:
+            with self.db.begin_nested():
+                self.db.add(record)
+        except IntegrityError:
+            if self._take_over_key(user_id, key, request_hash, now, locked_until, expires_at):
+                self.db.commit()
+                return self.get_key(user_id, key), True
+            return self.get_key(user_id, key), False
+
+        # The lock must be visible to concurrent duplicates before the request does its work.
+        self.db.commit()
+        return record, True
+
+    def _take_over_key(
+        self,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        locked_until: datetime,
+        expires_at: datetime
+    ) -> bool:
+        result = self.db.execute(
+            update(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.user_id == user_id,
+                IdempotencyKeyModel.key == key,
+                or_(
+                    IdempotencyKeyModel.expires_at <= now,
+                    and_(IdempotencyKeyModel.status_code.is_(None), IdempotencyKeyModel.locked_until <= now)
+                )
+            )
+            .values(
+                request_hash=request_hash,
+                status_code=None,
+                response_body=None,
+                locked_until=locked_until,
+                expires_at=expires_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _still_claimed(expires_at: datetime) -> tuple:
+        # Every claim sets a new expires_at, so it tells a request's claim from a later takeover.
+        return IdempotencyKeyModel.status_code.is_(None), IdempotencyKeyModel.expires_at == expires_at
+
+    def store_response(self, record: IdempotencyKeyModel, status_code: int, response_body: Any) -> bool:
+        """Writes the response in the current transaction, without committing it.
+
+        Returns False, writing nothing, when the key is no longer held by ``record``'s
+        claim (its lock lapsed and a retry took it over).
+        """
+        result = self.db.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.id == record.id, *self._still_claimed(record.expires_at))
+            .values(status_code=status_code, response_body=response_body, locked_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def extend_lock(self, user_id: int, key: str, expires_at: datetime, locked_until: datetime) -> bool:
+        """Moves the lock of a claim still in progress to ``locked_until`` and commits it."""
+        result = self.db.execute(
+            update(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.user_id == user_id,
+                IdempotencyKeyModel.key == key,
+                *self._still_claimed(expires_at)
+            )
+            .values(locked_until=locked_until)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def release_key(self, user_id: int, key: str, expires_at: datetime) -> None:
+        """Drops a claimed key whose request failed, so a retry runs it again.
+
+        The request's own work is rolled back first; the release is committed on its own.
+        A key that was taken over by a retry in the meantime is left alone.
+        """
+        self.db.rollback()
+        self.db.execute(
+            delete(IdempotencyKeyModel).where(
+                IdempotencyKeyModel.user_id == user_id,
+                IdempotencyKeyModel.key == key,
+                *self._still_claimed(expires_at)
+            )
+        )
+        self.db.commit()
+
+
+    def purge_expired(self, now: datetime, limit: int) -> int:
+        """Deletes up to ``limit`` keys that expired by ``now``, oldest first, commits and
+        returns how many.
+
+        ``expires_at`` is checked again on the DELETE itself, so a key a retry takes over
+        while the purge runs (moving its ``expires_at`` forward) is kept.
+        """
+        expired = (
+            select(IdempotencyKeyModel.id)
+            .where(IdempotencyKeyModel.expires_at <= now)
+            .order_by(IdempotencyKeyModel.expires_at)
+            .limit(limit)
+        )
+        result = self.db.execute(
+            delete(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.id.in_(expired.scalar_subquery()), IdempotencyKeyModel.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, or_, select, update
+
+from app.models.domain.order_event import DELIVERY_SUPERSEDED, OrderEventDeadLetterModel, OrderEventModel
+from app.db.repositories.base import Repository
+
+
+class OrderEventRepository(Repository):
+    def add_events(self, events: List[OrderEventModel]) -> None:
+        """Adds the events to the current unit of work, so they commit or roll back with the order change."""
+        self.db.add_all(events)
+
+    def supersede_pending(self, order_ids: Iterable[int], event_type: str, now: datetime) -> int:
+        """Marks the orders' unsent ``event_type`` events as superseded and returns how many.
+
+        Events a dispatcher is sending (leased, or locked while the lease is written) are
+        skipped: the request does not wait for the provider.
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return 0
+        pending = select(OrderEventModel.id).where(
+            OrderEventModel.order_id.in_(order_ids),
+            OrderEventModel.event_type == event_type,
+            OrderEventModel.processed_at.is_(None),
+            self._not_leased(now)
+        ).with_for_update(skip_locked=True)
+        result = self.db.execute(
+            update(OrderEventModel)
+            .where(OrderEventModel.id.in_(pending.scalar_subquery()))
+            .values(delivery_status=DELIVERY_SUPERSEDED, processed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def _not_leased(now: datetime):
+        return or_(OrderEventModel.locked_until.is_(None), OrderEventModel.locked_until <= now)
+
+    def lease_pending(self, limit: int, now: datetime, locked_until: datetime) -> List[OrderEventModel]:
+        """Leases up to ``limit`` due events, oldest first, to the caller until ``locked_until``.
+
+        The rows are only locked (SKIP LOCKED, so dispatchers do not wait on each other)
+        until the caller commits the lease; from then on the lease keeps other dispatchers
+        and ``supersede_pending`` off them. The events are returned detached from the session.
+        """
+        events = self.db.query(OrderEventModel).filter(
+            OrderEventModel.processed_at.is_(None),
+            OrderEventModel.available_at <= now,
+            self._not_leased(now)
+        ).order_by(
+            OrderEventModel.available_at, OrderEventModel.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+        for event in events:
+            event.locked_until = locked_until
+        self.db.flush()
+        for event in events:
+            self.db.expunge(event)
+        return events
+
+    def get_leased(self, event_ids: Iterable[int], locked_until: datetime) -> List[OrderEventModel]:
+        """Locks the events of ``event_ids`` that are still under the caller's lease.
+
+        Events whose lease lapsed and that another dispatcher leased since are left out.
+        """
+        return self.db.query(OrderEventModel).filter(
+            OrderEventModel.id.in_(list(event_ids)),
+            OrderEventModel.locked_until == locked_until
+        ).with_for_update().all()
+
+    def add_dead_letters(self, dead_letters: List[OrderEventDeadLetterModel]) -> None:
+        self.db.add_all(dead_letters)
+
+    def get_dead_letters(self, limit: int, include_replayed: bool = False) -> List[OrderEventDeadLetterModel]:
+        query = self.db.query(OrderEventDeadLetterModel)
+        if not include_replayed:
+            query = query.filter(OrderEventDeadLetterModel.replayed_at.is_(None))
+        return query.order_by(OrderEventDeadLetterModel.id.desc()).limit(limit).all()
+
+    def count_unreplayed_dead_letters(self) -> int:
+        return self.db.scalar(
+            select(func.count()).select_from(OrderEventDeadLetterModel).where(OrderEventDeadLetterModel.replayed_at.is_(None))
+        )
+
+    def claim_dead_letters(self, limit: int, after_id: Optional[int] = None) -> List[OrderEventDeadLetterModel]:
+        """Locks up to ``limit`` unreplayed letters, oldest first and past ``after_id``, so
+        two replays running at once never send the same letter."""
+        query = self.db.query(OrderEventDeadLetterModel).filter(OrderEventDeadLetterModel.replayed_at.is_(None))
+        if after_id is not None:
+            query = query.filter(OrderEventDeadLetterModel.id > after_id)
+        return query.order_by(OrderEventDeadLetterModel.id).limit(limit).with_for_update(skip_locked=True).all()
@@ -1,34 +1,71 @@
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from sqlalchemy import Row, exists, func, insert, inspect, select, update
+from sqlalchemy.orm import Query, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, Dict, List, Optional
 from datetime import date as PyDate, timedelta 
 
-from app.models.domain.order import OrderModel, OrderProduct
-from app.models.domain.product import ProductModel
+from app.models.domain.customer import CustomerModel
+from app.models.domain.order import OrderModel, OrderProduct, OrderStatus
+from app.models.domain.product import ProductImageModel
+from app.db.repositories.base import Repository
+from app.db.keyset import apply_keyset
 
 
-class OrderRepository:
-    def __init__(self, db: Session):
-        self.db = db
+def orders_in_section(section: str):
+    """EXISTS semi-join: orders with at least one line sold in ``section``.
 
+    The section recorded on the line is used, so a product moved to another section later
+    does not take its past orders along. Unlike joining the lines and de-duplicating with
+    DISTINCT, each order is matched once and the outer query keeps its index-backed
+    ORDER BY ... LIMIT.
+    """
+    return exists().where(
+        OrderProduct.order_id == OrderModel.id,
+        OrderProduct.section == section
+    )
+
+
+class OrderRepository(Repository):
     def create_order(self, order_model_data: OrderModel, order_product_models_data: List[OrderProduct]) -> OrderModel:
-        try:
-            self.db.add(order_model_data)
-            self.db.flush()
-
-            for op_model in order_product_models_data:
-                op_model.order_id = order_model_data.id
-            
-            self.db.add_all(order_product_models_data)
-            self.db.commit()
-
-            reloaded_order = self.get_order_by_id_internal(order_model_data.id, load_relations=True)
-            if not reloaded_order:
-                raise Exception(f"Falha ao recarregar o pedido recém-criado: {order_model_data.id}")
-            return reloaded_order
-        except IntegrityError:
-            self.db.rollback()
-            raise
+        order_model_data.order_products = order_product_models_data
+        # Set explicitly so the column is known after the INSERT instead of lazy-loaded later.
+        order_model_data.updated_at = None
+        self.db.add(order_model_data)
+        self.db.flush()
+
+        self._load_product_images(order_model_data)
+        return order_model_data
+
+    def create_orders_bulk(self, order_models: List[OrderModel]) -> List[OrderModel]:
+        """Inserts the orders with one multi-row INSERT for ``orders`` and one for ``order_products``.
+
+        ``order_models`` are not added to the session: they get their ``id`` and ``created_at``
+        from RETURNING and are handed back as-is, without a reload.
+        """
+        inserted_rows = self.db.execute(
+            insert(OrderModel).returning(OrderModel.id, OrderModel.created_at, sort_by_parameter_order=True),
+            [
+                {"customer_id": order.customer_id, "status": order.status, "total_amount": order.total_amount}
+                for order in order_models
+            ]
+        ).all()
+
+        order_product_rows = []
+        for order, (order_id, created_at) in zip(order_models, inserted_rows):
+            order.id = order_id
+            order.created_at = created_at
+            for order_product in order.order_products:
+                order_product.order_id = order_id
+                order_product_rows.append({
+                    "order_id": order_id,
+                    "product_id": order_product.product_id,
+                    "quantity": order_product.quantity,
+                    "unit_price": order_product.unit_price,
+                    "section": order_product.section
+                })
+        if order_product_rows:
+            self.db.execute(insert(OrderProduct), order_product_rows)
+        return order_models
 
     def get_order_by_id_internal(self, order_id: int, load_relations: bool = True) -> Optional[OrderModel]:
         query = self.db.query(OrderModel)
@@ -53,13 +90,63 @@ class OrderRepository:
         end_date: Optional[PyDate] = None,
         order_by_field: str = "created_at", 
         order_direction: str = "desc",
-        product_section: Optional[str] = None 
+        product_section: Optional[str] = None,
+        after: Optional[List[Any]] = None
     ) -> List[OrderModel]:
         query = self.db.query(OrderModel).options(
             selectinload(OrderModel.customer),
             selectinload(OrderModel.order_products).selectinload(OrderProduct.product)
         )
+        return self._list_orders(
+            query, limit, skip, customer_id, status_filter, start_date, end_date,
+            order_by_field, order_direction, product_section, after
+        ).all()
+
+    def get_order_summaries(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        customer_id: Optional[int] = None,
+        status_filter: Optional[str] = None,
+        start_date: Optional[PyDate] = None,
+        end_date: Optional[PyDate] = None,
+        order_by_field: str = "created_at",
+        order_direction: str = "desc",
+        product_section: Optional[str] = None,
+        after: Optional[List[Any]] = None
+    ) -> List[Row]:
+        """Same listing as ``get_orders``, projected to the order's own columns plus the customer name.
+
+        A single query joined to ``customers``; order lines, products and images are not loaded.
+        """
+        query = self.db.query(
+            OrderModel.id,
+            OrderModel.customer_id,
+            CustomerModel.name.label("customer_name"),
+            OrderModel.status,
+            OrderModel.total_amount,
+            OrderModel.created_at,
+            OrderModel.updated_at
+        ).join(OrderModel.customer)
+        return self._list_orders(
+            query, limit, skip, customer_id, status_filter, start_date, end_date,
+            order_by_field, order_direction, product_section, after
+        ).all()
 
+    def _list_orders(
+        self,
+        query: Query,
+        limit: int,
+        skip: int,
+        customer_id: Optional[int],
+        status_filter: Optional[str],
+        start_date: Optional[PyDate],
+        end_date: Optional[PyDate],
+        order_by_field: str,
+        order_direction: str,
+        product_section: Optional[str],
+        after: Optional[List[Any]]
+    ) -> Query:
         if customer_id is not None:
             query = query.filter(OrderModel.customer_id == customer_id)
         if status_filter is not None:
@@ -69,7 +156,7 @@ class OrderRepository:
         if end_date is not None:
             query = query.filter(OrderModel.created_at < (end_date + timedelta(days=1)))
         if product_section is not None:
-            query = query.join(OrderModel.order_products).join(OrderProduct.product).filter(ProductModel.section == product_section).distinct()
+            query = query.filter(orders_in_section(product_section))
 
 
         # Order by
@@ -79,16 +166,65 @@ class OrderRepository:
         else:
             query = query.order_by(order_column.desc(), OrderModel.id.desc())
 
-        orders = query.offset(skip).limit(limit).all()
-        return orders
+        if after is not None:
+            sort_columns = [OrderModel.id] if order_column is OrderModel.id else [order_column, OrderModel.id]
+            query = apply_keyset(query, sort_columns, after, descending=order_direction != "asc")
+        else:
+            query = query.offset(skip)
+
+        return query.limit(limit)
     
     def update_order_status(self, order_to_update: OrderModel, new_status: str) -> OrderModel:
         order_to_update.status = new_status
-        self.db.commit()
-        reloaded_order = self.get_order_by_id_internal(order_to_update.id, load_relations=True)
-        if not reloaded_order:
-            raise Exception(f"Falha ao recarregar o pedido {order_to_update.id} após atualização de status.")
-        return reloaded_order
+        self.db.flush()
+        return order_to_update
+
+    def lock_order_statuses(self, order_ids: List[int]) -> Dict[int, OrderStatus]:
+        """Current status of each existing order, with the rows locked until the transaction ends.
+
+        The rows are locked in id order, so two bulk updates over overlapping orders queue up
+        instead of deadlocking.
+        """
+        rows = self.db.execute(
+            select(OrderModel.id, OrderModel.status)
+            .where(OrderModel.id.in_(order_ids))
+            .order_by(OrderModel.id)
+            .with_for_update()
+        ).all()
+        return {order_id: status for order_id, status in rows}
+
+    def update_orders_status(self, order_ids: List[int], new_status: OrderStatus) -> List[Row]:
+        """Moves the orders to ``new_status`` with a single UPDATE ... RETURNING."""
+        if not order_ids:
+            return []
+        rows = self.db.execute(
+            update(OrderModel)
+            .where(OrderModel.id.in_(order_ids))
+            .values(status=new_status, updated_at=func.now())
+            .returning(OrderModel.id, OrderModel.customer_id, OrderModel.total_amount, OrderModel.created_at)
+            .execution_options(synchronize_session=False)
+        ).all()
+        # The UPDATE bypasses the identity map, so drop any status already loaded.
+        order_ids = set(order_ids)
+        for instance in list(self.db.identity_map.values()):
+            if isinstance(instance, OrderModel) and instance.id in order_ids:
+                self.db.expire(instance, ["status", "updated_at"])
+        return rows
+
+    def get_order_lines(self, order_ids: List[int]) -> List[Row]:
+        """Lines of the orders with the section they were sold in, without loading the ORM objects."""
+        if not order_ids:
+            return []
+        return self.db.execute(
+            select(
+                OrderProduct.order_id,
+                OrderProduct.product_id,
+                OrderProduct.quantity,
+                OrderProduct.unit_price,
+                OrderProduct.section
+            )
+            .where(OrderProduct.order_id.in_(order_ids))
+        ).all()
     
     def update_order(
         self, 
@@ -98,27 +234,57 @@ class OrderRepository:
         new_total_amount: float,
         new_order_products: List[OrderProduct]
         ) -> OrderModel:
-        try:
-            order_to_update.customer_id = new_customer_id
-            order_to_update.status = new_status
-            order_to_update.total_amount = new_total_amount
+        """Replaces the order's lines with ``new_order_products`` (one per product).
 
-            for old_op in list(order_to_update.order_products): 
-                 self.db.delete(old_op)
-            self.db.flush() 
+        Only the rows that differ are written: lines whose product is no longer ordered are
+        deleted, lines whose quantity, price or section changed are updated and lines for new
+        products are inserted, all in the same flush.
+        """
+        if order_to_update.customer_id != new_customer_id:
+            order_to_update.customer_id = new_customer_id
+            # Reloaded from the identity map on access, since the service just looked the customer up.
+            self.db.expire(order_to_update, ["customer"])
+        order_to_update.status = new_status
+        order_to_update.total_amount = new_total_amount
 
-            order_to_update.order_products = new_order_products
+        new_lines = {order_product.product_id: order_product for order_product in new_order_products}
+        for order_product in list(order_to_update.order_products):
+            new_line = new_lines.pop(order_product.product_id, None)
+            if new_line is None:
+                order_to_update.order_products.remove(order_product)
+                continue
+            # Assigning an unchanged value does not dirty the row, so only real changes are written.
+            order_product.quantity = new_line.quantity
+            order_product.unit_price = new_line.unit_price
+            order_product.section = new_line.section
+        order_to_update.order_products.extend(new_lines.values())
 
-            self.db.commit()
+        self.db.flush()
 
-            reloaded_order = self.get_order_by_id_internal(order_to_update.id, load_relations=True)
-            if not reloaded_order:
-                raise Exception(f"Falha ao recarregar o pedido recém-atualizado: {order_to_update.id}")
-            return reloaded_order
-        except IntegrityError:
-            self.db.rollback()
-            raise
+        self._load_product_images(order_to_update)
+        return order_to_update
 
     def delete_order(self, order_to_delete: OrderModel) -> None:
         self.db.delete(order_to_delete)
-        self.db.commit()
\ No newline at end of file
+        self.db.flush()
+
+    def _load_product_images(self, order: OrderModel) -> None:
+        """Fills in the images of the order's products that the session has not loaded yet.
+
+        The products themselves come from the identity map (the service already read them),
+        so a response can be built from the written order with a single images query.
+        """
+        products = {
+            order_product.product.id: order_product.product
+            for order_product in order.order_products
+            if "images" in inspect(order_product.product).unloaded
+        }
+        if not products:
+            return
+        images = {product_id: [] for product_id in products}
+        for image in self.db.query(ProductImageModel).filter(
+            ProductImageModel.product_id.in_(list(products))
+        ).order_by(ProductImageModel.id):
+            images[image.product_id].append(image)
+        for product_id, product in products.items():
+            set_committed_value(product, "images", images[product_id])
@@ -1,14 +1,14 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.domain.product import ProductImageModel, ProductModel
 from app.models.schemas.product import ProductSchema 
+from app.db.repositories.base import Repository
+from app.db.keyset import apply_keyset
 
-class ProductRepository:
-    def __init__(self, db: Session):
-        self.db = db
-
+class ProductRepository(Repository):
     def get_product_by_id(self, product_id: int) -> Optional[ProductModel]:
         return self.db.query(ProductModel).options(
             selectinload(ProductModel.images)
@@ -27,6 +27,7 @@ class ProductRepository:
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         available: Optional[bool] = None,
+        after: Optional[List[Any]] = None,
     ) -> List[ProductModel]:
 
         query = self.db.query(ProductModel).options(
@@ -45,7 +46,12 @@ class ProductRepository:
             else:
                 query = query.filter(ProductModel.stock == 0)
         
-        products = query.order_by(ProductModel.id).offset(skip).limit(limit).all() 
+        query = query.order_by(ProductModel.id)
+        if after is not None:
+            query = apply_keyset(query, [ProductModel.id], after)
+        else:
+            query = query.offset(skip)
+        products = query.limit(limit).all() 
         return products
 
     def create_product(self, product_create_data: ProductSchema) -> ProductModel:
@@ -54,27 +60,16 @@ class ProductRepository:
         db_product_data = product_create_data.model_dump(exclude={"image_urls"})
         db_product = ProductModel(**db_product_data)
         
-        try:
-            self.db.add(db_product)
-
-            if image_urls_data: 
-                for url in image_urls_data:
-                    db_product.images.append(ProductImageModel(url=str(url))) 
-            
-            self.db.commit()
-            self.db.refresh(db_product) 
-            
-            if db_product.id: 
-                 reloaded_product = self.db.query(ProductModel).options(
-                     selectinload(ProductModel.images)
-                 ).filter(ProductModel.id == db_product.id).first()
-                 if reloaded_product:
-                     return reloaded_product
-            return db_product 
-
-        except IntegrityError:
-            self.db.rollback()
-            raise 
+        self.db.add(db_product)
+
+        if image_urls_data: 
+            for url in image_urls_data:
+                db_product.images.append(ProductImageModel(url=str(url))) 
+        
+        # The images were appended above, so the flushed product is complete as it is.
+        # An IntegrityError propagates; get_db_session rolls the whole request back.
+        self.db.flush()
+        return db_product 
 
     def update_product(
         self,
@@ -91,27 +86,93 @@ class ProductRepository:
             for image_url in product_update_data.image_urls:
                 db_product.images.append(ProductImageModel(url=str(image_url))) 
 
-        try:
-            self.db.commit()
-            self.db.refresh(db_product) 
-            reloaded_product = self.db.query(ProductModel).options(
-                selectinload(ProductModel.images)
-            ).filter(ProductModel.id == db_product.id).first()
-            
-            if reloaded_product:
-                return reloaded_product
-            return db_product 
-
-        except IntegrityError: 
-            self.db.rollback()
-            raise 
-
-    def update_stock(self, product_to_update: ProductModel, new_stock_level: int) -> ProductModel:
-        product_to_update.stock = new_stock_level
-        self.db.commit()
-        self.db.refresh(product_to_update)
-        return product_to_update
+        self.db.flush()
+        return db_product 
+
+    def get_products_by_ids(self, product_ids: Iterable[int]) -> List[ProductModel]:
+        """Loads the products (without images) in id order, in a single query."""
+        return self.db.query(ProductModel).filter(
+            ProductModel.id.in_(list(product_ids))
+        ).order_by(ProductModel.id).all()
+
+    def decrement_stock(self, product_id: int, quantity: int) -> Optional[int]:
+        """Takes ``quantity`` out of the stock only if that much is available.
+
+        Returns the new stock level, or None when the product is missing or short.
+        """
+        new_stock = self.db.execute(
+            update(ProductModel)
+            .where(ProductModel.id == product_id, ProductModel.stock >= quantity)
+            .values(stock=ProductModel.stock - quantity)
+            .returning(ProductModel.stock)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        self._apply_stock([product_id], {} if new_stock is None else {product_id: new_stock})
+        return new_stock
+
+    def decrement_stock_bulk(self, quantities: Dict[int, int]) -> Dict[int, int]:
+        """Bulk form of ``decrement_stock``: one UPDATE for every product in ``quantities``.
+
+        Returns the new stock level of the products that were decremented; the ones
+        missing from the result did not have enough stock and were left untouched.
+        """
+        if not quantities:
+            return {}
+        requested = case(quantities, value=ProductModel.id)
+        rows = self.db.execute(
+            update(ProductModel)
+            .where(ProductModel.id.in_(self._locked_ids(quantities)), ProductModel.stock >= requested)
+            .values(stock=ProductModel.stock - requested)
+            .returning(ProductModel.id, ProductModel.stock)
+            .execution_options(synchronize_session=False)
+        ).all()
+        new_levels = {product_id: stock for product_id, stock in rows}
+        self._apply_stock(quantities, new_levels)
+        return new_levels
+
+    def increment_stock(self, product_id: int, quantity: int) -> Optional[int]:
+        """Returns the new stock level, or None when the product does not exist."""
+        return self.increment_stock_bulk({product_id: quantity}).get(product_id)
+
+    def increment_stock_bulk(self, quantities: Dict[int, int]) -> Dict[int, int]:
+        if not quantities:
+            return {}
+        rows = self.db.execute(
+            update(ProductModel)
+            .where(ProductModel.id.in_(self._locked_ids(quantities)))
+            .values(stock=ProductModel.stock + case(quantities, value=ProductModel.id))
+            .returning(ProductModel.id, ProductModel.stock)
+            .execution_options(synchronize_session=False)
+        ).all()
+        new_levels = {product_id: stock for product_id, stock in rows}
+        self._apply_stock(quantities, new_levels)
+        return new_levels
+
+    @staticmethod
+    def _locked_ids(product_ids: Iterable[int]):
+        # A multi-row UPDATE locks rows in whatever order the plan visits them, so two orders
+        # sharing products could deadlock. Lock them in id order first, then update.
+        return select(
+            select(ProductModel.id)
+            .where(ProductModel.id.in_(list(product_ids)))
+            .order_by(ProductModel.id)
+            .with_for_update()
+            .cte("locked_products")
+            .c.id
+        )
+
+    def _apply_stock(self, product_ids: Iterable[int], new_levels: Dict[int, int]) -> None:
+        # The UPDATEs above bypass the identity map: load the RETURNING values into the products
+        # already there, so reading their stock afterwards does not cost a SELECT each. Products
+        # the UPDATE skipped (short of stock) may still hold a stale value and are expired.
+        product_ids = set(product_ids)
+        for instance in list(self.db.identity_map.values()):
+            if isinstance(instance, ProductModel) and instance.id in product_ids:
+                if instance.id in new_levels:
+                    set_committed_value(instance, "stock", new_levels[instance.id])
+                else:
+                    self.db.expire(instance, ["stock"])
 
     def delete_product(self, product_to_delete: ProductModel) -> None:
         self.db.delete(product_to_delete)
-        self.db.commit()
\ No newline at end of file
+        self.db.flush()
@@ -0,0 +1,103 @@
+from datetime import date as PyDate
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Row, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.domain.product import ProductModel
+from app.models.domain.sales_report import ProductSalesDailyModel, SalesDailyModel
+from app.models.enum.order import OrderStatus
+from app.db.repositories.base import Repository
+
+
+class ReportRepository(Repository):
+    def apply_sales_deltas(
+        self,
+        section_deltas: Dict[Tuple[PyDate, str, str], Tuple[int, int, float]],
+        product_deltas: Dict[Tuple[PyDate, int, str], Tuple[int, float]]
+    ) -> None:
+        """Adds the deltas to the aggregate rows, creating the rows that do not exist yet.
+
+        ``section_deltas`` maps (day, section, status) to (orders, units, revenue) and
+        ``product_deltas`` maps (day, product_id, status) to (units, revenue). The rows are
+        written in key order, so concurrent writers lock them in the same order and cannot
+        deadlock on each other.
+        """
+        if section_deltas:
+            self._upsert_increments(
+                SalesDailyModel, ["day", "section", "status"],
+                [
+                    {"day": day, "section": section, "status": OrderStatus(status), "orders": orders, "units": units, "revenue": revenue}
+                    for (day, section, status), (orders, units, revenue) in sorted(section_deltas.items())
+                ]
+            )
+        if product_deltas:
+            self._upsert_increments(
+                ProductSalesDailyModel, ["day", "product_id", "status"],
+                [
+                    {"day": day, "product_id": product_id, "status": OrderStatus(status), "units": units, "revenue": revenue}
+                    for (day, product_id, status), (units, revenue) in sorted(product_deltas.items())
+                ]
+            )
+
+    def _upsert_increments(self, model, key_columns: List[str], rows: List[dict]) -> None:
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(model)
+        value_columns = [column for column in rows[0] if column not in key_columns]
+        statement = statement.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: getattr(model, column) + getattr(statement.excluded, column) for column in value_columns}
+        )
+        self.db.execute(statement, rows)
+
+    def get_sales(
+        self,
+        start_date: Optional[PyDate] = None,
+        end_date: Optional[PyDate] = None,
+        section: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[SalesDailyModel]:
+        query = self.db.query(SalesDailyModel)
+        if start_date is not None:
+            query = query.filter(SalesDailyModel.day >= start_date)
+        if end_date is not None:
+            query = query.filter(SalesDailyModel.day <= end_date)
+        if section is not None:
+            query = query.filter(SalesDailyModel.section == section)
+        if status is not None:
+            query = query.filter(SalesDailyModel.status == status)
+        return query.filter(SalesDailyModel.units != 0).order_by(
+            SalesDailyModel.day, SalesDailyModel.section, SalesDailyModel.status
+        ).all()
+
+    def get_top_products(
+        self,
+        limit: int = 10,
+        start_date: Optional[PyDate] = None,
+        end_date: Optional[PyDate] = None,
+        statuses: Optional[List[str]] = None,
+        order_by_field: str = "revenue"
+    ) -> List[Row]:
+        units = func.sum(ProductSalesDailyModel.units).label("units")
+        revenue = func.sum(ProductSalesDailyModel.revenue).label("revenue")
+        ranked = self.db.query(ProductSalesDailyModel.product_id, units, revenue)
+        if start_date is not None:
+            ranked = ranked.filter(ProductSalesDailyModel.day >= start_date)
+        if end_date is not None:
+            ranked = ranked.filter(ProductSalesDailyModel.day <= end_date)
+        if statuses is not None:
+            ranked = ranked.filter(ProductSalesDailyModel.status.in_(statuses))
+        ranked = ranked.group_by(ProductSalesDailyModel.product_id).having(units > 0).order_by(
+            (units if order_by_field == "units" else revenue).desc(), ProductSalesDailyModel.product_id
+        ).limit(limit).subquery()
+
+        # Only the ranked page is joined to products for its description and section.
+        rank_column = ranked.c.units if order_by_field == "units" else ranked.c.revenue
+        return self.db.query(
+            ranked.c.product_id,
+            ProductModel.description,
+            ProductModel.section,
+            ranked.c.units,
+            ranked.c.revenue
+        ).outerjoin(ProductModel, ProductModel.id == ranked.c.product_id).order_by(
+            rank_column.desc(), ranked.c.product_id
+        ).all()
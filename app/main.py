@@ -5,8 +5,27 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
 from starlette.middleware.cors import CORSMiddleware
 from app.api.routes import router
+from app.api.middleware import read_your_writes_middleware, query_stats_middleware
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER
+from app.services.idempotency import IDEMPOTENT_REPLAY_HEADER
+from app.db.query_stats import instrument_engines
 from app.api.errors.sentry import init_sentry
 from app.core.config import settings
+from app.api.dependencies.order_event import get_order_event_dispatcher
+from app.api.dependencies.whatsapp import close_whatsapp_service
+from app.api.dependencies.idempotency import get_idempotency_key_purger
+
+
+async def start_order_event_dispatcher() -> None:
+    # Every worker process drains the outbox; SKIP LOCKED keeps them off each other's rows.
+    if settings.ORDER_EVENTS_DISPATCHER_ENABLED:
+        get_order_event_dispatcher().start(poll_outbox=settings.ORDER_EVENTS_BACKEND == "database")
+
+
+async def start_idempotency_key_purger() -> None:
+    # Each process purges too; the DELETEs of different processes just find less to do.
+    if settings.IDEMPOTENCY_PURGE_ENABLED:
+        get_idempotency_key_purger().start()
 
 
 def get_application() -> FastAPI:
@@ -25,13 +44,23 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing", NEXT_CURSOR_HEADER, IDEMPOTENT_REPLAY_HEADER],
     )
 
+    instrument_engines()
+    app.middleware("http")(read_your_writes_middleware)
+    app.middleware("http")(query_stats_middleware)
+
     app.include_router(router)
 
     app.add_event_handler("startup",
         lambda: print("Starting up the application...")                      
     )
+    app.add_event_handler("startup", start_order_event_dispatcher)
+    app.add_event_handler("startup", start_idempotency_key_purger)
+    app.add_event_handler("shutdown", get_order_event_dispatcher().stop)
+    app.add_event_handler("shutdown", get_idempotency_key_purger().stop)
+    app.add_event_handler("shutdown", close_whatsapp_service)
 
     app.add_event_handler("shutdown",
         lambda: print("Shutting down the application...")
@@ -2,4 +2,7 @@ from .customer import CustomerModel
 from .product import ProductModel
 from .order import OrderModel, OrderProduct
 from .user import UserModel
-from .refresh_token import RefreshTokenModel
\ No newline at end of file
+from .refresh_token import RefreshTokenModel
+from .idempotency_key import IdempotencyKeyModel
+from .sales_report import SalesDailyModel, ProductSalesDailyModel
+from .order_event import OrderEventModel, OrderEventDeadLetterModel
\ No newline at end of file
@@ -0,0 +1,22 @@
+from app.db.base import Base
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+
+class IdempotencyKeyModel(Base):
+    __tablename__ = "idempotency_keys"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    # NULL until the first request finishes; while NULL the key is held by locked_until.
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+        # Expired keys are purged in expires_at order.
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
@@ -1,5 +1,5 @@
 from app.db.base import Base
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Float, CheckConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Float, String, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import ENUM as SAEnum 
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -25,8 +25,14 @@ class OrderModel(Base):
     customer = relationship("CustomerModel")
     order_products = relationship("OrderProduct", back_populates="order", cascade="all, delete-orphan")
 
+    # Fetch created_at/updated_at with RETURNING so a written order can be returned without a reload.
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         CheckConstraint("total_amount >= 0", name="check_total_amount_non_negative"),
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_customer_id_created_at_id", "customer_id", "created_at", "id"),
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
     )
 
 class OrderProduct(Base):
@@ -35,6 +41,9 @@ class OrderProduct(Base):
     product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
+    # The product's section when the line was written: sales reports keep counting the line
+    # there even if the product is later moved to another section.
+    section = Column(String, nullable=False)
 
     order = relationship("OrderModel", back_populates="order_products")
     product = relationship("ProductModel")
@@ -42,4 +51,7 @@ class OrderProduct(Base):
     __table_args__ = (
         CheckConstraint("quantity > 0", name="check_quantity_positive"),
         CheckConstraint("unit_price >= 0", name="check_unit_price_non_negative"),
+        Index("ix_order_products_product_id", "product_id"),
+        # orders_in_section: finds a section's lines without scanning the others.
+        Index("ix_order_products_section_order_id", "section", "order_id"),
     )
\ No newline at end of file
@@ -0,0 +1,70 @@
+from app.db.base import Base
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, text
+from sqlalchemy.sql import func
+
+DELIVERY_PENDING = "pending"
+DELIVERY_SENT = "sent"
+DELIVERY_FAILED = "failed"
+DELIVERY_SUPERSEDED = "superseded"
+
+class OrderEventModel(Base):
+    """Outbox of order events, written in the same transaction as the order change.
+
+    The dispatcher (``app.services.order_events``) sends the notification for each row and
+    records the outcome in ``delivery_status``: ``sent``, or ``failed`` once the attempts
+    run out, both with ``processed_at`` set. A ``pending`` row with ``last_error`` is
+    waiting for its retry at ``available_at``. A status change that was replaced by a
+    later one for the same order before going out ends as ``superseded``, unsent.
+    """
+    __tablename__ = "order_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: the event outlives a deleted (or archived) order.
+    order_id = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    delivery_status = Column(String(20), nullable=False, default=DELIVERY_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    # Naive UTC, set by the service: due once it is in the past.
+    available_at = Column(DateTime, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+    # Set while a dispatcher sends the event; a lease that lapsed (the dispatcher died) is claimable again.
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+
+    __table_args__ = (
+        # Only pending events are indexed, so the index stays as small as the backlog.
+        Index(
+            "ix_order_events_pending", "available_at", "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL")
+        ),
+    )
+
+
+class OrderEventDeadLetterModel(Base):
+    """Notifications that ran out of attempts, with their payload and last error.
+
+    Written by the dispatcher with either backend (``event_id`` is the outbox row, None
+    for the memory backend) and replayed with ``app.services.dead_letters``; a replayed
+    letter keeps its row, with ``replayed_at`` set.
+    """
+    __tablename__ = "order_event_dead_letters"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, nullable=True)
+    order_id = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    error = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False)
+    replay_attempts = Column(Integer, nullable=False, default=0)
+    failed_at = Column(DateTime, nullable=False)
+    replayed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_order_event_dead_letters_unreplayed", "id",
+            postgresql_where=text("replayed_at IS NULL"),
+            sqlite_where=text("replayed_at IS NULL")
+        ),
+    )
@@ -1,5 +1,5 @@
 from app.db.base import Base 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from typing import List 
 
@@ -14,6 +14,11 @@ class ProductModel(Base):
     expiry_date = Column(Date, nullable=True) 
     images = relationship("ProductImageModel", back_populates="product", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_products_section_price", "section", "price"),
+        Index("ix_products_in_stock_id", "id", postgresql_where=text("stock > 0"), sqlite_where=text("stock > 0")),
+    )
+
 class ProductImageModel(Base):
     __tablename__ = "product_images"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -22,5 +27,9 @@ class ProductImageModel(Base):
 
     product = relationship("ProductModel", back_populates="images")
 
+    __table_args__ = (
+        Index("ix_product_images_product_id", "product_id"),
+    )
+
     def __repr__(self):
         return f"<ProductImageModel(id={self.id}, url='{self.url[:30]}...', product_id={self.product_id})>"
\ No newline at end of file
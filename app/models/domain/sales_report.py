@@ -0,0 +1,24 @@
+from app.db.base import Base
+from sqlalchemy import Column, Integer, String, Float, Date
+from app.models.domain.order import OrderStatusEnum
+
+# Pre-aggregated sales, kept up to date by OrderService as orders are written.
+
+class SalesDailyModel(Base):
+    __tablename__ = "sales_daily"
+    day = Column(Date, primary_key=True)
+    section = Column(String, primary_key=True)
+    status = Column(OrderStatusEnum, primary_key=True)
+    # Orders with at least one line in the section.
+    orders = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+class ProductSalesDailyModel(Base):
+    __tablename__ = "product_sales_daily"
+    day = Column(Date, primary_key=True)
+    # No foreign key: rows outlive the orders that produced them.
+    product_id = Column(Integer, primary_key=True)
+    status = Column(OrderStatusEnum, primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
@@ -2,3 +2,4 @@ from  .user import UserCreate, UserLogin, RefreshTokenRequest
 from .product import ProductSchema, ProductImageSchema, ProductResponse
 from .order import OrderProductCreate, OrderCreate, OrderStatusUpdate, OrderProductResponse, OrderResponse
 from .customer import CustomerSchema, CustomerResponse
+from .admin import CheckoutWaitBucket, CheckoutWaitStats, PoolStatsResponse
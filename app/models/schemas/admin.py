@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class CheckoutWaitBucket(BaseModel):
+    le_ms: Optional[float] = None
+    count: int
+
+
+class CheckoutWaitStats(BaseModel):
+    count: int
+    sum_ms: float
+    max_ms: float
+    timeouts: int
+    buckets: List[CheckoutWaitBucket]
+
+
+class PoolStatsResponse(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow_in_use: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checkout_wait: Optional[CheckoutWaitStats] = None
+
+
+class RateLimiterStats(BaseModel):
+    rate_per_second: float
+    capacity: int
+    tokens_available: float
+    waiting: int
+    saturation: float
+    acquired: int
+    throttled: int
+    wait_seconds_total: float
+
+
+class CircuitBreakerStats(BaseModel):
+    state: str
+    consecutive_failures: int
+    failure_threshold: int
+    retry_after_seconds: float
+    times_opened: int
+    rejected_calls: int
+
+
+class WhatsappStatsResponse(BaseModel):
+    client_configured: bool
+    rate_limiter: Optional[RateLimiterStats] = None
+    circuit_breaker: CircuitBreakerStats
+
+
+class DeadLetterResponse(BaseModel):
+    id: int
+    event_id: Optional[int] = None
+    order_id: int
+    event_type: str
+    payload: Dict[str, Any]
+    error: Optional[str] = None
+    attempts: int
+    replay_attempts: int
+    failed_at: datetime
+    replayed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DeadLetterReplayResponse(BaseModel):
+    replayed: int
+    failed: int
+    remaining: int
@@ -60,6 +60,35 @@ class OrderCreate(BaseModel):
     )
 
 
+MAX_BULK_ORDERS = 500
+
+
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderCreate]
+
+    @field_validator('orders')
+    def validate_orders(cls, value):
+        if not value:
+            raise ValueError("At least one order must be included")
+        if len(value) > MAX_BULK_ORDERS:
+            raise ValueError(f"At most {MAX_BULK_ORDERS} orders can be created per request")
+        return value
+
+
+class OrderBulkItemResult(BaseModel):
+    index: int
+    status_code: int
+    order_id: Optional[int] = None
+    total_amount: Optional[float] = None
+    error: Optional[str] = None
+
+
+class OrderBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[OrderBulkItemResult]
+
+
 class OrderStatusUpdate(BaseModel):
     status: str
 
@@ -71,6 +100,28 @@ class OrderStatusUpdate(BaseModel):
         return value
 
 
+class OrderBulkStatusUpdate(OrderStatusUpdate):
+    order_ids: List[int]
+
+    @field_validator('order_ids')
+    def validate_order_ids(cls, value):
+        if not value:
+            raise ValueError("At least one order ID must be included")
+        if len(value) > MAX_BULK_ORDERS:
+            raise ValueError(f"At most {MAX_BULK_ORDERS} orders can be updated per request")
+        if any(order_id <= 0 for order_id in value):
+            raise ValueError("Order IDs must be positive integers")
+        # Keep the first occurrence of each id, in request order.
+        return list(dict.fromkeys(value))
+
+
+class OrderBulkStatusResponse(BaseModel):
+    status: str
+    updated: List[int]
+    unchanged: List[int]
+    not_found: List[int]
+
+
 class OrderProductResponse(BaseModel):
     product: ProductResponse  
     quantity: int            
@@ -125,4 +176,21 @@ class OrderResponse(BaseModel):
                 data['status'] = data['status'].value
         return data
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderSummaryResponse(BaseModel):
+    id: int
+    customer_id: int
+    customer_name: Optional[str] = None
+    status: str
+    total_amount: float
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    @field_validator('status', mode='before')
+    @classmethod
+    def status_value(cls, value):
+        return value.value if isinstance(value, PyEnum) else value
+
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
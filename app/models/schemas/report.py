@@ -0,0 +1,30 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from enum import Enum as PyEnum
+
+
+class SalesReportRow(BaseModel):
+    day: date
+    section: str
+    status: str
+    orders: int
+    units: int
+    revenue: float
+
+    @field_validator('status', mode='before')
+    @classmethod
+    def status_value(cls, value):
+        return value.value if isinstance(value, PyEnum) else value
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TopProductRow(BaseModel):
+    product_id: int
+    description: Optional[str] = None
+    section: Optional[str] = None
+    units: int
+    revenue: float
+
+    model_config = ConfigDict(from_attributes=True)
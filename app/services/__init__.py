@@ -2,4 +2,5 @@ from .order import OrderService
 from .products import ProductService
 from .auth import AuthService
 from .customer import CustomerService
-from .whatsapp_service import WhatsappService
\ No newline at end of file
+from .whatsapp_service import WhatsappService
+from .reports import ReportService
\ No newline at end of file
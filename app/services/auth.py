@@ -67,6 +67,8 @@ class AuthService:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
         if expires_at < datetime.now(timezone.utc):
             self.auth_repo.delete_refresh_token(refresh_token)
+            # The request fails from here on, so persist the cleanup before the rollback.
+            self.auth_repo.commit()
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
 
         user_on_db = self.auth_repo.get_user_by_id(token_model.user_id)
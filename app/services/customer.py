@@ -1,13 +1,26 @@
+from typing import Any, List, Optional
+from fastapi import HTTPException, status
 from app.db.repositories.customers import CustomerRepository
 from app.models.domain.customer import CustomerModel
 from app.models.schemas.customer import CustomerSchema
 
+CUSTOMER_CURSOR_FIELDS = ("id", "name", "email", "cpf")
+
+
 class CustomerService:
     def __init__(self, customer_repository: CustomerRepository):
         self.customer_repository = customer_repository
 
-    def get_customers(self, order_by: str = None, skip: int = 0, limit: int = 100):
-        return self.customer_repository.get_customers(order_by, skip, limit)
+    def get_customers(self, order_by: str = None, skip: int = 0, limit: int = 100, after: Optional[List[Any]] = None):
+        if after is not None and (order_by or "id") not in CUSTOMER_CURSOR_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination is not supported when ordering by {order_by}"
+            )
+        try:
+            return self.customer_repository.get_customers(order_by, skip, limit, after)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
 
     def get_customer_by_id(self, id: int):
         return self.customer_repository.get_customer_by_id(id)
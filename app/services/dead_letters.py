@@ -0,0 +1,115 @@
+"""Replay of notifications that ran out of attempts (``order_event_dead_letters``).
+
+After a provider outage the letters can be sent again in bulk, from the admin endpoint
+or from the command line:
+
+    python -m app.services.dead_letters list
+    python -m app.services.dead_letters replay --limit 1000 --batch-size 50 --rate 5
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from app.db.repositories.order_events import OrderEventRepository
+from app.models.domain.order_event import OrderEventDeadLetterModel, OrderEventModel
+from app.services.order_events import DeferredDelivery, deliver_event
+from app.services.resilience import TokenBucket
+from app.services.whatsapp_service import WhatsappService
+
+logger = logging.getLogger("DeadLetterReplay")
+
+REPLAY_BATCH_SIZE = 50
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+async def _replay_one(
+    whatsapp_service: WhatsappService, letter: OrderEventDeadLetterModel, limiter: Optional[TokenBucket]
+) -> Optional[str]:
+    if limiter:
+        await limiter.acquire()
+    event = OrderEventModel(order_id=letter.order_id, event_type=letter.event_type, payload=letter.payload)
+    return await deliver_event(whatsapp_service, event)
+
+async def replay_dead_letters(
+    repository: OrderEventRepository,
+    whatsapp_service: WhatsappService,
+    limit: int,
+    batch_size: int = REPLAY_BATCH_SIZE,
+    rate: Optional[float] = None
+) -> dict:
+    """Sends up to ``limit`` unreplayed letters again, oldest first.
+
+    Each batch is locked, sent and committed on its own, so an interrupted replay keeps
+    what it did. ``rate`` caps the sends per second on top of the WhatsApp service's own
+    limiter, leaving room for live notifications. A letter that fails again keeps its new
+    error and is not retried within the same run; an open circuit stops the run.
+    """
+    limiter = TokenBucket(rate, 1) if rate else None
+    replayed = failed = 0
+    after_id = None
+    circuit_open = False
+    while replayed + failed < limit and not circuit_open:
+        letters = await run_in_threadpool(repository.claim_dead_letters, min(batch_size, limit - replayed - failed), after_id)
+        if not letters:
+            break
+        errors = await asyncio.gather(*(_replay_one(whatsapp_service, letter, limiter) for letter in letters))
+        now = _utcnow()
+        for letter, error in zip(letters, errors):
+            letter.replay_attempts += 1
+            if error is None:
+                letter.replayed_at = now
+                replayed += 1
+            else:
+                letter.error = str(error)
+                failed += 1
+                circuit_open = circuit_open or isinstance(error, DeferredDelivery)
+        after_id = letters[-1].id
+        await run_in_threadpool(repository.commit)
+        logger.info(f"Reenvio de mensagens mortas: {replayed} reenviadas, {failed} falharam até o id {after_id}.")
+
+    if circuit_open:
+        logger.warning("Reenvio interrompido: o circuito do Twilio está aberto.")
+    remaining = await run_in_threadpool(repository.count_unreplayed_dead_letters)
+    return {"replayed": replayed, "failed": failed, "remaining": remaining}
+
+
+def main() -> None:
+    from app.db.connection import session
+
+    parser = argparse.ArgumentParser(description="Inspect and replay notifications that ran out of attempts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="show the most recent unreplayed letters")
+    listing.add_argument("--limit", type=int, default=20)
+    replay = commands.add_parser("replay", help="send unreplayed letters again, oldest first")
+    replay.add_argument("--limit", type=int, default=1000)
+    replay.add_argument("--batch-size", type=int, default=REPLAY_BATCH_SIZE)
+    replay.add_argument("--rate", type=float, default=None, help="messages per second (default: only the service's limiter)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with session() as db:
+        repository = OrderEventRepository(db)
+        if args.command == "list":
+            for letter in repository.get_dead_letters(args.limit):
+                print(f"{letter.id}\tpedido {letter.order_id}\t{letter.event_type}\t{letter.failed_at:%Y-%m-%d %H:%M}\t{letter.error}")
+            print(f"{repository.count_unreplayed_dead_letters()} aguardando reenvio.")
+            return
+
+        async def run() -> dict:
+            whatsapp_service = WhatsappService()
+            try:
+                return await replay_dead_letters(repository, whatsapp_service, args.limit, args.batch_size, args.rate)
+            finally:
+                await whatsapp_service.close()
+
+        result = asyncio.run(run())
+        print(f"Reenviadas: {result['replayed']}, falharam: {result['failed']}, restantes: {result['remaining']}.")
+
+
+if __name__ == "__main__":
+    main()
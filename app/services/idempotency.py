@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Type
+from fastapi import HTTPException, status as http_status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.repositories.idempotency import IdempotencyRepository
+from app.models.domain.idempotency_key import IdempotencyKeyModel
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
+LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+logger = logging.getLogger("IdempotencyService")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def request_fingerprint(endpoint: str, payload: BaseModel) -> str:
+    return hashlib.sha256(f"{endpoint}\n{payload.model_dump_json()}".encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Runs a write once per ``Idempotency-Key`` and replays its response for repeats.
+
+    The key is claimed (and committed) with a short lock before the write starts, so a
+    concurrent duplicate waits for the first request's response instead of running the
+    write again; with a ``session_factory`` the lock is extended while the write runs.
+
+    The response is stored in the write's own transaction, so a crash cannot leave the
+    write committed without it. ``operation`` gets a ``stage_response`` callback: an
+    operation that commits its work calls it with the result right before committing, and
+    the work of one that does not is committed here together with the response. Successful
+    responses are kept for ``IDEMPOTENCY_KEY_TTL_SECONDS``; failed requests release the key
+    so the client can retry them.
+    """
+
+    def __init__(
+        self,
+        idempotency_repository: IdempotencyRepository,
+        user_id: int,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.idempotency_repository = idempotency_repository
+        self.user_id = user_id
+        # The request's session is busy with the write, so the lock is extended from sessions of its own.
+        self.session_factory = session_factory
+
+    async def run(
+        self,
+        key: Optional[str],
+        endpoint: str,
+        payload: BaseModel,
+        operation: Callable[[Callable[[Any], None]], Awaitable[Any]],
+        response_model: Type[BaseModel],
+        status_code: int
+    ) -> Any:
+        if key is None:
+            return await operation(lambda result: None)
+
+        request_hash = request_fingerprint(endpoint, payload)
+        record = await self._claim_or_wait(key, request_hash)
+        if record.status_code is not None:
+            return self._replay(record)
+
+        staged = []
+
+        def stage_response(result: Any) -> None:
+            self._stage_response(record, result, response_model, status_code)
+            staged.append(result)
+
+        keep_locked = asyncio.create_task(self._keep_locked(key, record.expires_at)) if self.session_factory else None
+        try:
+            result = await operation(stage_response)
+            if not staged:
+                await run_in_threadpool(self._store_response, record, result, response_model, status_code)
+        except Exception:
+            # A no-op once the response is committed, or when a retry took the key over meanwhile.
+            await run_in_threadpool(self.idempotency_repository.release_key, self.user_id, key, record.expires_at)
+            raise
+        finally:
+            if keep_locked:
+                keep_locked.cancel()
+        return result
+
+    async def _claim_or_wait(self, key: str, request_hash: str) -> IdempotencyKeyModel:
+        """Returns the key once it is claimed by this request or holds a stored response."""
+        while True:
+            now = _utcnow()
+            record, claimed = await run_in_threadpool(
+                self.idempotency_repository.claim_key,
+                self.user_id,
+                key,
+                request_hash,
+                now,
+                now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+                now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+            )
+            if claimed:
+                return record
+            if record is None:
+                # Released by a failed request between our INSERT and SELECT: claim it again.
+                continue
+            if record.request_hash != request_hash:
+                raise HTTPException(
+                    status_code=http_status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"{IDEMPOTENCY_KEY_HEADER} was already used with a different request"
+                )
+            if record.status_code is not None:
+                return record
+
+            # Another request holds the key: wait for its response or for the lock to lapse,
+            # then go around again to replay the response or take the key over.
+            while record is not None and record.status_code is None and record.locked_until > _utcnow():
+                await asyncio.sleep(LOCK_POLL_INTERVAL_SECONDS)
+                record = await run_in_threadpool(self.idempotency_repository.get_key, self.user_id, key)
+
+    async def _keep_locked(self, key: str, expires_at: datetime) -> None:
+        """Pushes the lock forward every half lock period until cancelled or the key is lost."""
+        while True:
+            await asyncio.sleep(settings.IDEMPOTENCY_LOCK_SECONDS / 2)
+            locked_until = _utcnow() + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            try:
+                if not await run_in_threadpool(self._extend_lock, key, expires_at, locked_until):
+                    return
+            except Exception as e:
+                logger.warning(f"Não foi possível estender a trava da chave de idempotência {key}: {e}")
+                return
+
+    def _extend_lock(self, key: str, expires_at: datetime, locked_until: datetime) -> bool:
+        with self.session_factory() as db:
+            return IdempotencyRepository(db).extend_lock(self.user_id, key, expires_at, locked_until)
+
+    def _stage_response(
+        self,
+        record: IdempotencyKeyModel,
+        result: Any,
+        response_model: Type[BaseModel],
+        status_code: int
+    ) -> None:
+        response_body = response_model.model_validate(result).model_dump(mode="json")
+        if not self.idempotency_repository.store_response(record, status_code, response_body):
+            # Raised before the write commits, so it is rolled back and only the retry's remains.
+            raise HTTPException(
+                status_code=http_status.HTTP_409_CONFLICT,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} was taken over by a retry of this request"
+            )
+
+    def _store_response(
+        self,
+        record: IdempotencyKeyModel,
+        result: Any,
+        response_model: Type[BaseModel],
+        status_code: int
+    ) -> None:
+        self._stage_response(record, result, response_model, status_code)
+        self.idempotency_repository.commit()
+
+    @staticmethod
+    def _replay(record: IdempotencyKeyModel) -> JSONResponse:
+        return JSONResponse(
+            status_code=record.status_code,
+            content=record.response_body,
+            headers={IDEMPOTENT_REPLAY_HEADER: "true"}
+        )
+
+
+class IdempotencyKeyPurger:
+    """Deletes expired ``idempotency_keys`` rows every ``interval`` seconds.
+
+    Expired keys are only overwritten when a client reuses them, so without the purge
+    every request sent with a key would leave a row behind for good. Each run deletes in
+    batches of ``batch_size``, one short transaction per batch, until none are left.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval: float = settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+        batch_size: int = settings.IDEMPOTENCY_PURGE_BATCH_SIZE
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def purge(self) -> int:
+        """Deletes the keys expired by now and returns how many."""
+        now = _utcnow()
+        purged = 0
+        with self.session_factory() as db:
+            repository = IdempotencyRepository(db)
+            while True:
+                deleted = repository.purge_expired(now, self.batch_size)
+                purged += deleted
+                if deleted < self.batch_size:
+                    return purged
+
+    async def run(self) -> None:
+        while True:
+            try:
+                purged = await run_in_threadpool(self.purge)
+                if purged:
+                    logger.info(f"{purged} chave(s) de idempotência expirada(s) removida(s).")
+            except Exception as e:
+                logger.error(f"Erro ao remover chaves de idempotência expiradas: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
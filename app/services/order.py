@@ -1,14 +1,52 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from fastapi import HTTPException, status as http_status
-from app.services.whatsapp_service import logger
+import asyncio
+from fastapi.concurrency import run_in_threadpool
 from datetime import date as PyDate
 
 from app.db.repositories.orders import OrderRepository
 from app.services.products import ProductService 
 from app.db.repositories.customers import CustomerRepository
+from app.db.repositories.reports import ReportRepository
+from app.db.repositories.order_events import OrderEventRepository
 from app.models.domain.order import OrderModel, OrderProduct, OrderStatus 
-from app.models.schemas.order import OrderCreate, OrderStatusUpdate 
+from app.models.domain.order_event import OrderEventModel
+from app.models.domain.product import ProductModel
+from app.models.schemas.order import (
+    OrderBulkItemResult, OrderBulkStatusResponse, OrderBulkStatusUpdate, OrderCreate, OrderStatusUpdate
+)
 from app.services.whatsapp_service import WhatsappService
+from app.services.reports import SalesDelta
+from app.services.order_events import (
+    OrderEventDispatcher, deliver_event, order_created_event, status_changed_event, supersede_stale_status_changes
+)
+
+ORDER_CURSOR_FIELDS = ("created_at", "total_amount", "id", "customer_id")
+
+
+def _quantities_by_product(items) -> Dict[int, int]:
+    quantities: Dict[int, int] = {}
+    for item in items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return quantities
+
+
+def _build_order_products(order_product_inputs, products: Dict[int, ProductModel]) -> tuple[List[OrderProduct], float]:
+    order_product_models = []
+    total_amount = 0.0
+    for item_input in order_product_inputs:
+        product_model = products[item_input.product_id]
+        order_product_models.append(OrderProduct(
+            product_id=product_model.id,
+            quantity=item_input.quantity,
+            unit_price=product_model.price,
+            section=product_model.section,
+            # Keeps the product loaded for the response: the session only holds it weakly.
+            product=product_model
+        ))
+        total_amount += product_model.price * item_input.quantity
+    return order_product_models, total_amount
+
 
 class OrderService:
     def __init__(
@@ -16,12 +54,49 @@ class OrderService:
         order_repository: OrderRepository,
         product_service: ProductService, 
         customer_repository: CustomerRepository,
-        whatsapp_service: WhatsappService
+        whatsapp_service: WhatsappService,
+        report_repository: Optional[ReportRepository] = None,
+        event_repository: Optional[OrderEventRepository] = None,
+        event_dispatcher: Optional[OrderEventDispatcher] = None
     ):
         self.order_repository = order_repository
         self.product_service = product_service 
         self.customer_repository = customer_repository
         self.whatsapp_service = whatsapp_service
+        self.report_repository = report_repository
+        self.event_repository = event_repository
+        self.event_dispatcher = event_dispatcher
+
+    def _sales_delta(self) -> SalesDelta:
+        # Services built without a report repository (e.g. for reads) do not track sales.
+        return SalesDelta(enabled=self.report_repository is not None)
+
+    def _record_sales(self, delta: SalesDelta) -> None:
+        # Same unit of work as the order write, so the aggregates never drift from the orders.
+        if self.report_repository is not None:
+            self.report_repository.apply_sales_deltas(delta.section_deltas(), delta.product_deltas())
+
+    def _queue_events(self, events: List[Optional[OrderEventModel]]) -> List[OrderEventModel]:
+        # Written to the outbox in the order's transaction: the notification is sent by the
+        # dispatcher if and only if the change commits, and the request does not wait for it.
+        events = [event for event in events if event is not None]
+        if self.event_repository is not None and events:
+            supersede_stale_status_changes(self.event_repository, events)
+            self.event_repository.add_events(events)
+        return events
+
+    async def _dispatch_events(self, events: List[OrderEventModel]) -> None:
+        """Hands the committed events over for delivery; only services without a dispatcher wait for it."""
+        if not events:
+            return
+        if self.event_dispatcher is not None:
+            if self.event_repository is not None:
+                self.event_dispatcher.wake()
+            else:
+                self.event_dispatcher.enqueue(events)
+        elif self.event_repository is None:
+            # Services built without an outbox or dispatcher (e.g. in unit tests) still notify, inline.
+            await asyncio.gather(*(deliver_event(self.whatsapp_service, event) for event in events))
 
     def _validate_customer_exists(self, customer_id: int):
         customer = self.customer_repository.get_customer_by_id(customer_id)
@@ -34,49 +109,30 @@ class OrderService:
 
     def _prepare_order_items_and_calc_total(
         self,
-        order_product_inputs: List[dict], 
-        is_update: bool = False,
-        existing_order_products: Optional[List[OrderProduct]] = None
+        order_product_inputs: List[dict]
     ) -> tuple[List[OrderProduct], float]:
-
-        if is_update and existing_order_products:
-            for old_op in existing_order_products:
-                self.product_service.update_product_stock(
-                    product_id=old_op.product_id,
-                    quantity_change=old_op.quantity,
-                    increase=True
-                )
-        
-        new_order_product_models = []
-        current_total_amount = 0.0
-
-        for item_input in order_product_inputs:
-            product_model = self.product_service.get_product_by_id(item_input.product_id)
-
-            if product_model.stock < item_input.quantity: 
-                 raise HTTPException(
+        requested_quantities = _quantities_by_product(order_product_inputs)
+
+        # One SELECT for prices, then one conditional UPDATE that only takes stock that is still
+        # there, so concurrent orders for the same product never hold row locks across the checks.
+        products = self.product_service.get_products_by_ids(requested_quantities)
+        for product_id, quantity in requested_quantities.items():
+            product_model = products[product_id]
+            if product_model.stock < quantity:
+                raise HTTPException(
                     status_code=http_status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient stock for product ID {item_input.product_id}. Available: {product_model.stock}, Requested: {item_input.quantity}"
+                    detail=f"Insufficient stock for product ID {product_id}. Available: {product_model.stock}, Requested: {quantity}"
                 )
 
-            self.product_service.update_product_stock(
-                product_id=product_model.id,
-                quantity_change=item_input.quantity,
-                increase=False 
-            )
+        new_order_product_models, current_total_amount = _build_order_products(order_product_inputs, products)
+        self.product_service.decrease_stock(requested_quantities)
 
-            new_op_model = OrderProduct(
-                product_id=product_model.id,
-                quantity=item_input.quantity,
-                unit_price=product_model.price
-            )
-            new_order_product_models.append(new_op_model)
-            current_total_amount += product_model.price * item_input.quantity
-        
         return new_order_product_models, current_total_amount
 
 
-    async def create_order(self, order_data: OrderCreate) -> OrderModel:
+    def _persist_new_order(
+        self, order_data: OrderCreate, before_commit: Optional[Callable[[OrderModel], None]] = None
+    ) -> tuple[OrderModel, List[OrderEventModel]]:
         customer = self._validate_customer_exists(order_data.customer_id) 
 
         try:
@@ -90,6 +146,7 @@ class OrderService:
         
         order_model_to_create = OrderModel(
             customer_id=order_data.customer_id,
+            customer=customer,
             status=OrderStatus(order_data.status),
             total_amount=total_amount
         )
@@ -98,26 +155,124 @@ class OrderService:
             order_model_to_create, 
             order_product_models
         )
-        if created_order_model: 
-            if customer and customer.phone_number: 
-                customer_name_first_part = customer.name.split(" ")[0]
-                message = (
-                    f"Olá {customer_name_first_part}, seu pedido Lu Estilo #{created_order_model.id} "
-                    f"foi recebido e está sendo processado! Total: R${created_order_model.total_amount:.2f}. "
-                    f"Obrigado!"
+        sales_delta = self._sales_delta()
+        sales_delta.add(created_order_model)
+        self._record_sales(sales_delta)
+        events = self._queue_events([
+            order_created_event(customer, created_order_model.id, created_order_model.total_amount)
+        ])
+        if before_commit is not None:
+            before_commit(created_order_model)
+        self.order_repository.commit()
+        return created_order_model, events
+
+    async def create_order(
+        self, order_data: OrderCreate, before_commit: Optional[Callable[[OrderModel], None]] = None
+    ) -> OrderModel:
+        """``before_commit`` is called with the written order inside its transaction, e.g. to
+        store the idempotent response in the same commit."""
+        # The repositories are synchronous: run them in the threadpool so the event loop stays free.
+        created_order_model, events = await run_in_threadpool(self._persist_new_order, order_data, before_commit)
+        await self._dispatch_events(events)
+        return created_order_model
+
+    def _persist_new_orders(
+        self, orders_data: List[OrderCreate]
+    ) -> tuple[List[OrderBulkItemResult], List[OrderEventModel]]:
+        customers = {
+            customer.id: customer
+            for customer in self.customer_repository.get_customers_by_ids(list({order.customer_id for order in orders_data}))
+        }
+        products = self.product_service.get_products_by_ids(
+            {item.product_id for order in orders_data for item in order.products}, require_all=False
+        )
+
+        # Allocate the stock read above in request order; later orders see what earlier ones took.
+        failures: Dict[int, tuple[int, str]] = {}
+        accepted: Dict[int, Dict[int, int]] = {}
+        available = {product_id: product.stock for product_id, product in products.items()}
+        for index, order_data in enumerate(orders_data):
+            quantities = _quantities_by_product(order_data.products)
+            missing_ids = [product_id for product_id in quantities if product_id not in products]
+            short_ids = [product_id for product_id in quantities if product_id in available and available[product_id] < quantities[product_id]]
+            if order_data.customer_id not in customers:
+                failures[index] = (http_status.HTTP_404_NOT_FOUND, f"Customer with ID {order_data.customer_id} not found")
+            elif missing_ids:
+                failures[index] = (http_status.HTTP_404_NOT_FOUND, f"Product not found: {', '.join(map(str, missing_ids))}")
+            elif len(quantities) != len(order_data.products):
+                failures[index] = (http_status.HTTP_400_BAD_REQUEST, "Each product can only appear once per order")
+            elif short_ids:
+                product_id = short_ids[0]
+                failures[index] = (
+                    http_status.HTTP_400_BAD_REQUEST,
+                    f"Insufficient stock for product ID {product_id}. Available: {available[product_id]}, Requested: {quantities[product_id]}"
                 )
-                try:
-                    success = await self.whatsapp_service.send_message(customer.phone_number, message)
-                    if success:
-                        logger.info(f"Notificação de WhatsApp para o pedido {created_order_model.id} enviada/simulada com sucesso.")
-                    else:
-                        logger.warning(f"Falha ao enviar/simular notificação de WhatsApp para o pedido {created_order_model.id}.")
-                except Exception as e:
-                    logger.error(f"Erro inesperado ao tentar enviar notificação de WhatsApp para pedido {created_order_model.id}: {str(e)}")
-            elif customer:
-                logger.info(f"Cliente {customer.name} (ID: {customer.id}) não possui número de telefone. Notificação WhatsApp não enviada para pedido {created_order_model.id}.")
+            else:
+                for product_id, quantity in quantities.items():
+                    available[product_id] -= quantity
+                accepted[index] = quantities
+
+        while accepted:
+            totals: Dict[int, int] = {}
+            for quantities in accepted.values():
+                for product_id, quantity in quantities.items():
+                    totals[product_id] = totals.get(product_id, 0) + quantity
+            taken = self.product_service.decrease_stock(totals, require_all=False)
+            short_ids = set(totals) - set(taken)
+            if not short_ids:
+                break
+            # A concurrent request took stock after it was read: give back what this round took
+            # and drop the orders that touch the products that ran out.
+            self.product_service.increase_stock({product_id: totals[product_id] for product_id in taken})
+            for index in [index for index, quantities in accepted.items() if short_ids & quantities.keys()]:
+                product_id = min(short_ids & accepted.pop(index).keys())
+                failures[index] = (http_status.HTTP_400_BAD_REQUEST, f"Insufficient stock for product ID {product_id}")
+
+        order_models: Dict[int, OrderModel] = {}
+        for index in accepted:
+            order_data = orders_data[index]
+            order_product_models, total_amount = _build_order_products(order_data.products, products)
+            order_models[index] = OrderModel(
+                customer_id=order_data.customer_id,
+                status=OrderStatus(order_data.status),
+                total_amount=total_amount,
+                order_products=order_product_models
+            )
+        if order_models:
+            self.order_repository.create_orders_bulk(list(order_models.values()))
+            sales_delta = self._sales_delta()
+            for order_model in order_models.values():
+                sales_delta.add(order_model)
+            self._record_sales(sales_delta)
+            events = self._queue_events([
+                order_created_event(customers[order_model.customer_id], order_model.id, order_model.total_amount)
+                for order_model in order_models.values()
+            ])
+            self.order_repository.commit()
+        else:
+            events = []
+
+        results = []
+        for index in range(len(orders_data)):
+            if index in order_models:
+                order_model = order_models[index]
+                results.append(OrderBulkItemResult(
+                    index=index, status_code=http_status.HTTP_201_CREATED,
+                    order_id=order_model.id, total_amount=order_model.total_amount
+                ))
+            else:
+                status_code, error = failures[index]
+                results.append(OrderBulkItemResult(index=index, status_code=status_code, error=error))
+        return results, events
 
-        return created_order_model
+    async def create_orders_bulk(self, orders_data: List[OrderCreate]) -> List[OrderBulkItemResult]:
+        """Creates every order that can be filled and reports a result per input, in input order.
+
+        Orders that fail (unknown customer or product, not enough stock) do not stop the others.
+        """
+        results, events = await run_in_threadpool(self._persist_new_orders, orders_data)
+        await self._dispatch_events(events)
+        return results
 
     def get_order_by_id(self, order_id: int) -> OrderModel:
         order = self.order_repository.get_order_by_id(order_id)
@@ -138,8 +293,17 @@ class OrderService:
         end_date_str: Optional[str] = None,   
         order_by_field: str = "created_at",
         order_direction: str = "desc",
-        product_section: Optional[str] = None
-    ) -> List[OrderModel]:
+        product_section: Optional[str] = None,
+        after: Optional[List[Any]] = None,
+        summary: bool = False
+    ) -> List[Any]:
+        """Lists orders; with ``summary`` only the columns of ``OrderSummaryResponse`` are loaded."""
+        if after is not None and order_by_field not in ORDER_CURSOR_FIELDS:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination is not supported when ordering by {order_by_field}"
+            )
+
         if status_filter is not None:
             try:
                 OrderStatus(status_filter) 
@@ -160,13 +324,23 @@ class OrderService:
             except ValueError:
                 raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Invalid end_date format. Use YYYY-MM-DD.")
 
-        return self.order_repository.get_orders(
-            limit=limit, skip=skip, customer_id=customer_id, status_filter=status_filter,
-            start_date=parsed_start_date, end_date=parsed_end_date,
-            order_by_field=order_by_field, order_direction=order_direction, product_section=product_section
-        )
+        list_orders = self.order_repository.get_order_summaries if summary else self.order_repository.get_orders
+        try:
+            return list_orders(
+                limit=limit, skip=skip, customer_id=customer_id, status_filter=status_filter,
+                start_date=parsed_start_date, end_date=parsed_end_date,
+                order_by_field=order_by_field, order_direction=order_direction, product_section=product_section,
+                after=after
+            )
+        except ValueError:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
     
-    async def update_order_status(self, order_id: int, status_update_data: OrderStatusUpdate) -> OrderModel:
+    def _persist_status_change(
+        self,
+        order_id: int,
+        status_update_data: OrderStatusUpdate,
+        before_commit: Optional[Callable[[OrderModel], None]] = None
+    ) -> tuple[OrderModel, List[OrderEventModel]]:
         order_to_update = self.get_order_by_id(order_id) 
         if not order_to_update: 
              raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="Order not found")
@@ -189,40 +363,89 @@ class OrderService:
             else:
                  items_to_restore = order_to_update.order_products
 
-            for op in items_to_restore:
-                self.product_service.update_product_stock(op.product_id, op.quantity, increase=True)
+            self.product_service.increase_stock(_quantities_by_product(items_to_restore))
 
+        sales_delta = self._sales_delta()
+        sales_delta.add(order_to_update, -1)
         updated_order_model = self.order_repository.update_order_status(order_to_update, new_status_enum)
+        sales_delta.add(updated_order_model)
+        self._record_sales(sales_delta)
+        events = self._queue_events([
+            status_changed_event(updated_order_model.customer, updated_order_model.id, new_status_str)
+        ])
+        if before_commit is not None:
+            before_commit(updated_order_model)
+        self.order_repository.commit()
+        return updated_order_model, events
+
+    async def update_order_status(
+        self,
+        order_id: int,
+        status_update_data: OrderStatusUpdate,
+        before_commit: Optional[Callable[[OrderModel], None]] = None
+    ) -> OrderModel:
+        updated_order_model, events = await run_in_threadpool(
+            self._persist_status_change, order_id, status_update_data, before_commit
+        )
+        await self._dispatch_events(events)
+        return updated_order_model
 
-        if updated_order_model:
-            customer = updated_order_model.customer 
-            if customer and customer.phone_number:
-                customer_name_first_part = customer.name.split(" ")[0]
-                
-                message_map = {
-                    OrderStatus.PROCESSING.value: f"Seu pedido Lu Estilo #{updated_order_model.id} está sendo preparado para envio!",
-                    OrderStatus.COMPLETED.value: f"Oba! Seu pedido Lu Estilo #{updated_order_model.id} foi concluído e enviado. Código de rastreio: XYZ123BR.",
-                    OrderStatus.CANCELED.value: f"Seu pedido Lu Estilo #{updated_order_model.id} foi cancelado conforme solicitado."
-                }
-                
-                message_body = message_map.get(new_status_str) 
-                
-                if message_body: 
-                    full_message = f"Olá {customer_name_first_part}, {message_body}"
-                    try:
-                        success = await self.whatsapp_service.send_message(customer.phone_number, full_message)
-                        if success:
-                            logger.info(f"Notificação de status '{new_status_str}' para o pedido {updated_order_model.id} enviada/simulada.")
-                        else:
-                            logger.warning(f"Falha ao enviar/simular notificação de status '{new_status_str}' para o pedido {updated_order_model.id}.")
-                    except Exception as e:
-                        logger.error(f"Erro inesperado ao tentar enviar notificação de status (WhatsApp) para pedido {updated_order_model.id}: {str(e)}")
-                else:
-                    logger.info(f"Nenhuma mensagem de WhatsApp configurada para o status '{new_status_str}' do pedido {updated_order_model.id}.")
-            elif customer:
-                logger.info(f"Cliente {customer.name} não possui número de telefone. Notificação de status (WhatsApp) não enviada para pedido {updated_order_model.id}.")
+    def _persist_bulk_status_change(
+        self, status_update_data: OrderBulkStatusUpdate
+    ) -> tuple[OrderBulkStatusResponse, List[OrderEventModel]]:
+        new_status = OrderStatus(status_update_data.status)
+        order_ids = status_update_data.order_ids
+
+        current_statuses = self.order_repository.lock_order_statuses(order_ids)
+        changed_ids = [order_id for order_id in order_ids if order_id in current_statuses and current_statuses[order_id] != new_status]
+        updated_rows = self.order_repository.update_orders_status(changed_ids, new_status)
+
+        canceled_ids = {
+            order_id for order_id in changed_ids
+            if new_status == OrderStatus.CANCELED and current_statuses[order_id] != OrderStatus.CANCELED
+        }
+        sales_delta = self._sales_delta()
+        if canceled_ids or sales_delta.enabled:
+            lines_by_order: Dict[int, list] = {}
+            for line in self.order_repository.get_order_lines(changed_ids):
+                lines_by_order.setdefault(line.order_id, []).append(line)
+
+            # Stock of every newly canceled order goes back in one UPDATE.
+            if canceled_ids:
+                self.product_service.increase_stock(_quantities_by_product(
+                    line for order_id in canceled_ids for line in lines_by_order.get(order_id, [])
+                ))
+            for row in updated_rows:
+                lines = [
+                    (line.product_id, line.section, line.quantity, line.unit_price)
+                    for line in lines_by_order.get(row.id, [])
+                ]
+                sales_delta.add_lines(row.created_at, current_statuses[row.id], lines, -1)
+                sales_delta.add_lines(row.created_at, new_status, lines)
+            self._record_sales(sales_delta)
+
+        customers = {
+            customer.id: customer
+            for customer in self.customer_repository.get_customers_by_ids(list({row.customer_id for row in updated_rows}))
+        } if updated_rows else {}
+        events = self._queue_events([
+            status_changed_event(customers.get(row.customer_id), row.id, new_status.value) for row in updated_rows
+        ])
+        self.order_repository.commit()
+
+        response = OrderBulkStatusResponse(
+            status=new_status.value,
+            updated=changed_ids,
+            unchanged=[order_id for order_id in order_ids if order_id in current_statuses and order_id not in changed_ids],
+            not_found=[order_id for order_id in order_ids if order_id not in current_statuses]
+        )
+        return response, events
 
-        return updated_order_model
+    async def update_orders_status(self, status_update_data: OrderBulkStatusUpdate) -> OrderBulkStatusResponse:
+        """Moves many orders to one status: one UPDATE for the orders, one for restored stock."""
+        response, events = await run_in_threadpool(self._persist_bulk_status_change, status_update_data)
+        await self._dispatch_events(events)
+        return response
 
 
     def delete_order(self, order_id: int) -> None:
@@ -242,24 +465,54 @@ class OrderService:
 
         self._validate_customer_exists(order_update_data.customer_id)
         try:
-            OrderStatus(order_update_data.status)
+            new_status = OrderStatus(order_update_data.status)
         except ValueError:
             raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Invalid order status: {order_update_data.status}")
 
+        old_lines = {op.product_id: op for op in order_to_update.order_products}
+        new_quantities = _quantities_by_product(order_update_data.products)
 
-        new_order_product_models, new_total_amount = self._prepare_order_items_and_calc_total(
-            order_update_data.products,
-            is_update=True,
-            existing_order_products=list(order_to_update.order_products) 
-        )
-
-        return self.order_repository.update_order(
+        # Every line is priced again at the product's current price, as when the order was placed.
+        products = self.product_service.get_products_by_ids(new_quantities)
+        new_order_products = [
+            OrderProduct(
+                product_id=product_id, quantity=quantity,
+                unit_price=products[product_id].price, section=products[product_id].section,
+                product=products[product_id]
+            )
+            for product_id, quantity in new_quantities.items()
+        ]
+        new_total_amount = sum(op.unit_price * op.quantity for op in new_order_products)
+
+        # A canceled order holds no stock, so only the net difference in what is held moves.
+        current_status = order_to_update.status.value if isinstance(order_to_update.status, OrderStatus) else order_to_update.status
+        held_before = {} if current_status == OrderStatus.CANCELED.value else {
+            product_id: op.quantity for product_id, op in old_lines.items()
+        }
+        held_after = {} if new_status == OrderStatus.CANCELED else new_quantities
+        stock_deltas = {
+            product_id: held_after.get(product_id, 0) - held_before.get(product_id, 0)
+            for product_id in held_before.keys() | held_after.keys()
+        }
+        to_take = {product_id: delta for product_id, delta in stock_deltas.items() if delta > 0}
+        to_return = {product_id: -delta for product_id, delta in stock_deltas.items() if delta < 0}
+        if to_take:
+            self.product_service.decrease_stock(to_take)
+        if to_return:
+            self.product_service.increase_stock(to_return)
+
+        sales_delta = self._sales_delta()
+        sales_delta.add(order_to_update, -1)
+        updated_order = self.order_repository.update_order(
             order_to_update,
             new_customer_id=order_update_data.customer_id,
-            new_status=order_update_data.status,
+            new_status=new_status,
             new_total_amount=new_total_amount,
-            new_order_products=new_order_product_models
+            new_order_products=new_order_products
         )
+        sales_delta.add(updated_order)
+        self._record_sales(sales_delta)
+        return updated_order
 
     def delete_order(self, order_id: int) -> None:
         order_to_delete = self.get_order_by_id(order_id) 
@@ -271,4 +524,7 @@ class OrderService:
                 except HTTPException as e:
                     print(f"Warning: Could not restore stock for product {op.product_id} during order deletion: {e.detail}")
         
+        sales_delta = self._sales_delta()
+        sales_delta.add(order_to_delete, -1)
+        self._record_sales(sales_delta)
         self.order_repository.delete_order(order_to_delete)
\ No newline at end of file
@@ -0,0 +1,406 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.repositories.order_events import OrderEventRepository
+from app.models.domain.customer import CustomerModel
+from app.models.domain.order_event import (
+    DELIVERY_FAILED, DELIVERY_PENDING, DELIVERY_SENT, DELIVERY_SUPERSEDED, OrderEventDeadLetterModel, OrderEventModel
+)
+from app.models.domain.order import OrderStatus
+from app.services.resilience import CircuitOpenError
+from app.services.whatsapp_service import MessageRejectedError, WhatsappService
+
+logger = logging.getLogger("OrderEventDispatcher")
+
+ORDER_CREATED = "order_created"
+ORDER_STATUS_CHANGED = "order_status_changed"
+
+STATUS_MESSAGES = {
+    OrderStatus.PROCESSING.value: "Seu pedido Lu Estilo #{order_id} está sendo preparado para envio!",
+    OrderStatus.COMPLETED.value: "Oba! Seu pedido Lu Estilo #{order_id} foi concluído e enviado. Código de rastreio: XYZ123BR.",
+    OrderStatus.CANCELED.value: "Seu pedido Lu Estilo #{order_id} foi cancelado conforme solicitado."
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _new_event(customer: CustomerModel, order_id: int, event_type: str, delay: float = 0, **data) -> OrderEventModel:
+    # The customer's phone and name are captured now, as they were when the order changed.
+    return OrderEventModel(
+        order_id=order_id,
+        event_type=event_type,
+        payload={
+            "customer_id": customer.id,
+            "phone_number": customer.phone_number,
+            "first_name": customer.name.split(" ")[0],
+            **data
+        },
+        attempts=0,
+        delivery_status=DELIVERY_PENDING,
+        available_at=_utcnow() + timedelta(seconds=delay)
+    )
+
+def order_created_event(customer: Optional[CustomerModel], order_id: int, total_amount: float) -> Optional[OrderEventModel]:
+    """The event to notify the customer of a new order, or None when there is no one to notify."""
+    if customer and customer.phone_number:
+        return _new_event(customer, order_id, ORDER_CREATED, total_amount=total_amount)
+    if customer:
+        logger.info(f"Cliente {customer.name} (ID: {customer.id}) não possui número de telefone. Notificação WhatsApp não enviada para pedido {order_id}.")
+    return None
+
+def status_changed_event(customer: Optional[CustomerModel], order_id: int, new_status_str: str) -> Optional[OrderEventModel]:
+    """The event to notify the customer of a status change, or None when there is nothing to send."""
+    if customer and customer.phone_number:
+        if new_status_str in STATUS_MESSAGES:
+            # Held back for the coalescing window, so a quicker follow-up status can replace it.
+            return _new_event(
+                customer, order_id, ORDER_STATUS_CHANGED, delay=settings.ORDER_EVENTS_COALESCE_SECONDS, status=new_status_str
+            )
+        logger.info(f"Nenhuma mensagem de WhatsApp configurada para o status '{new_status_str}' do pedido {order_id}.")
+    elif customer:
+        logger.info(f"Cliente {customer.name} não possui número de telefone. Notificação de status (WhatsApp) não enviada para pedido {order_id}.")
+    return None
+
+def supersede_stale_status_changes(repository: OrderEventRepository, events: List[OrderEventModel]) -> None:
+    """Database backend: the orders in ``events`` whose status changed again drop the
+    status notification still waiting in the outbox, so only the latest one is sent."""
+    order_ids = {event.order_id for event in events if event.event_type == ORDER_STATUS_CHANGED}
+    superseded = repository.supersede_pending(order_ids, ORDER_STATUS_CHANGED, _utcnow())
+    if superseded:
+        logger.info(f"{superseded} notificação(ões) de status substituída(s) por uma mais recente do mesmo pedido.")
+
+def render_message(event: OrderEventModel) -> str:
+    payload = event.payload
+    if event.event_type == ORDER_CREATED:
+        return (
+            f"Olá {payload['first_name']}, seu pedido Lu Estilo #{event.order_id} "
+            f"foi recebido e está sendo processado! Total: R${payload['total_amount']:.2f}. "
+            f"Obrigado!"
+        )
+    message_body = STATUS_MESSAGES[payload["status"]].format(order_id=event.order_id)
+    return f"Olá {payload['first_name']}, {message_body}"
+
+class DeferredDelivery(str):
+    """The reason a message was not even attempted (the provider's circuit is open).
+
+    ``record_attempt`` reschedules it after ``retry_after`` without using up an attempt.
+    """
+
+    def __new__(cls, reason: str, retry_after: float):
+        deferred = super().__new__(cls, reason)
+        deferred.retry_after = retry_after
+        return deferred
+
+class PermanentFailure(str):
+    """The reason a message can never go out (the provider refused it).
+
+    ``record_attempt`` fails the event right away instead of retrying it.
+    """
+
+async def deliver_event(whatsapp_service: WhatsappService, event: OrderEventModel) -> Optional[str]:
+    """Sends the event's WhatsApp message. Returns None when it went out, else the reason it did not."""
+    try:
+        success = await whatsapp_service.send_message(event.payload["phone_number"], render_message(event))
+    except CircuitOpenError as e:
+        logger.warning(f"Twilio indisponível (circuito aberto): notificação ({event.event_type}) do pedido {event.order_id} adiada.")
+        return DeferredDelivery(str(e), e.retry_after)
+    except MessageRejectedError as e:
+        logger.error(f"Twilio recusou a notificação de WhatsApp ({event.event_type}) do pedido {event.order_id}: {e}")
+        return PermanentFailure(str(e))
+    except Exception as e:
+        logger.error(f"Erro inesperado ao tentar enviar notificação de WhatsApp ({event.event_type}) para pedido {event.order_id}: {str(e)}")
+        return str(e) or type(e).__name__
+    if not success:
+        logger.warning(f"Falha ao enviar/simular notificação de WhatsApp ({event.event_type}) para o pedido {event.order_id}.")
+        return "send_message returned False"
+    logger.info(f"Notificação de WhatsApp ({event.event_type}) para o pedido {event.order_id} enviada/simulada com sucesso.")
+    return None
+
+
+def backoff_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter for the retry after the ``attempts``-th failure.
+
+    The delay doubles per attempt up to ``cap``; half of it is random, so messages that
+    failed together (e.g. during a provider outage) do not all come back at once.
+    """
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def record_attempt(event: OrderEventModel, error: Optional[str], now: datetime, max_attempts: int, backoff: Callable[[int], float]) -> None:
+    """Updates the event's delivery status after one send attempt."""
+    if isinstance(error, DeferredDelivery):
+        # Jittered, so the deferred messages do not all rush the breaker's first probe.
+        event.last_error = str(error)
+        event.available_at = now + timedelta(seconds=error.retry_after + backoff(1))
+        return
+    event.attempts += 1
+    if error is None:
+        event.delivery_status = DELIVERY_SENT
+        event.processed_at = now
+        event.last_error = None
+    elif isinstance(error, PermanentFailure) or event.attempts >= max_attempts:
+        event.delivery_status = DELIVERY_FAILED
+        event.processed_at = now
+        event.last_error = error
+        logger.error(f"Notificação {event.id} do pedido {event.order_id} descartada após {event.attempts} tentativas: {error}")
+    else:
+        event.last_error = error
+        event.available_at = now + timedelta(seconds=backoff(event.attempts))
+
+def dead_letter_for(event: OrderEventModel) -> OrderEventDeadLetterModel:
+    return OrderEventDeadLetterModel(
+        event_id=event.id,
+        order_id=event.order_id,
+        event_type=event.event_type,
+        payload=event.payload,
+        error=event.last_error,
+        attempts=event.attempts,
+        replay_attempts=0,
+        failed_at=event.processed_at or _utcnow()
+    )
+
+
+class OrderEventDispatcher:
+    """Sends order notifications with a bounded pool of workers fed by an in-process queue.
+
+    With the ``database`` backend the queue is filled from the ``order_events`` outbox:
+    each batch is leased for ``lease_seconds`` (``locked_until``, written under
+    ``FOR UPDATE SKIP LOCKED``) and committed, sent by the workers without a session, and
+    marked in a second transaction. Any number of dispatchers (one per worker process) can
+    run side by side, and a crash mid-batch only means the batch is sent again once its
+    lease lapses. With the
+    ``memory`` backend, ``enqueue`` hands committed events straight to the workers and
+    retries are scheduled in-process, which is faster but loses what is pending on restart.
+    Either way a failed send is retried with exponential backoff and jitter, up to
+    ``max_attempts`` times, and one that runs out of attempts, or that the provider
+    refused, is copied to the ``order_event_dead_letters`` table for
+    ``app.services.dead_letters`` to replay.
+
+    Status changes wait ``coalesce_window`` seconds before going out; one replaced by a
+    later status of the same order in the meantime is marked ``superseded`` and never sent.
+    The outbox does this through ``available_at`` and ``supersede_stale_status_changes``,
+    the memory backend by holding the latest event per order on a timer.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        whatsapp_service: WhatsappService,
+        workers: int = settings.ORDER_EVENTS_WORKERS,
+        batch_size: int = settings.ORDER_EVENTS_BATCH_SIZE,
+        poll_interval: float = settings.ORDER_EVENTS_POLL_INTERVAL,
+        lease_seconds: float = settings.ORDER_EVENTS_LEASE_SECONDS,
+        max_attempts: int = settings.ORDER_EVENTS_MAX_ATTEMPTS,
+        backoff_base: float = settings.ORDER_EVENTS_BACKOFF_BASE_SECONDS,
+        backoff_max: float = settings.ORDER_EVENTS_BACKOFF_MAX_SECONDS,
+        queue_size: int = settings.ORDER_EVENTS_QUEUE_SIZE,
+        coalesce_window: float = settings.ORDER_EVENTS_COALESCE_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.whatsapp_service = whatsapp_service
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_size = queue_size
+        self.coalesce_window = coalesce_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._retries: Dict[int, asyncio.TimerHandle] = {}
+        self._held: Dict[int, Tuple[OrderEventModel, asyncio.TimerHandle]] = {}
+        self._in_flight = 0
+        self._dead_letter_writes: Set[asyncio.Task] = set()
+
+    def backoff(self, attempts: int) -> float:
+        return backoff_delay(attempts, self.backoff_base, self.backoff_max)
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        # Started on first use, on the running loop.
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        return self._queue
+
+    async def _work(self) -> None:
+        while True:
+            event, done = await self._queue.get()
+            self._in_flight += 1
+            try:
+                error = await deliver_event(self.whatsapp_service, event)
+                if done is None:
+                    self._record_in_memory(event, error)
+                elif not done.cancelled():
+                    done.set_result(error)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _send_all(self, events: List[OrderEventModel]) -> List[Optional[str]]:
+        queue = self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        results = []
+        for event in events:
+            done = loop.create_future()
+            await queue.put((event, done))
+            results.append(done)
+        return list(await asyncio.gather(*results))
+
+    async def dispatch_batch(self) -> int:
+        """Sends one batch of due outbox events and returns how many were claimed.
+
+        The batch is leased in one short transaction and finished in another; no
+        connection is held and no row is locked while the messages are sent.
+        """
+        locked_until = _utcnow() + timedelta(seconds=self.lease_seconds)
+        events = await run_in_threadpool(self._lease_batch, locked_until)
+        if not events:
+            return 0
+        errors = await self._send_all(events)
+        await run_in_threadpool(self._finish_batch, events, errors, locked_until)
+        return len(events)
+
+    def _lease_batch(self, locked_until: datetime) -> List[OrderEventModel]:
+        with self.session_factory() as db:
+            repository = OrderEventRepository(db)
+            events = repository.lease_pending(self.batch_size, _utcnow(), locked_until)
+            repository.commit()
+            return events
+
+    def _finish_batch(self, events: List[OrderEventModel], errors: List[Optional[str]], locked_until: datetime) -> None:
+        errors_by_id = {event.id: error for event, error in zip(events, errors)}
+        with self.session_factory() as db:
+            repository = OrderEventRepository(db)
+            leased = repository.get_leased(errors_by_id, locked_until)
+            if len(leased) < len(events):
+                logger.warning(
+                    f"{len(events) - len(leased)} notificação(ões) enviada(s) depois de a reserva expirar; "
+                    f"outro processo já as reservou de novo."
+                )
+            now = _utcnow()
+            for event in leased:
+                event.locked_until = None
+                record_attempt(event, errors_by_id[event.id], now, self.max_attempts, self.backoff)
+            repository.add_dead_letters([dead_letter_for(event) for event in leased if event.delivery_status == DELIVERY_FAILED])
+            repository.commit()
+
+    def enqueue(self, events: List[OrderEventModel]) -> None:
+        """Memory backend: queues already committed events for the workers without waiting."""
+        self._ensure_workers()
+        for event in events:
+            if event.event_type == ORDER_STATUS_CHANGED and self.coalesce_window > 0:
+                self._hold(event)
+            else:
+                self._put(event)
+
+    def _put(self, event: OrderEventModel) -> None:
+        try:
+            self._queue.put_nowait((event, None))
+        except asyncio.QueueFull:
+            event.delivery_status = DELIVERY_FAILED
+            event.last_error = "notification queue full"
+            event.processed_at = _utcnow()
+            logger.error(f"Fila de notificações cheia: notificação do pedido {event.order_id} descartada.")
+            self._dead_letter(event)
+
+    def _hold(self, event: OrderEventModel) -> None:
+        previous = self._held.pop(event.order_id, None)
+        if previous is not None:
+            superseded, handle = previous
+            handle.cancel()
+            superseded.delivery_status = DELIVERY_SUPERSEDED
+            superseded.processed_at = _utcnow()
+        handle = asyncio.get_running_loop().call_later(self.coalesce_window, self._release, event)
+        self._held[event.order_id] = (event, handle)
+
+    def _release(self, event: OrderEventModel) -> None:
+        del self._held[event.order_id]
+        self._put(event)
+
+    def _record_in_memory(self, event: OrderEventModel, error: Optional[str]) -> None:
+        record_attempt(event, error, _utcnow(), self.max_attempts, self.backoff)
+        if event.delivery_status == DELIVERY_PENDING:
+            delay = (event.available_at - _utcnow()).total_seconds()
+            self._retries[id(event)] = asyncio.get_running_loop().call_later(max(delay, 0), self._retry, event)
+        elif event.delivery_status == DELIVERY_FAILED:
+            self._dead_letter(event)
+
+    def _dead_letter(self, event: OrderEventModel) -> None:
+        # Memory backend: the event was never in the database, so write it down before it is lost.
+        write = asyncio.create_task(run_in_threadpool(self._store_dead_letter, dead_letter_for(event)))
+        self._dead_letter_writes.add(write)
+        write.add_done_callback(self._dead_letter_writes.discard)
+
+    def _store_dead_letter(self, dead_letter: OrderEventDeadLetterModel) -> None:
+        db = self.session_factory()
+        try:
+            repository = OrderEventRepository(db)
+            repository.add_dead_letters([dead_letter])
+            repository.commit()
+        except Exception as e:
+            logger.error(f"Erro ao gravar notificação descartada do pedido {dead_letter.order_id} na fila de mensagens mortas: {e}")
+        finally:
+            db.close()
+
+    def _retry(self, event: OrderEventModel) -> None:
+        del self._retries[id(event)]
+        self._put(event)
+
+    def backlog(self) -> int:
+        """Events this process holds but has not finished: queued, being sent, held for
+        coalescing or waiting for an in-memory retry. Outbox rows not yet claimed are not counted."""
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return queued + self._in_flight + len(self._held) + len(self._retries)
+
+    def wake(self) -> None:
+        """Database backend: lets the poller claim new events now instead of after its interval."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                claimed = await self.dispatch_batch()
+            except Exception as e:
+                logger.error(f"Erro ao processar a fila de eventos de pedidos: {e}")
+                claimed = 0
+            # A full batch means there is probably more waiting: go again right away.
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def start(self, poll_outbox: bool = True) -> None:
+        self._ensure_workers()
+        if poll_outbox and self._poller is None:
+            self._poller = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._dead_letter_writes:
+            await asyncio.gather(*self._dead_letter_writes, return_exceptions=True)
+        for handle in self._retries.values():
+            handle.cancel()
+        for _, handle in self._held.values():
+            handle.cancel()
+        tasks = self._worker_tasks + ([self._poller] if self._poller is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue, self._worker_tasks, self._poller, self._wakeup = None, [], None, None
+        self._retries, self._held, self._in_flight = {}, {}, 0
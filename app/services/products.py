@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 
@@ -24,15 +24,20 @@ class ProductService:
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         available: Optional[bool] = None,
+        after: Optional[List[Any]] = None,
     ) -> List[ProductModel]:
-        return self.product_repository.get_products(
-            skip=skip,
-            limit=limit,
-            section=section,
-            min_price=min_price,
-            max_price=max_price,
-            available=available
-        )
+        try:
+            return self.product_repository.get_products(
+                skip=skip,
+                limit=limit,
+                section=section,
+                min_price=min_price,
+                max_price=max_price,
+                available=available,
+                after=after
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
 
     def create_product(self, product_create_data: ProductSchema) -> ProductModel:
         barcode_already_registered = self.product_repository.get_product_by_barcode(
@@ -73,20 +78,48 @@ class ProductService:
             )
 
 
-    def update_product_stock(self, product_id: int, quantity_change: int, increase: bool = False) -> ProductModel:
-        product = self.get_product_by_id(product_id) 
-        if not increase: 
-            if quantity_change < 0:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity to decrease must be non-negative")
-            if product.stock < quantity_change:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient stock")
-            new_stock_level = product.stock - quantity_change
-        else: 
-            if quantity_change < 0:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity to increase must be non-negative")
-            new_stock_level = product.stock + quantity_change
-        
-        return self.product_repository.update_stock(product, new_stock_level)
+    def update_product_stock(self, product_id: int, quantity_change: int, increase: bool = False) -> int:
+        if quantity_change < 0:
+            direction = "increase" if increase else "decrease"
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Quantity to {direction} must be non-negative")
+
+        if increase:
+            new_stock_level = self.product_repository.increment_stock(product_id, quantity_change)
+        else:
+            new_stock_level = self.product_repository.decrement_stock(product_id, quantity_change)
+
+        if new_stock_level is None:
+            self.get_product_by_id(product_id)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient stock")
+        return new_stock_level
+
+    def get_products_by_ids(self, product_ids: Iterable[int], require_all: bool = True) -> Dict[int, ProductModel]:
+        product_ids = sorted(set(product_ids))
+        products = {product.id: product for product in self.product_repository.get_products_by_ids(product_ids)}
+        missing_ids = [product_id for product_id in product_ids if product_id not in products]
+        if missing_ids and require_all:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product not found: {', '.join(str(product_id) for product_id in missing_ids)}"
+            )
+        return products
+
+    def decrease_stock(self, quantities: Dict[int, int], require_all: bool = True) -> Dict[int, int]:
+        """Returns the new stock levels. With ``require_all=False`` the products that were
+        short are simply missing from the result instead of raising."""
+        new_stock_levels = self.product_repository.decrement_stock_bulk(quantities)
+        if not require_all:
+            return new_stock_levels
+        for product_id in sorted(quantities):
+            if product_id not in new_stock_levels:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Insufficient stock for product ID {product_id}. Requested: {quantities[product_id]}"
+                )
+        return new_stock_levels
+
+    def increase_stock(self, quantities: Dict[int, int]) -> Dict[int, int]:
+        return self.product_repository.increment_stock_bulk(quantities)
 
     def delete_product(self, product_id: int) -> None:
         product_to_delete = self.get_product_by_id(product_id)
@@ -0,0 +1,128 @@
+from datetime import date as PyDate, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status as http_status
+
+from app.db.repositories.reports import ReportRepository
+from app.models.domain.order import OrderModel
+from app.models.enum.order import OrderStatus
+
+TOP_PRODUCTS_ORDER_FIELDS = ("revenue", "units")
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[PyDate]:
+    if not value:
+        return None
+    try:
+        return PyDate.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} format. Use YYYY-MM-DD.")
+
+
+def _validate_status(value: Optional[str]) -> None:
+    if value is not None:
+        try:
+            OrderStatus(value)
+        except ValueError:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Invalid order status filter: {value}")
+
+
+class SalesDelta:
+    """Change to the sales aggregates caused by writing orders.
+
+    Call ``add(order, -1)`` before an order changes and ``add(order)`` after it; only the
+    net difference is written, so an update that does not touch sales writes nothing.
+    A disabled delta ignores the orders it is given.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.sections: Dict[Tuple[PyDate, str, str], List] = {}
+        self.products: Dict[Tuple[PyDate, int, str], List] = {}
+
+    def add(self, order: OrderModel, sign: int = 1) -> None:
+        if not self.enabled:
+            return
+        self.add_lines(order.created_at, order.status, [
+            (order_product.product_id, order_product.section, order_product.quantity, order_product.unit_price)
+            for order_product in order.order_products
+        ], sign)
+
+    def add_lines(
+        self,
+        created_at: datetime,
+        status,
+        lines: Iterable[Tuple[int, str, int, float]],
+        sign: int = 1
+    ) -> None:
+        """Adds one order given as its (product_id, section, quantity, unit_price) lines."""
+        if not self.enabled:
+            return
+        day = created_at.date()
+        status = status.value if isinstance(status, OrderStatus) else status
+        counted_sections = set()
+        for product_id, section, quantity, unit_price in lines:
+            units = sign * quantity
+            revenue = units * unit_price
+
+            section_totals = self.sections.setdefault((day, section, status), [0, 0, 0.0])
+            if section not in counted_sections:
+                counted_sections.add(section)
+                section_totals[0] += sign
+            section_totals[1] += units
+            section_totals[2] += revenue
+
+            product_totals = self.products.setdefault((day, product_id, status), [0, 0.0])
+            product_totals[0] += units
+            product_totals[1] += revenue
+
+    def section_deltas(self) -> Dict[Tuple[PyDate, str, str], Tuple[int, int, float]]:
+        return {key: tuple(totals) for key, totals in self.sections.items() if any(totals)}
+
+    def product_deltas(self) -> Dict[Tuple[PyDate, int, str], Tuple[int, float]]:
+        return {key: tuple(totals) for key, totals in self.products.items() if any(totals)}
+
+
+class ReportService:
+    def __init__(self, report_repository: ReportRepository):
+        self.report_repository = report_repository
+
+    def get_sales(
+        self,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+        section: Optional[str] = None,
+        status_filter: Optional[str] = None
+    ):
+        _validate_status(status_filter)
+        return self.report_repository.get_sales(
+            start_date=_parse_date(start_date_str, "start_date"),
+            end_date=_parse_date(end_date_str, "end_date"),
+            section=section,
+            status=status_filter
+        )
+
+    def get_top_products(
+        self,
+        limit: int = 10,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        order_by_field: str = "revenue"
+    ):
+        _validate_status(status_filter)
+        if order_by_field not in TOP_PRODUCTS_ORDER_FIELDS:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"order_by must be one of {list(TOP_PRODUCTS_ORDER_FIELDS)}"
+            )
+        # Without a status filter, canceled orders do not count as sales.
+        statuses = [status_filter] if status_filter is not None else [
+            status.value for status in OrderStatus if status != OrderStatus.CANCELED
+        ]
+        return self.report_repository.get_top_products(
+            limit=limit,
+            start_date=_parse_date(start_date_str, "start_date"),
+            end_date=_parse_date(end_date_str, "end_date"),
+            statuses=statuses,
+            order_by_field=order_by_field
+        )
@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from typing import Callable
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider the circuit breaker considers down."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` calls per second on average, bursts of up to ``capacity``.
+
+    A caller that finds the bucket empty reserves the next token (the count goes negative)
+    and sleeps until it is due, so concurrent callers on the same loop are served in
+    arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._acquired = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """Takes one token, waiting for it if needed. Returns the seconds waited."""
+        self._refill()
+        self._tokens -= 1
+        self._acquired += 1
+        if self._tokens >= 0:
+            return 0.0
+        wait = -self._tokens / self.rate
+        self._throttled += 1
+        self._wait_seconds += wait
+        await asyncio.sleep(wait)
+        return wait
+
+    def snapshot(self) -> dict:
+        self._refill()
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "tokens_available": round(max(self._tokens, 0.0), 3),
+            # Callers currently sleeping for a token, and how full the bucket's budget is.
+            "waiting": math.ceil(-self._tokens) if self._tokens < 0 else 0,
+            "saturation": round(min(1 - self._tokens / self.capacity, 1.0), 3),
+            "acquired": self._acquired,
+            "throttled": self._throttled,
+            "wait_seconds_total": round(self._wait_seconds, 3),
+        }
+
+
+class CircuitBreaker:
+    """Stops calling a failing provider for a while, then lets a few probes test it.
+
+    ``failure_threshold`` consecutive failures open the circuit: calls fail fast with
+    ``CircuitOpenError`` for ``reset_timeout`` seconds. After that the circuit is half-open
+    and up to ``half_open_max_calls`` calls go through; a success closes it again, a
+    failure reopens it for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    def _retry_after(self) -> float:
+        return max(self._opened_at + self.reset_timeout - self.clock(), 0.0)
+
+    def before_call(self) -> None:
+        """Raises ``CircuitOpenError`` unless a call may go out now."""
+        if self.state == CIRCUIT_OPEN and self._retry_after() == 0:
+            self.state = CIRCUIT_HALF_OPEN
+            self._probes = 0
+        if self.state == CIRCUIT_OPEN or (self.state == CIRCUIT_HALF_OPEN and self._probes >= self.half_open_max_calls):
+            self._rejected += 1
+            # While half-open, the probe's outcome is known within one call: try again soon.
+            raise CircuitOpenError(self._retry_after())
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._probes += 1
+
+    def release(self) -> None:
+        """Gives back the probe slot of a call that ended without an outcome (e.g. cancelled)."""
+        if self.state == CIRCUIT_HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != CIRCUIT_OPEN:
+                self._times_opened += 1
+            self.state = CIRCUIT_OPEN
+            self._opened_at = self.clock()
+
+    def snapshot(self) -> dict:
+        if self.state == CIRCUIT_OPEN and self._retry_after() == 0:
+            state = CIRCUIT_HALF_OPEN
+        else:
+            state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_after_seconds": round(self._retry_after(), 3) if state == CIRCUIT_OPEN else 0.0,
+            "times_opened": self._times_opened,
+            "rejected_calls": self._rejected,
+        }
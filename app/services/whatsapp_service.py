@@ -1,19 +1,42 @@
+import asyncio
 import logging
 import re
 from typing import Optional
 
-from twilio.rest import Client # Importar o cliente Twilio
-from twilio.base.exceptions import TwilioRestException # Para tratar erros da API
+import httpx
 
 from app.core.config import settings # Suas configurações com as credenciais
+from app.services.resilience import CircuitBreaker, TokenBucket
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("WhatsappService")
 
 E164_REGEX = r"^\+[1-9]\d{9,14}$" # Formato E.164
 
+
+class MessageRejectedError(Exception):
+    """Raised when Twilio refuses the message itself (a 4xx other than 429, e.g. an invalid
+    number or bad credentials): sending it again would be refused the same way."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"HTTP {status_code} {detail}")
+        self.status_code = status_code
+
 class WhatsappService:
-    def __init__(self):
+    """Sends WhatsApp messages through Twilio's Messages REST API.
+
+    Requests go out on one pooled ``httpx.AsyncClient`` (keep-alive connections, bounded
+    timeouts), so a send only suspends its own coroutine instead of blocking the event loop
+    for the HTTPS round trip. ``transport`` replaces the network, e.g. in tests.
+
+    Sends are paced by a token bucket shared by every task using this instance, and a
+    circuit breaker stops calling Twilio after repeated timeouts, 5xx or 429 responses:
+    while it is open ``send_message`` raises ``CircuitOpenError`` right away, so the
+    dispatcher defers the message instead of waiting on a provider that is down. Any other
+    4xx raises ``MessageRejectedError``, so the message is not retried.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         if not all([settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_WHATSAPP_FROM_NUMBER]):
             logger.warning(
                 "Credenciais do Twilio (ACCOUNT_SID, AUTH_TOKEN, WHATSAPP_FROM_NUMBER) não configuradas completamente. "
@@ -22,13 +45,47 @@ class WhatsappService:
             self.client = None
         else:
             try:
-                self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+                self.client = httpx.AsyncClient(
+                    base_url=settings.TWILIO_API_BASE_URL,
+                    auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+                    timeout=httpx.Timeout(
+                        settings.TWILIO_HTTP_TIMEOUT_SECONDS, connect=settings.TWILIO_HTTP_CONNECT_TIMEOUT_SECONDS
+                    ),
+                    limits=httpx.Limits(
+                        max_connections=settings.TWILIO_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.TWILIO_HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=settings.TWILIO_HTTP_KEEPALIVE_EXPIRY_SECONDS
+                    ),
+                    transport=transport
+                )
                 logger.info("Cliente Twilio inicializado com sucesso.")
             except Exception as e:
                 logger.error(f"Falha ao inicializar o cliente Twilio: {e}")
                 self.client = None
         
         self.twilio_from_number_whatsapp = f"whatsapp:{settings.TWILIO_WHATSAPP_FROM_NUMBER}"
+        self.messages_path = f"/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json"
+        # A rate of 0 turns the limiter off.
+        self.rate_limiter = (
+            TokenBucket(settings.TWILIO_RATE_LIMIT_PER_SECOND, settings.TWILIO_RATE_LIMIT_BURST)
+            if settings.TWILIO_RATE_LIMIT_PER_SECOND > 0 else None
+        )
+        self.circuit_breaker = CircuitBreaker(
+            settings.TWILIO_CIRCUIT_FAILURE_THRESHOLD,
+            settings.TWILIO_CIRCUIT_RESET_SECONDS,
+            settings.TWILIO_CIRCUIT_HALF_OPEN_MAX_CALLS
+        )
+
+    def stats(self) -> dict:
+        return {
+            "client_configured": self.client is not None,
+            "rate_limiter": self.rate_limiter.snapshot() if self.rate_limiter else None,
+            "circuit_breaker": self.circuit_breaker.snapshot()
+        }
+
+    async def close(self) -> None:
+        if self.client:
+            await self.client.aclose()
 
     async def send_message(self, to_phone_number: str, message_body: str) -> bool:
         if not self.client:
@@ -45,19 +102,41 @@ class WhatsappService:
                 f"não está no formato E.164 esperado. Tentando enviar mesmo assim."
             )
 
+        # Raises CircuitOpenError while Twilio is considered down.
+        self.circuit_breaker.before_call()
         try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
             logger.info(f"Tentando enviar mensagem via Twilio para: whatsapp:{to_phone_number} de {self.twilio_from_number_whatsapp}")
-            message = self.client.messages.create(
-                from_=self.twilio_from_number_whatsapp,
-                body=message_body,
-                to=f"whatsapp:{settings.TWILIO_WHATSAPP_TO_NUMBER}"  
-            )
-            logger.info(f"Mensagem WhatsApp enviada para {to_phone_number}. SID da mensagem: {message.sid}, Status: {message.status}")
+            response = await self.client.post(self.messages_path, data={
+                "From": self.twilio_from_number_whatsapp,
+                "Body": message_body,
+                "To": f"whatsapp:{settings.TWILIO_WHATSAPP_TO_NUMBER}"
+            })
+            # Throttling and server errors mean Twilio is in trouble; other 4xx are about this message.
+            if response.status_code == 429 or response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            if response.is_error:
+                logger.error(f"Erro da API Twilio ao enviar para {to_phone_number}: HTTP {response.status_code} {response.text}")
+                if response.status_code < 500 and response.status_code != 429:
+                    raise MessageRejectedError(response.status_code, response.text)
+                return False
+            message = response.json()
+            logger.info(f"Mensagem WhatsApp enviada para {to_phone_number}. SID da mensagem: {message.get('sid')}, Status: {message.get('status')}")
             return True
-        except TwilioRestException as e:
-            logger.error(f"Erro da API Twilio ao enviar para {to_phone_number}: {e}")
+        except MessageRejectedError:
+            raise
+        except asyncio.CancelledError:
+            self.circuit_breaker.release()
+            raise
+        except httpx.TimeoutException as e:
+            self.circuit_breaker.record_failure()
+            logger.error(f"Tempo esgotado ao enviar WhatsApp para {to_phone_number} via Twilio: {e!r}")
             return False
         except Exception as e:
+            self.circuit_breaker.record_failure()
             logger.error(f"Erro inesperado ao enviar WhatsApp para {to_phone_number} via Twilio: {e}")
             return False
 
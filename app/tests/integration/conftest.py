@@ -1,6 +1,6 @@
 from fastapi.testclient import TestClient
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.db.base import Base
 from app.main import app as fastapi_app
@@ -11,10 +11,28 @@ from sqlalchemy.orm import Session
 from app.models.domain.user import UserModel
 from app.models.enum.user import UserRoleEnum
 from app.services.auth import crypt_context
+from app.core.config import settings
+
+# The outbox dispatcher would poll the real database; tests drain order_events themselves.
+settings.ORDER_EVENTS_DISPATCHER_ENABLED = False
+settings.IDEMPOTENCY_PURGE_ENABLED = False
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy emit BEGIN itself
+# so each request can commit/roll back a savepoint inside the per-test transaction.
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, join_transaction_mode="create_savepoint"
+)
 
 
 @pytest.fixture(scope="session")
@@ -52,8 +70,10 @@ def override_get_db(db_session):
     def _override_get_db():
         try:
             yield db_session
-        finally:
-            db_session.close()
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
     fastapi_app.dependency_overrides[get_db_session] = _override_get_db
     yield
     fastapi_app.dependency_overrides.clear()
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.db import connection as connection_module
+from app.db.pool_metrics import InstrumentedQueuePool
+
+
+@pytest.fixture
+def instrumented_primary(monkeypatch):
+    # The real engine only gets the instrumented pool for server databases, not for sqlite.
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1)
+    monkeypatch.setattr(connection_module, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_as_admin(admin_authenticated_client: TestClient, instrumented_primary):
+    response = admin_authenticated_client.get("/admin/db/pool")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert "primary" in data
+    assert "checked_out" in data["primary"]
+    assert data["primary"]["pool_class"] == "InstrumentedQueuePool"
+    assert data["primary"]["size"] == 2
+    assert "buckets" in data["primary"]["checkout_wait"]
+
+
+def test_whatsapp_stats_as_admin(admin_authenticated_client: TestClient):
+    response = admin_authenticated_client.get("/admin/whatsapp")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["circuit_breaker"]["state"] == "closed"
+    assert "client_configured" in data
+
+
+def test_pool_stats_forbidden_for_regular_user(authenticated_client: TestClient):
+    response = authenticated_client.get("/admin/db/pool")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -3,6 +3,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.models.domain.customer import CustomerModel
+from app.api.dependencies.pagination import encode_cursor
 from app.main import app as fastapi_app
 
 @pytest.fixture
@@ -191,4 +192,44 @@ async def test_delete_customer_success(admin_authenticated_client: TestClient, t
 async def test_delete_customer_not_found(admin_authenticated_client: TestClient):
     response = admin_authenticated_client.delete("/clients/999")
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert response.json() == {"errors": ["Customer not found"]}
\ No newline at end of file
+    assert response.json() == {"errors": ["Customer not found"]}
+
+@pytest.mark.asyncio
+async def test_get_customers_cursor_pagination(authenticated_client: TestClient, db_session: Session):
+    db_session.add_all([
+        CustomerModel(name="Carla Dias", email="carla@example.com", cpf="33333333333"),
+        CustomerModel(name="Ana Costa", email="ana@example.com", cpf="11111111111"),
+        CustomerModel(name="Bruno Lima", email="bruno@example.com", cpf="22222222222"),
+    ])
+    db_session.commit()
+
+    first_page = authenticated_client.get("/clients?order_by=name&limit=2")
+    assert first_page.status_code == status.HTTP_200_OK
+    assert [c["name"] for c in first_page.json()] == ["Ana Costa", "Bruno Lima"]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = authenticated_client.get(f"/clients?order_by=name&limit=2&cursor={cursor}")
+    assert second_page.status_code == status.HTTP_200_OK
+    assert [c["name"] for c in second_page.json()] == ["Carla Dias"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+@pytest.mark.asyncio
+async def test_get_customers_cursor_for_other_ordering(authenticated_client: TestClient, test_customer):
+    first_page = authenticated_client.get("/clients?order_by=name&limit=1")
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    response = authenticated_client.get(f"/clients?order_by=email&limit=1&cursor={cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"errors": ["Pagination cursor does not match the requested ordering"]}
+
+@pytest.mark.asyncio
+async def test_get_customers_invalid_cursor(authenticated_client: TestClient):
+    response = authenticated_client.get("/clients?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"errors": ["Invalid pagination cursor"]}
+
+    # Well-formed cursors whose values do not fit the sort key.
+    for values in ([["Ana"], 1], [None, 1], ["Ana", {"id": 1}]):
+        response = authenticated_client.get(f"/clients?order_by=name&cursor={encode_cursor('name', values)}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"errors": ["Invalid pagination cursor"]}
@@ -0,0 +1,246 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.main import app as fastapi_app
+from app.api.dependencies.whatsapp import get_whatsapp_service
+from app.models.domain.customer import CustomerModel
+from app.models.domain.order_event import (
+    DELIVERY_FAILED, DELIVERY_PENDING, DELIVERY_SENT, DELIVERY_SUPERSEDED, OrderEventDeadLetterModel, OrderEventModel
+)
+from app.models.domain.product import ProductModel
+from app.db.repositories.order_events import OrderEventRepository
+from app.services.order_events import ORDER_CREATED, ORDER_STATUS_CHANGED, OrderEventDispatcher
+from app.services.whatsapp_service import WhatsappService
+
+
+@pytest.fixture
+def whatsapp_service(mocker):
+    service = mocker.Mock(spec=WhatsappService)
+    service.send_message = mocker.AsyncMock(return_value=True)
+    fastapi_app.dependency_overrides[get_whatsapp_service] = lambda: service
+    yield service
+    fastapi_app.dependency_overrides.pop(get_whatsapp_service, None)
+
+@pytest.fixture
+async def make_dispatcher(db_session: Session, whatsapp_service):
+    # The dispatcher opens its own sessions; here they share the test's connection and transaction.
+    session_factory = sessionmaker(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    dispatchers = []
+
+    def make(**options) -> OrderEventDispatcher:
+        dispatchers.append(OrderEventDispatcher(session_factory, whatsapp_service, **options))
+        return dispatchers[-1]
+
+    yield make
+    for dispatcher in dispatchers:
+        await dispatcher.stop()
+
+@pytest.fixture
+def events_customer(db_session: Session) -> CustomerModel:
+    customer = CustomerModel(name="Outbox Customer", email="outbox@example.com", cpf="52998224725", phone_number="+5511999990000")
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+@pytest.fixture
+def events_product(db_session: Session) -> ProductModel:
+    product = ProductModel(description="Outbox Shirt", price=30.0, barcode="OUTBOXPROD001", section="Shirts", stock=5)
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+def pending_events(db_session: Session) -> list:
+    db_session.expire_all()
+    return db_session.query(OrderEventModel).filter(OrderEventModel.processed_at.is_(None)).order_by(OrderEventModel.id).all()
+
+
+async def test_order_changes_are_queued_and_dispatched_after_commit(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service, make_dispatcher,
+    events_customer: CustomerModel, events_product: ProductModel, monkeypatch
+):
+    monkeypatch.setattr(settings, "ORDER_EVENTS_COALESCE_SECONDS", 0)
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    order_id = response.json()["id"]
+    response = authenticated_client.patch(f"/orders/{order_id}/status", json={"status": "processing"})
+    assert response.status_code == status.HTTP_200_OK
+
+    # The requests only wrote to the outbox; nothing was sent while they ran.
+    whatsapp_service.send_message.assert_not_awaited()
+    events = pending_events(db_session)
+    assert [(event.order_id, event.event_type) for event in events] == [(order_id, ORDER_CREATED), (order_id, ORDER_STATUS_CHANGED)]
+    assert events[0].payload["phone_number"] == "+5511999990000"
+    assert {event.delivery_status for event in events} == {DELIVERY_PENDING}
+
+    dispatcher = make_dispatcher(batch_size=10, workers=2)
+    assert await dispatcher.dispatch_batch() == 2
+    assert whatsapp_service.send_message.await_count == 2
+    sent_messages = [call.args[1] for call in whatsapp_service.send_message.await_args_list]
+    assert f"pedido Lu Estilo #{order_id} foi recebido" in sent_messages[0]
+    assert "está sendo preparado para envio" in sent_messages[1]
+
+    assert pending_events(db_session) == []
+    assert {event.delivery_status for event in db_session.query(OrderEventModel)} == {DELIVERY_SENT}
+    assert await dispatcher.dispatch_batch() == 0
+
+async def test_batch_is_sent_without_holding_a_session_or_row_locks(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service, make_dispatcher,
+    events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    session_factory = sessionmaker(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    sessions = []
+
+    def tracked_session() -> Session:
+        sessions.append(session_factory())
+        return sessions[-1]
+
+    dispatcher = OrderEventDispatcher(tracked_session, whatsapp_service)
+
+    async def send_message(phone_number, body):
+        # The lease is committed and its session closed before the provider is called.
+        assert sessions and all(session.get_transaction() is None for session in sessions)
+        [event] = pending_events(db_session)
+        assert event.locked_until is not None
+        assert await make_dispatcher().dispatch_batch() == 0
+        return True
+
+    whatsapp_service.send_message.side_effect = send_message
+    try:
+        assert await dispatcher.dispatch_batch() == 1
+    finally:
+        await dispatcher.stop()
+    whatsapp_service.send_message.assert_awaited_once()
+    event = db_session.query(OrderEventModel).one()
+    assert (event.delivery_status, event.locked_until) == (DELIVERY_SENT, None)
+
+async def test_lapsed_lease_is_claimed_again(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service, make_dispatcher,
+    events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    # A dispatcher leased the event and died before finishing it.
+    repository = OrderEventRepository(db_session)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    lapsed_lease = now - timedelta(microseconds=1)
+    [leased] = repository.lease_pending(10, now, lapsed_lease)
+    db_session.commit()
+
+    assert await make_dispatcher().dispatch_batch() == 1
+    whatsapp_service.send_message.assert_awaited_once()
+    # Finishing under the lapsed lease no longer finds the event.
+    assert repository.get_leased([leased.id], lapsed_lease) == []
+    db_session.expire_all()
+    event = db_session.get(OrderEventModel, leased.id)
+    assert (event.delivery_status, event.attempts, event.locked_until) == (DELIVERY_SENT, 1, None)
+
+async def test_rapid_status_changes_send_only_the_latest(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service, make_dispatcher,
+    events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    order_id = response.json()["id"]
+    for new_status in ("processing", "completed"):
+        response = authenticated_client.patch(f"/orders/{order_id}/status", json={"status": new_status})
+        assert response.status_code == status.HTTP_200_OK
+
+    created, completed = pending_events(db_session)
+    assert (created.event_type, completed.payload["status"]) == (ORDER_CREATED, "completed")
+    superseded = db_session.query(OrderEventModel).filter(OrderEventModel.delivery_status == DELIVERY_SUPERSEDED).one()
+    assert (superseded.payload["status"], superseded.processed_at is not None) == ("processing", True)
+
+    # The status change waits out the coalescing window; the order confirmation does not.
+    dispatcher = make_dispatcher()
+    assert await dispatcher.dispatch_batch() == 1
+    completed.available_at = datetime(2000, 1, 1)
+    db_session.commit()
+    assert await dispatcher.dispatch_batch() == 1
+    sent_messages = [call.args[1] for call in whatsapp_service.send_message.await_args_list]
+    assert len(sent_messages) == 2
+    assert "foi concluído e enviado" in sent_messages[1]
+
+def test_rolled_back_change_queues_nothing(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service,
+    events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 50}]
+    })
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert pending_events(db_session) == []
+
+async def test_failed_delivery_is_retried_then_given_up(
+    authenticated_client: TestClient, db_session: Session, whatsapp_service, make_dispatcher,
+    events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    whatsapp_service.send_message.return_value = False
+
+    dispatcher = make_dispatcher(max_attempts=2, backoff_base=3600, backoff_max=3600)
+    assert await dispatcher.dispatch_batch() == 1
+    [event] = pending_events(db_session)
+    assert (event.attempts, event.delivery_status) == (1, DELIVERY_PENDING)
+    assert event.last_error == "send_message returned False"
+    # At least half of the first backoff step.
+    assert event.available_at > datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=1700)
+    # Not due again until the retry delay has passed.
+    assert await dispatcher.dispatch_batch() == 0
+
+    event.available_at = datetime(2000, 1, 1)
+    db_session.commit()
+    assert await dispatcher.dispatch_batch() == 1
+    assert pending_events(db_session) == []
+    db_session.refresh(event)
+    assert (event.attempts, event.delivery_status, event.processed_at is not None) == (2, DELIVERY_FAILED, True)
+    dead_letter = db_session.query(OrderEventDeadLetterModel).one()
+    assert (dead_letter.event_id, dead_letter.attempts, dead_letter.error) == (event.id, 2, "send_message returned False")
+    assert dead_letter.payload == event.payload
+
+async def test_dead_letters_are_listed_and_replayed_by_admins(
+    admin_authenticated_client: TestClient, authenticated_client: TestClient, db_session: Session,
+    whatsapp_service, make_dispatcher, events_customer: CustomerModel, events_product: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": events_customer.id, "products": [{"product_id": events_product.id, "quantity": 1}]
+    })
+    order_id = response.json()["id"]
+    whatsapp_service.send_message.return_value = False
+    assert await make_dispatcher(max_attempts=1).dispatch_batch() == 1
+
+    response = admin_authenticated_client.get("/admin/notifications/dead-letters")
+    assert response.status_code == status.HTTP_200_OK
+    [dead_letter] = response.json()
+    assert (dead_letter["order_id"], dead_letter["event_type"], dead_letter["replayed_at"]) == (order_id, ORDER_CREATED, None)
+    assert authenticated_client.get("/admin/notifications/dead-letters").status_code == status.HTTP_403_FORBIDDEN
+
+    # Still failing: the letter stays, with the new error.
+    response = admin_authenticated_client.post("/admin/notifications/dead-letters/replay")
+    assert response.json() == {"replayed": 0, "failed": 1, "remaining": 1}
+
+    whatsapp_service.send_message.return_value = True
+    response = admin_authenticated_client.post("/admin/notifications/dead-letters/replay", params={"batch_size": 10, "rate": 100})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"replayed": 1, "failed": 0, "remaining": 0}
+    assert f"pedido Lu Estilo #{order_id} foi recebido" in whatsapp_service.send_message.await_args.args[1]
+
+    assert admin_authenticated_client.get("/admin/notifications/dead-letters").json() == []
+    [replayed] = admin_authenticated_client.get("/admin/notifications/dead-letters", params={"include_replayed": True}).json()
+    assert (replayed["replay_attempts"], replayed["replayed_at"] is not None) == (2, True)
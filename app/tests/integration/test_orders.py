@@ -1,14 +1,24 @@
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session, selectinload 
-from datetime import date, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from datetime import date, datetime, timedelta
 import time
 
 from app.models.domain.customer import CustomerModel
 from app.models.domain.product import ProductImageModel, ProductModel
 from app.models.domain.order import OrderModel, OrderProduct, OrderStatus 
-from app.models.schemas.order import OrderCreate, OrderProductCreate
+from app.models.domain.idempotency_key import IdempotencyKeyModel
+from app.models.schemas.order import OrderCreate, OrderProductCreate, OrderResponse
+from app.api.dependencies.pagination import encode_cursor
+from app.db.repositories import (
+    CustomerRepository, IdempotencyRepository, OrderEventRepository, OrderRepository, ProductRepository, ReportRepository
+)
+from app.services.idempotency import IdempotencyKeyPurger
+from app.services.order import OrderService
+from app.services.products import ProductService
+from app.services.whatsapp_service import WhatsappService
 
 VALID_IMAGE_URL = "http://example.com/image1.png" 
 VALID_IMAGE_URL_2 = "https://example.com/image2.jpg"
@@ -142,6 +152,182 @@ async def test_create_order_success(
     assert updated_product1.stock == initial_stock_p1 - 3
     assert updated_product2.stock == initial_stock_p2 - 2
 
+@pytest.mark.asyncio
+async def test_create_order_touches_products_in_constant_statements(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, product2_for_order: ProductModel
+):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        order_payload = {
+            "customer_id": test_customer_for_order.id,
+            "products": [
+                {"product_id": product1_for_order.id, "quantity": 1},
+                {"product_id": product2_for_order.id, "quantity": 1}
+            ]
+        }
+        response = authenticated_client.post("/orders/", json=order_payload)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    # Only look at what the order service ran: after authentication and before the order row is written.
+    authenticated = max(i for i, statement in enumerate(statements) if "FROM users" in statement)
+    order_insert = next(i for i, statement in enumerate(statements) if statement.lstrip().startswith("INSERT INTO orders"))
+    before_insert = statements[authenticated + 1:order_insert]
+    assert len([s for s in before_insert if s.lstrip().startswith("SELECT") and "FROM products" in s]) == 1
+    assert len([s for s in before_insert if "UPDATE products SET" in s]) == 1
+    assert not any("FROM product_images" in s for s in before_insert)
+
+@pytest.mark.asyncio
+async def test_created_order_response_reads_stock_without_reloading_products(
+    db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, product2_for_order: ProductModel, mocker
+):
+    # Configured like the app's sessions, which keep their objects loaded across the commit.
+    session = sessionmaker(bind=db_session.connection(), join_transaction_mode="create_savepoint", expire_on_commit=False)()
+    service = OrderService(
+        OrderRepository(session), ProductService(ProductRepository(session)), CustomerRepository(session),
+        mocker.Mock(spec=WhatsappService), ReportRepository(session), OrderEventRepository(session)
+    )
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        order = await service.create_order(OrderCreate(customer_id=test_customer_for_order.id, products=[
+            OrderProductCreate(product_id=product1_for_order.id, quantity=1),
+            OrderProductCreate(product_id=product2_for_order.id, quantity=1)
+        ]))
+        response = OrderResponse.model_validate(order)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+        session.close()
+
+    # The new stock levels come from the UPDATE's RETURNING and the products and customer stay
+    # loaded, so only the images are read to build the response.
+    stock_update = next(i for i, statement in enumerate(statements) if "UPDATE products SET" in statement)
+    selects = [s for s in statements[stock_update:] if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 1 and "FROM product_images" in selects[0]
+    assert {line.product.id: line.product.stock for line in response.products} == {
+        product1_for_order.id: 19, product2_for_order.id: 14
+    }
+
+@pytest.mark.asyncio
+async def test_create_orders_bulk_success(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, product2_for_order: ProductModel
+):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    payload = {"orders": [
+        {"customer_id": test_customer_for_order.id, "products": [{"product_id": product1_for_order.id, "quantity": 1}]}
+        for _ in range(5)
+    ] + [
+        {"customer_id": test_customer_for_order.id, "products": [{"product_id": product2_for_order.id, "quantity": 2}]}
+    ]}
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        response = authenticated_client.post("/orders/bulk", json=payload)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["created"] == 6 and data["failed"] == 0
+    assert [result["index"] for result in data["results"]] == list(range(6))
+    assert all(result["status_code"] == status.HTTP_201_CREATED for result in data["results"])
+    assert data["results"][0]["total_amount"] == 10.00
+    assert data["results"][5]["total_amount"] == 51.00
+
+    order_ids = [result["order_id"] for result in data["results"]]
+    assert db_session.query(OrderModel).filter(OrderModel.id.in_(order_ids)).count() == 6
+    assert db_session.query(OrderProduct).filter(OrderProduct.order_id.in_(order_ids)).count() == 6
+    assert db_session.get(ProductModel, product1_for_order.id).stock == 15
+    assert db_session.get(ProductModel, product2_for_order.id).stock == 13
+
+    # SQLite can't return multi-row INSERT ids in parameter order, so SQLAlchemy inserts the orders
+    # one by one there; PostgreSQL gets a single multi-row INSERT ... RETURNING.
+    expected_order_inserts = 1 if connection.dialect.name == "postgresql" else len(payload["orders"])
+    assert len([s for s in statements if s.lstrip().startswith("INSERT INTO orders")]) == expected_order_inserts
+    assert len([s for s in statements if s.lstrip().startswith("INSERT INTO order_products")]) == 1
+    assert len([s for s in statements if "UPDATE products SET" in s]) == 1
+
+@pytest.mark.asyncio
+async def test_create_orders_bulk_partial_failure(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel
+):
+    customer_id = test_customer_for_order.id
+    product_id = product1_for_order.id
+    payload = {"orders": [
+        {"customer_id": customer_id, "products": [{"product_id": product_id, "quantity": 15}]},
+        {"customer_id": 99999, "products": [{"product_id": product_id, "quantity": 1}]},
+        {"customer_id": customer_id, "products": [{"product_id": 99999, "quantity": 1}]},
+        {"customer_id": customer_id, "products": [{"product_id": product_id, "quantity": 6}]},
+        {"customer_id": customer_id, "products": [{"product_id": product_id, "quantity": 5}]},
+    ]}
+
+    response = authenticated_client.post("/orders/bulk", json=payload)
+
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    data = response.json()
+    assert data["created"] == 2 and data["failed"] == 3
+    results = data["results"]
+    assert [result["status_code"] for result in results] == [201, 404, 404, 400, 201]
+    assert results[1]["error"] == "Customer with ID 99999 not found"
+    assert results[2]["error"] == "Product not found: 99999"
+    assert results[3]["error"] == f"Insufficient stock for product ID {product_id}. Available: 5, Requested: 6"
+    assert results[3]["order_id"] is None
+    assert db_session.get(ProductModel, product_id).stock == 0
+
+@pytest.mark.asyncio
+async def test_create_orders_bulk_rejects_empty_batch(authenticated_client: TestClient):
+    response = authenticated_client.post("/orders/bulk", json={"orders": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_create_order_returns_written_order_without_reload(
+    db_session: Session, test_customer_for_order: CustomerModel, product1_for_order: ProductModel
+):
+    db_session.expire_all()
+    customer = db_session.get(CustomerModel, test_customer_for_order.id)
+    product = db_session.get(ProductModel, product1_for_order.id)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        order = OrderRepository(db_session).create_order(
+            OrderModel(customer_id=customer.id, status=OrderStatus.PENDING, total_amount=20.0),
+            [OrderProduct(product_id=product.id, quantity=2, unit_price=product.price, section=product.section)]
+        )
+        response = OrderResponse.model_validate(order)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 1 and "FROM product_images" in selects[0]
+    assert response.customer_name == customer.name
+    assert response.created_at is not None
+    assert [p.product.id for p in response.products] == [product.id]
+    assert [str(image.url) for image in response.products[0].product.images] == [VALID_IMAGE_URL]
+
 @pytest.mark.asyncio
 async def test_create_order_customer_not_found(authenticated_client: TestClient, product1_for_order: ProductModel):
     p1 = product1_for_order 
@@ -167,6 +353,149 @@ async def test_create_order_insufficient_stock(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert f"Insufficient stock for product ID {p1.id}" in response.json()["errors"][0]
 
+@pytest.mark.asyncio
+async def test_create_order_failure_rolls_back_earlier_lines(
+    authenticated_client: TestClient, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, product2_for_order: ProductModel, db_session: Session
+):
+    p1 = db_session.merge(product1_for_order)
+    p2 = db_session.merge(product2_for_order)
+    initial_stock_p1 = p1.stock
+    order_payload = {
+        "customer_id": test_customer_for_order.id,
+        "products": [
+            {"product_id": p1.id, "quantity": 1},
+            {"product_id": p2.id, "quantity": p2.stock + 1}
+        ]
+    }
+    response = authenticated_client.post("/orders/", json=order_payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    assert db_session.get(ProductModel, p1.id).stock == initial_stock_p1
+    assert db_session.query(OrderModel).filter_by(customer_id=test_customer_for_order.id).count() == 0
+
+@pytest.mark.asyncio
+async def test_create_order_with_idempotency_key_replays_first_response(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel
+):
+    order_payload = {"customer_id": test_customer_for_order.id, "products": [{"product_id": product1_for_order.id, "quantity": 2}]}
+    headers = {"Idempotency-Key": "create-order-retry"}
+
+    first = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    db_session.expire_all()
+    assert db_session.query(OrderModel).filter(OrderModel.customer_id == test_customer_for_order.id).count() == 1
+    assert db_session.get(ProductModel, product1_for_order.id).stock == 18
+
+@pytest.mark.asyncio
+async def test_failure_storing_idempotent_response_does_not_keep_the_order(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, monkeypatch
+):
+    order_payload = {"customer_id": test_customer_for_order.id, "products": [{"product_id": product1_for_order.id, "quantity": 2}]}
+    headers = {"Idempotency-Key": "store-response-crash"}
+    store_response = IdempotencyRepository.store_response
+
+    def crash(*args, **kwargs):
+        monkeypatch.setattr(IdempotencyRepository, "store_response", store_response)
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(IdempotencyRepository, "store_response", crash)
+    with pytest.raises(RuntimeError):
+        authenticated_client.post("/orders/", json=order_payload, headers=headers)
+
+    # The response is written in the order's transaction, so the order went down with it.
+    db_session.expire_all()
+    assert db_session.query(OrderModel).filter(OrderModel.customer_id == test_customer_for_order.id).count() == 0
+    assert db_session.get(ProductModel, product1_for_order.id).stock == 20
+
+    retry = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    replay = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == retry.json()
+    db_session.expire_all()
+    assert db_session.query(OrderModel).filter(OrderModel.customer_id == test_customer_for_order.id).count() == 1
+    assert db_session.get(ProductModel, product1_for_order.id).stock == 18
+
+@pytest.mark.asyncio
+async def test_idempotency_key_reused_with_different_request_is_rejected(
+    authenticated_client: TestClient, test_customer_for_order: CustomerModel, product1_for_order: ProductModel
+):
+    headers = {"Idempotency-Key": "reused-key"}
+    order_payload = {"customer_id": test_customer_for_order.id, "products": [{"product_id": product1_for_order.id, "quantity": 1}]}
+    assert authenticated_client.post("/orders/", json=order_payload, headers=headers).status_code == status.HTTP_201_CREATED
+
+    order_payload["products"][0]["quantity"] = 3
+    response = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "Idempotency-Key was already used with a different request" in response.json()["errors"][0]
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_idempotency_key(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel
+):
+    headers = {"Idempotency-Key": "released-on-failure"}
+    order_payload = {"customer_id": test_customer_for_order.id, "products": [{"product_id": product1_for_order.id, "quantity": 21}]}
+    response = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert db_session.query(IdempotencyKeyModel).filter_by(key="released-on-failure").count() == 0
+
+    order_payload["products"][0]["quantity"] = 20
+    response = authenticated_client.post("/orders/", json=order_payload, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in response.headers
+
+def test_purger_removes_expired_idempotency_keys(db_session: Session, test_user):
+    now = datetime.utcnow()
+    db_session.add_all([
+        IdempotencyKeyModel(
+            user_id=test_user.id, key=f"expired-{i}", request_hash="h", status_code=201, response_body={},
+            expires_at=now - timedelta(minutes=i + 1)
+        )
+        for i in range(3)
+    ] + [
+        IdempotencyKeyModel(
+            user_id=test_user.id, key="live", request_hash="h", status_code=201, response_body={},
+            expires_at=now + timedelta(hours=1)
+        )
+    ])
+    db_session.commit()
+    # Batches smaller than the backlog: the purge keeps going until a batch comes back short.
+    purger = IdempotencyKeyPurger(
+        sessionmaker(bind=db_session.connection(), join_transaction_mode="create_savepoint"), batch_size=2
+    )
+
+    assert purger.purge() == 3
+    db_session.expire_all()
+    assert [record.key for record in db_session.query(IdempotencyKeyModel).filter_by(user_id=test_user.id)] == ["live"]
+
+@pytest.mark.asyncio
+async def test_update_order_status_with_idempotency_key_restores_stock_once(
+    authenticated_client: TestClient, db_session: Session, created_order_with_items: OrderModel,
+    product1_for_order: ProductModel
+):
+    headers = {"Idempotency-Key": "cancel-once"}
+    first = authenticated_client.patch(f"/orders/{created_order_with_items.id}/status", json={"status": "canceled"}, headers=headers)
+    assert first.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    stock_after_cancel = db_session.get(ProductModel, product1_for_order.id).stock
+
+    retry = authenticated_client.patch(f"/orders/{created_order_with_items.id}/status", json={"status": "canceled"}, headers=headers)
+    assert retry.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    db_session.expire_all()
+    assert db_session.get(ProductModel, product1_for_order.id).stock == stock_after_cancel
+
 @pytest.mark.asyncio
 async def test_get_order_by_id_success(authenticated_client: TestClient, created_order_with_items: OrderModel):
     response = authenticated_client.get(f"/orders/{created_order_with_items.id}")
@@ -285,6 +614,69 @@ async def test_update_order_status_invalid_status_value(authenticated_client: Te
     assert status_error["type"] == "value_error"
 
 
+@pytest.mark.asyncio
+async def test_bulk_status_cancel_restores_stock_in_one_update(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product1_for_order: ProductModel, product2_for_order: ProductModel
+):
+    order_ids = []
+    for lines in ([(product1_for_order.id, 2), (product2_for_order.id, 1)], [(product1_for_order.id, 3)], [(product2_for_order.id, 1)]):
+        response = authenticated_client.post("/orders/", json={
+            "customer_id": test_customer_for_order.id,
+            "products": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines]
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        order_ids.append(response.json()["id"])
+    already_canceled = order_ids[2]
+    assert authenticated_client.patch(f"/orders/{already_canceled}/status", json={"status": "canceled"}).status_code == status.HTTP_200_OK
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        response = authenticated_client.patch("/orders/status", json={"order_ids": order_ids + [99999, order_ids[0]], "status": "canceled"})
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    assert response.json() == {
+        "status": "canceled", "updated": order_ids[:2], "unchanged": [already_canceled], "not_found": [99999]
+    }
+    assert len([s for s in statements if s.lstrip().startswith("UPDATE orders")]) == 1
+    assert len([s for s in statements if "UPDATE products SET" in s]) == 1
+    lock = next(s for s in statements if s.lstrip().startswith("SELECT orders.id, orders.status"))
+    assert lock.rstrip().endswith("ORDER BY orders.id")
+
+    db_session.expire_all()
+    assert db_session.get(ProductModel, product1_for_order.id).stock == 20
+    assert db_session.get(ProductModel, product2_for_order.id).stock == 15
+    updated = db_session.query(OrderModel).filter(OrderModel.id.in_(order_ids[:2])).all()
+    assert all(order.status == OrderStatus.CANCELED and order.updated_at is not None for order in updated)
+
+@pytest.mark.asyncio
+async def test_bulk_status_completion_leaves_stock_alone(
+    authenticated_client: TestClient, db_session: Session, created_order_with_items: OrderModel,
+    product1_for_order: ProductModel
+):
+    db_session.expire_all()
+    stock_before = db_session.get(ProductModel, product1_for_order.id).stock
+    response = authenticated_client.patch("/orders/status", json={"order_ids": [created_order_with_items.id], "status": "completed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["updated"] == [created_order_with_items.id]
+
+    db_session.expire_all()
+    assert db_session.get(ProductModel, product1_for_order.id).stock == stock_before
+    assert db_session.get(OrderModel, created_order_with_items.id).status == OrderStatus.COMPLETED
+
+@pytest.mark.asyncio
+async def test_bulk_status_rejects_invalid_payload(authenticated_client: TestClient):
+    assert authenticated_client.patch("/orders/status", json={"order_ids": [], "status": "completed"}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert authenticated_client.patch("/orders/status", json={"order_ids": [1], "status": "shipped"}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 @pytest.mark.asyncio
 async def test_update_order_success_change_items(
     authenticated_client: TestClient, created_order_with_items: OrderModel,
@@ -315,6 +707,94 @@ async def test_update_order_success_change_items(
     assert p2_reloaded.stock == initial_stock_p2 + (1 - 3)
 
 
+@pytest.mark.asyncio
+async def test_update_order_writes_only_changed_lines(
+    authenticated_client: TestClient, created_order_with_items: OrderModel,
+    test_customer_for_order: CustomerModel, product1_for_order: ProductModel,
+    product2_for_order: ProductModel, db_session: Session
+):
+    order_id = created_order_with_items.id
+    stock_p1 = db_session.get(ProductModel, product1_for_order.id).stock
+    stock_p2 = db_session.get(ProductModel, product2_for_order.id).stock
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    updated_order_payload = {
+        "customer_id": test_customer_for_order.id,
+        "status": OrderStatus.PENDING.value,
+        "products": [
+            {"product_id": product1_for_order.id, "quantity": 2},
+            {"product_id": product2_for_order.id, "quantity": 4}
+        ]
+    }
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        response = authenticated_client.put(f"/orders/{order_id}", json=updated_order_payload)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_amount"] == 2 * 10.00 + 4 * 25.50
+    assert not any(s.lstrip().startswith(("DELETE FROM order_products", "INSERT INTO order_products")) for s in statements)
+    assert len([s for s in statements if s.lstrip().startswith("UPDATE order_products")]) == 1
+    assert len([s for s in statements if "UPDATE products SET" in s]) == 1
+
+    db_session.expire_all()
+    assert db_session.get(ProductModel, product1_for_order.id).stock == stock_p1
+    assert db_session.get(ProductModel, product2_for_order.id).stock == stock_p2 - 3
+
+@pytest.mark.asyncio
+async def test_update_order_prices_every_line_at_the_current_price(
+    authenticated_client: TestClient, created_order_with_items: OrderModel,
+    test_customer_for_order: CustomerModel, product1_for_order: ProductModel,
+    product2_for_order: ProductModel, db_session: Session
+):
+    order_id = created_order_with_items.id
+    db_session.get(ProductModel, product1_for_order.id).price = 12.00
+    db_session.commit()
+
+    response = authenticated_client.put(f"/orders/{order_id}", json={
+        "customer_id": test_customer_for_order.id,
+        "status": OrderStatus.PENDING.value,
+        "products": [
+            {"product_id": product1_for_order.id, "quantity": 2},
+            {"product_id": product2_for_order.id, "quantity": 1}
+        ]
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_amount"] == 2 * 12.00 + 25.50
+    db_session.expire_all()
+    unit_prices = {op.product_id: op.unit_price for op in db_session.get(OrderModel, order_id).order_products}
+    assert unit_prices == {product1_for_order.id: 12.00, product2_for_order.id: 25.50}
+
+@pytest.mark.asyncio
+async def test_update_canceled_order_does_not_restore_stock_again(
+    authenticated_client: TestClient, created_order_with_items: OrderModel,
+    test_customer_for_order: CustomerModel, product1_for_order: ProductModel,
+    product2_for_order: ProductModel, db_session: Session
+):
+    order_id = created_order_with_items.id
+    response = authenticated_client.patch(f"/orders/{order_id}/status", json={"status": OrderStatus.CANCELED.value})
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    stock_p1 = db_session.get(ProductModel, product1_for_order.id).stock
+
+    updated_order_payload = {
+        "customer_id": test_customer_for_order.id,
+        "status": OrderStatus.CANCELED.value,
+        "products": [{"product_id": product1_for_order.id, "quantity": 1}]
+    }
+    response = authenticated_client.put(f"/orders/{order_id}", json=updated_order_payload)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [p["product"]["id"] for p in response.json()["products"]] == [product1_for_order.id]
+    db_session.expire_all()
+    assert db_session.get(ProductModel, product1_for_order.id).stock == stock_p1
+
 @pytest.mark.asyncio
 async def test_delete_order_success_restores_stock(
     admin_authenticated_client: TestClient, created_order_with_items: OrderModel,
@@ -446,6 +926,39 @@ async def test_list_orders_filter_by_product_section(
     assert any(o["id"] == order_A_id for o in data_sec_A)
     assert all(any(p["product"]["section"] == "FilterSectionA" for p in o["products"]) for o in data_sec_A)
 
+
+@pytest.mark.asyncio
+async def test_section_filter_keeps_orders_in_the_section_they_were_sold_in(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel,
+    product_section_A_for_filter: ProductModel
+):
+    response = authenticated_client.post("/orders/", json={
+        "customer_id": test_customer_for_order.id, "products": [{"product_id": product_section_A_for_filter.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    order_id = response.json()["id"]
+
+    product_section_A_for_filter.section = "FilterSectionMoved"
+    db_session.commit()
+
+    sold_in = authenticated_client.get("/orders/?section=FilterSectionA&view=summary")
+    assert order_id in [order["id"] for order in sold_in.json()]
+    moved_to = authenticated_client.get("/orders/?section=FilterSectionMoved&view=summary")
+    assert order_id not in [order["id"] for order in moved_to.json()]
+
+@pytest.mark.asyncio
+async def test_get_orders_invalid_cursor(authenticated_client: TestClient):
+    response = authenticated_client.get("/orders/?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"errors": ["Invalid pagination cursor"]}
+
+    # Well-formed cursors whose created_at is not an ISO timestamp string.
+    for values in ([123, 1], [None, 1], [["2026-10-17T12:00:00"], 1], ["yesterday", 1]):
+        cursor = encode_cursor("created_at:desc", values)
+        response = authenticated_client.get(f"/orders/?order_by=created_at&order_direction=desc&cursor={cursor}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"errors": ["Invalid pagination cursor"]}
+
 @pytest.mark.asyncio
 async def test_list_orders_sorting(
     authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel, product1_for_order: ProductModel
@@ -529,4 +1042,110 @@ async def test_list_orders_invalid_date_format_filter(authenticated_client: Test
 
     response_end = authenticated_client.get("/orders/?end_date=2023/12/31")
     assert response_end.status_code == status.HTTP_400_BAD_REQUEST
-    assert "Invalid end_date format" in response_end.json()["errors"][0]
\ No newline at end of file
+    assert "Invalid end_date format" in response_end.json()["errors"][0]
+
+@pytest.mark.asyncio
+async def test_list_orders_reports_query_count_in_server_timing(
+    authenticated_client: TestClient, created_order_with_items: OrderModel
+):
+    response = authenticated_client.get("/orders/")
+    assert response.status_code == status.HTTP_200_OK
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    query_count = int(server_timing.split('desc="')[1].split(" ")[0])
+    assert query_count > 0
+
+
+@pytest.mark.asyncio
+async def test_list_orders_summary_view_selects_only_order_columns(
+    authenticated_client: TestClient, db_session: Session, created_order_with_items: OrderModel
+):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        response = authenticated_client.get("/orders/", params={"view": "summary", "customer_id": created_order_with_items.customer_id})
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{
+        "id": created_order_with_items.id,
+        "customer_id": created_order_with_items.customer_id,
+        "customer_name": created_order_with_items.customer.name,
+        "status": OrderStatus.PENDING.value,
+        "total_amount": 45.5,
+        "created_at": created_order_with_items.created_at.isoformat(),
+        "updated_at": None
+    }]
+    authenticated = max(i for i, statement in enumerate(statements) if "FROM users" in statement)
+    listing = [s for s in statements[authenticated + 1:] if s.lstrip().startswith("SELECT")]
+    assert len(listing) == 1
+    assert "JOIN customers" in listing[0]
+    assert "order_products" not in listing[0] and "product_images" not in listing[0]
+
+@pytest.mark.asyncio
+async def test_list_orders_summary_view_supports_section_filter_and_cursor(
+    authenticated_client: TestClient, created_order_with_items: OrderModel, product1_for_order: ProductModel
+):
+    params = {"view": "summary", "section": product1_for_order.section, "order_by": "id", "limit": 1}
+    response = authenticated_client.get("/orders/", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    assert [order["id"] for order in response.json()] == [created_order_with_items.id]
+    assert "products" not in response.json()[0]
+    assert "X-Next-Cursor" in response.headers
+
+    response = authenticated_client.get("/orders/", params={**params, "cursor": response.headers["X-Next-Cursor"]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+@pytest.mark.asyncio
+async def test_list_orders_rejects_unknown_view(authenticated_client: TestClient):
+    response = authenticated_client.get("/orders/", params={"view": "compact"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio
+async def test_list_orders_cursor_pagination(
+    authenticated_client: TestClient, db_session: Session, test_customer_for_order: CustomerModel, product1_for_order: ProductModel
+):
+    db_session.query(OrderProduct).delete()
+    db_session.query(OrderModel).delete()
+    db_session.commit()
+
+    created_ids = []
+    for quantity in (1, 2, 3):
+        res = authenticated_client.post("/orders/", json=OrderCreate(customer_id=test_customer_for_order.id, products=[OrderProductCreate(product_id=product1_for_order.id, quantity=quantity)]).model_dump(mode='json'))
+        assert res.status_code == status.HTTP_201_CREATED
+        created_ids.append(res.json()["id"])
+    for offset, order_id in enumerate(created_ids):
+        db_session.query(OrderModel).filter(OrderModel.id == order_id).update(
+            {OrderModel.created_at: datetime(2024, 1, 1, 12, 0, 0) + timedelta(minutes=offset)}
+        )
+    db_session.commit()
+
+    first_page = authenticated_client.get("/orders/?order_by=total_amount&order_direction=desc&limit=2")
+    assert first_page.status_code == status.HTTP_200_OK
+    assert [o["id"] for o in first_page.json()] == [created_ids[2], created_ids[1]]
+
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = authenticated_client.get(f"/orders/?order_by=total_amount&order_direction=desc&limit=2&cursor={cursor}")
+    assert second_page.status_code == status.HTTP_200_OK
+    assert [o["id"] for o in second_page.json()] == [created_ids[0]]
+
+    by_date = authenticated_client.get("/orders/?limit=1")
+    date_cursor = by_date.headers["X-Next-Cursor"]
+    next_by_date = authenticated_client.get(f"/orders/?limit=5&cursor={date_cursor}")
+    assert next_by_date.status_code == status.HTTP_200_OK
+    assert by_date.json()[0]["id"] not in [o["id"] for o in next_by_date.json()]
+    assert len(next_by_date.json()) == 2
+
+@pytest.mark.asyncio
+async def test_list_orders_cursor_for_other_ordering(authenticated_client: TestClient, created_order_with_items: OrderModel):
+    cursor = authenticated_client.get("/orders/?limit=1").headers["X-Next-Cursor"]
+    response = authenticated_client.get(f"/orders/?order_direction=asc&cursor={cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"][0] == "Pagination cursor does not match the requested ordering"
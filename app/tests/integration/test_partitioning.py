@@ -0,0 +1,115 @@
+import argparse
+import os
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.db.partitioning import archive_closed_orders, is_partitioned, unpartition_orders
+
+# The rest of the suite runs on sqlite; these need a PostgreSQL server where the user may create databases.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+pytestmark = [
+    pytest.mark.postgres,
+    pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"),
+]
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "migrations"
+SCRATCH_DATABASE = "lu_estilo_partitioning_test"
+BEFORE_PARTITIONING = "c52e8f1a7d3b"
+
+
+def alembic_config(partition_orders: bool = False) -> Config:
+    # No ini file, so alembic leaves pytest's logging alone.
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.cmd_opts = argparse.Namespace(x=["partition_orders=true"] if partition_orders else [])
+    return config
+
+def order_lines_foreign_key_exists(connection) -> bool:
+    return connection.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'order_products_order_id_fkey')"
+    ))
+
+@pytest.fixture
+def scratch_engine(monkeypatch):
+    admin_engine = create_engine(TEST_POSTGRES_URL, isolation_level="AUTOCOMMIT")
+    with admin_engine.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {SCRATCH_DATABASE} WITH (FORCE)"))
+        connection.execute(text(f"CREATE DATABASE {SCRATCH_DATABASE}"))
+    url = make_url(TEST_POSTGRES_URL).set(database=SCRATCH_DATABASE)
+    # migrations/env.py connects to DATABASE_URL.
+    monkeypatch.setenv("DATABASE_URL", url.render_as_string(hide_password=False))
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+    with admin_engine.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {SCRATCH_DATABASE} WITH (FORCE)"))
+    admin_engine.dispose()
+
+def seed_orders(engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO customers (id, name, email, cpf) VALUES (1, 'Ana', 'ana@example.com', '52998224725')"))
+        connection.execute(text(
+            "INSERT INTO products (id, description, price, barcode, section, stock) VALUES (1, 'Shirt', 10, 'PART01', 'Shirts', 10)"
+        ))
+        connection.execute(text("""
+            INSERT INTO orders (id, customer_id, status, created_at, total_amount) VALUES
+                (1, 1, 'completed', now() - interval '14 months', 10),
+                (2, 1, 'pending', now() - interval '1 month', 20),
+                (3, 1, 'canceled', now(), 30)
+        """))
+        connection.execute(text("SELECT setval(pg_get_serial_sequence('orders', 'id'), 3)"))
+        connection.execute(text("INSERT INTO order_products (order_id, product_id, quantity, unit_price) SELECT id, 1, 1, total_amount FROM orders"))
+
+
+def test_partitioning_migration_round_trip(scratch_engine):
+    command.upgrade(alembic_config(), BEFORE_PARTITIONING)
+    seed_orders(scratch_engine)
+
+    command.upgrade(alembic_config(partition_orders=True), "head")
+    with scratch_engine.connect() as connection:
+        assert is_partitioned(connection)
+        assert not order_lines_foreign_key_exists(connection)
+        assert connection.execute(text("SELECT id, total_amount FROM orders ORDER BY id")).all() == [(1, 10), (2, 20), (3, 30)]
+        assert connection.scalars(text("SELECT section FROM order_products")).all() == ["Shirts"] * 3
+        # New orders still take ids from the same sequence.
+        assert connection.scalar(text(
+            "INSERT INTO orders (customer_id, status, created_at, total_amount) VALUES (1, 'pending', now(), 5) RETURNING id"
+        )) == 4
+        connection.execute(text("INSERT INTO order_products (order_id, product_id, quantity, unit_price, section) VALUES (4, 1, 1, 5, 'Shirts')"))
+        connection.commit()
+
+        assert archive_closed_orders(connection, older_than_months=12) == 1
+        assert connection.scalar(text("SELECT order_id FROM order_products_archive")) == 1
+
+    command.downgrade(alembic_config(), BEFORE_PARTITIONING)
+    with scratch_engine.connect() as connection:
+        assert not is_partitioned(connection)
+        assert order_lines_foreign_key_exists(connection)
+        assert connection.scalars(text("SELECT id FROM orders ORDER BY id")).all() == [2, 3, 4]
+
+    # Without the opt-in the revision leaves orders, and its foreign key, alone both ways.
+    command.upgrade(alembic_config(), "head")
+    with scratch_engine.connect() as connection:
+        assert not is_partitioned(connection)
+        assert order_lines_foreign_key_exists(connection)
+    command.downgrade(alembic_config(), BEFORE_PARTITIONING)
+    with scratch_engine.connect() as connection:
+        assert order_lines_foreign_key_exists(connection)
+
+def test_unpartitioning_refuses_lines_of_missing_orders(scratch_engine):
+    command.upgrade(alembic_config(), BEFORE_PARTITIONING)
+    seed_orders(scratch_engine)
+    command.upgrade(alembic_config(partition_orders=True), "head")
+
+    with scratch_engine.connect() as connection:
+        # Nothing stops such a line while orders is partitioned.
+        connection.execute(text("INSERT INTO order_products (order_id, product_id, quantity, unit_price, section) VALUES (99, 1, 1, 5, 'Shirts')"))
+        with pytest.raises(RuntimeError, match="1 order_products rows reference orders that do not exist"):
+            unpartition_orders(connection)
+        connection.rollback()
+        assert is_partitioned(connection)
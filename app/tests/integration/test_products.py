@@ -1,8 +1,13 @@
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session, selectinload
 from app.models.domain.product import ProductModel, ProductImageModel
+from app.db.repositories import ProductRepository
+from app.api.dependencies.pagination import encode_cursor
+from app.models.schemas.product import ProductSchema, ProductResponse
 from datetime import date, timedelta
 
 VALID_IMAGE_URL_1 = "http://example.com/image.png"
@@ -403,4 +408,111 @@ async def test_get_products_with_filters(
     assert response_combined_price.status_code == status.HTTP_200_OK
     data_combined_price = response_combined_price.json()
     assert len(data_combined_price) == 1
-    assert data_combined_price[0]["barcode"] == p3_data_from_api["barcode"]
\ No newline at end of file
+    assert data_combined_price[0]["barcode"] == p3_data_from_api["barcode"]
+
+
+@pytest.mark.asyncio
+async def test_get_products_cursor_pagination(authenticated_client: TestClient, db_session: Session):
+    db_session.query(ProductImageModel).delete()
+    db_session.query(ProductModel).delete()
+    db_session.commit()
+
+    for index in range(5):
+        db_session.add(ProductModel(
+            description=f"Cursor Product {index}", price=10.0, barcode=f"CURSOR{index:04d}",
+            section="Cursor", stock=5
+        ))
+    db_session.commit()
+
+    seen_ids = []
+    response = authenticated_client.get("/products/?limit=2")
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        seen_ids.extend(p["id"] for p in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = authenticated_client.get(f"/products/?limit=2&cursor={cursor}")
+
+    assert len(seen_ids) == 5
+    assert seen_ids == sorted(seen_ids)
+
+@pytest.mark.asyncio
+async def test_get_products_invalid_cursor(authenticated_client: TestClient):
+    response = authenticated_client.get("/products/?cursor=%%%")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"][0] == "Invalid pagination cursor"
+
+    for values in ([None], [[1]], [True]):
+        response = authenticated_client.get(f"/products/?cursor={encode_cursor('id', values)}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["errors"][0] == "Invalid pagination cursor"
+
+
+def test_decrement_stock_only_takes_available_stock(db_session: Session):
+    product = ProductModel(description="Stock Guard", price=1.0, barcode="STOCKGUARD01", section="Guard", stock=5)
+    db_session.add(product)
+    db_session.flush()
+    repository = ProductRepository(db_session)
+
+    assert repository.decrement_stock(product.id, 3) == 2
+    assert repository.decrement_stock(product.id, 3) is None
+    assert product.stock == 2
+    assert repository.increment_stock(product.id, 4) == 6
+    assert repository.decrement_stock(99999, 1) is None
+
+
+def test_decrement_stock_bulk_skips_short_lines(db_session: Session):
+    plenty = ProductModel(description="Plenty", price=1.0, barcode="STOCKBULK01", section="Guard", stock=10)
+    short = ProductModel(description="Short", price=1.0, barcode="STOCKBULK02", section="Guard", stock=1)
+    db_session.add_all([plenty, short])
+    db_session.flush()
+
+    new_levels = ProductRepository(db_session).decrement_stock_bulk({plenty.id: 4, short.id: 2})
+
+    assert new_levels == {plenty.id: 6}
+    assert plenty.stock == 6
+    assert short.stock == 1
+
+
+def test_stock_updates_lock_products_in_id_order(db_session: Session):
+    plenty = ProductModel(description="Lock Order", price=1.0, barcode="STOCKLOCK01", section="Guard", stock=10)
+    db_session.add(plenty)
+    db_session.flush()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(context.compiled.statement.compile(dialect=postgresql.dialect()).string)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        repository = ProductRepository(db_session)
+        repository.decrement_stock_bulk({plenty.id: 1, 99999: 1})
+        repository.increment_stock_bulk({99999: 1, plenty.id: 1})
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert len(statements) == 2
+    for statement in statements:
+        assert "ORDER BY products.id FOR UPDATE" in statement
+    assert plenty.stock == 10
+
+
+def test_create_product_returns_written_product_without_reload(db_session: Session, test_product_payload):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        product = ProductRepository(db_session).create_product(ProductSchema(**test_product_payload))
+        response = ProductResponse.model_validate(product)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    assert not any(statement.lstrip().startswith("SELECT") for statement in statements)
+    assert response.id == product.id
+    assert [str(image.url) for image in response.images] == [VALID_IMAGE_URL_1, VALID_IMAGE_URL_2]
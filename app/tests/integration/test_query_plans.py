@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.repositories import OrderRepository, ProductRepository
+from app.models.domain.product import ProductImageModel, ProductModel
+
+
+@contextmanager
+def captured_selects(db_session: Session):
+    connection = db_session.connection()
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+
+def query_plan(db_session: Session, statement: str, parameters: tuple) -> str:
+    rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return " | ".join(row[-1] for row in rows)
+
+
+def plan_of_first_select(db_session: Session, run_query) -> str:
+    with captured_selects(db_session) as statements:
+        run_query()
+    statement, parameters = statements[0]
+    return query_plan(db_session, statement, parameters)
+
+
+@pytest.fixture
+def product_with_image(db_session: Session) -> ProductModel:
+    product = ProductModel(description="Plan Product", price=10.0, barcode="PLANPROD001", section="PlanSection", stock=3)
+    product.images.append(ProductImageModel(url="http://example.com/plan.png"))
+    db_session.add(product)
+    db_session.flush()
+    db_session.expire_all()
+    return product
+
+
+@pytest.mark.parametrize("filters, index_name", [
+    ({}, "ix_orders_created_at_id"),
+    ({"customer_id": 1}, "ix_orders_customer_id_created_at_id"),
+    ({"status_filter": "pending"}, "ix_orders_status_created_at_id"),
+])
+def test_order_listing_uses_composite_index(db_session: Session, filters, index_name):
+    plan = plan_of_first_select(db_session, lambda: OrderRepository(db_session).get_orders(**filters))
+    assert index_name in plan
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_order_section_filter_is_a_semi_join_in_index_order(db_session: Session):
+    plan = plan_of_first_select(
+        db_session, lambda: OrderRepository(db_session).get_orders(product_section="PlanSection")
+    )
+    # Orders are read in ORDER BY order and each one probes its lines in the section; no join
+    # to products and no DISTINCT sort.
+    assert "ix_orders_created_at_id" in plan
+    assert "SEARCH order_products USING INDEX ix_order_products_section_order_id (section=? AND order_id=?)" in plan
+    assert "SEARCH products" not in plan and "SCAN products" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("filters, index_name", [
+    ({"section": "PlanSection", "min_price": 1.0}, "ix_products_section_price"),
+    ({"available": True}, "ix_products_in_stock_id"),
+])
+def test_product_listing_uses_filter_indexes(db_session: Session, filters, index_name):
+    plan = plan_of_first_select(
+        db_session, lambda: ProductRepository(db_session).get_products(skip=0, limit=10, **filters)
+    )
+    assert index_name in plan
+
+
+def test_product_images_selectinload_uses_product_id_index(db_session: Session, product_with_image: ProductModel):
+    with captured_selects(db_session) as statements:
+        ProductRepository(db_session).get_product_by_id(product_with_image.id)
+    image_statement, parameters = next(s for s in statements if "FROM product_images" in s[0])
+    assert "ix_product_images_product_id" in query_plan(db_session, image_statement, parameters)
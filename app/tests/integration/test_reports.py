@@ -0,0 +1,235 @@
+import pytest
+from datetime import date
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.db.repositories.reports import ReportRepository
+from app.models.domain.customer import CustomerModel
+from app.models.domain.order import OrderModel
+from app.models.domain.product import ProductModel
+from app.models.domain.sales_report import ProductSalesDailyModel, SalesDailyModel
+
+
+@pytest.fixture
+def report_customer(db_session: Session) -> CustomerModel:
+    customer = CustomerModel(name="Report Customer", email="reportcust@example.com", cpf="52998224725")
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+@pytest.fixture
+def report_products(db_session: Session) -> list:
+    products = [
+        ProductModel(description="Report Shirt", price=10.0, barcode="REPORTPROD001", section="Shirts", stock=50),
+        ProductModel(description="Report Pants", price=40.0, barcode="REPORTPROD002", section="Pants", stock=50),
+        ProductModel(description="Report Socks", price=5.0, barcode="REPORTPROD003", section="Shirts", stock=50),
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    return products
+
+
+def create_order(client: TestClient, customer_id: int, lines: list) -> dict:
+    response = client.post("/orders/", json={
+        "customer_id": customer_id,
+        "products": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines]
+    })
+    assert response.status_code == status.HTTP_201_CREATED, response.json()
+    return response.json()
+
+
+def assert_aggregates_match_orders(db_session: Session) -> None:
+    """The incrementally maintained tables must equal a full recomputation from the orders."""
+    db_session.expire_all()
+    expected_sections = {}
+    expected_products = {}
+    orders = db_session.query(OrderModel).all()
+    for order in orders:
+        day, order_status = order.created_at.date(), order.status.value
+        for section in {op.section for op in order.order_products}:
+            lines = [op for op in order.order_products if op.section == section]
+            expected_sections[(day, section, order_status)] = tuple(
+                a + b for a, b in zip(
+                    expected_sections.get((day, section, order_status), (0, 0, 0.0)),
+                    (1, sum(op.quantity for op in lines), sum(op.quantity * op.unit_price for op in lines))
+                )
+            )
+        for op in order.order_products:
+            key = (day, op.product_id, order_status)
+            units, revenue = expected_products.get(key, (0, 0.0))
+            expected_products[key] = (units + op.quantity, revenue + op.quantity * op.unit_price)
+
+    actual_sections = {
+        (row.day, row.section, row.status.value): (row.orders, row.units, row.revenue)
+        for row in db_session.query(SalesDailyModel).filter(SalesDailyModel.units != 0)
+    }
+    actual_products = {
+        (row.day, row.product_id, row.status.value): (row.units, row.revenue)
+        for row in db_session.query(ProductSalesDailyModel).filter(ProductSalesDailyModel.units != 0)
+    }
+    assert actual_sections == expected_sections
+    assert actual_products == expected_products
+
+
+def test_sales_report_after_order_creation(
+    authenticated_client: TestClient, db_session: Session, report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    create_order(authenticated_client, report_customer.id, [(shirt.id, 2), (pants.id, 1), (socks.id, 4)])
+    create_order(authenticated_client, report_customer.id, [(pants.id, 2)])
+
+    response = authenticated_client.get("/reports/sales", params={"start_date": date.today().isoformat()})
+    assert response.status_code == status.HTTP_200_OK
+    rows = {row["section"]: row for row in response.json()}
+    assert rows["Pants"] == {
+        "day": date.today().isoformat(), "section": "Pants", "status": "pending",
+        "orders": 2, "units": 3, "revenue": 120.0
+    }
+    assert (rows["Shirts"]["orders"], rows["Shirts"]["units"], rows["Shirts"]["revenue"]) == (1, 6, 40.0)
+    assert_aggregates_match_orders(db_session)
+
+    response = authenticated_client.get("/reports/sales", params={"section": "Shirts"})
+    assert [row["section"] for row in response.json()] == ["Shirts"]
+
+def test_top_products_ranks_by_revenue_or_units(
+    authenticated_client: TestClient, report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    create_order(authenticated_client, report_customer.id, [(shirt.id, 3), (pants.id, 1), (socks.id, 10)])
+
+    response = authenticated_client.get("/reports/top-products", params={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"product_id": socks.id, "description": "Report Socks", "section": "Shirts", "units": 10, "revenue": 50.0},
+        {"product_id": pants.id, "description": "Report Pants", "section": "Pants", "units": 1, "revenue": 40.0},
+    ]
+
+    response = authenticated_client.get("/reports/top-products", params={"order_by": "units"})
+    assert [row["product_id"] for row in response.json()] == [socks.id, shirt.id, pants.id]
+
+def test_status_change_and_update_move_aggregates(
+    authenticated_client: TestClient, db_session: Session, report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    first = create_order(authenticated_client, report_customer.id, [(shirt.id, 2), (pants.id, 1)])
+    second = create_order(authenticated_client, report_customer.id, [(socks.id, 1)])
+
+    response = authenticated_client.put(f"/orders/{first['id']}", json={
+        "customer_id": report_customer.id, "status": "processing",
+        "products": [{"product_id": shirt.id, "quantity": 5}, {"product_id": socks.id, "quantity": 1}]
+    })
+    assert response.status_code == status.HTTP_200_OK
+    assert_aggregates_match_orders(db_session)
+
+    response = authenticated_client.patch(f"/orders/{second['id']}/status", json={"status": "canceled"})
+    assert response.status_code == status.HTTP_200_OK
+    assert_aggregates_match_orders(db_session)
+
+    response = authenticated_client.get("/reports/sales", params={"status": "canceled"})
+    assert [(row["section"], row["units"]) for row in response.json()] == [("Shirts", 1)]
+    # Canceled sales are left out of the ranking unless asked for.
+    response = authenticated_client.get("/reports/top-products")
+    assert [(row["product_id"], row["units"]) for row in response.json()] == [(shirt.id, 5), (socks.id, 1)]
+
+def test_bulk_status_change_moves_aggregates(
+    authenticated_client: TestClient, db_session: Session, report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    first = create_order(authenticated_client, report_customer.id, [(shirt.id, 2), (pants.id, 1)])
+    second = create_order(authenticated_client, report_customer.id, [(socks.id, 3)])
+
+    response = authenticated_client.patch("/orders/status", json={"order_ids": [first["id"], second["id"]], "status": "completed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert_aggregates_match_orders(db_session)
+
+    response = authenticated_client.get("/reports/sales", params={"status": "completed", "section": "Shirts"})
+    assert [(row["orders"], row["units"], row["revenue"]) for row in response.json()] == [(2, 5, 35.0)]
+
+def test_bulk_creation_and_deletion_keep_aggregates_in_sync(
+    admin_authenticated_client: TestClient, authenticated_client: TestClient, db_session: Session,
+    report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    response = authenticated_client.post("/orders/bulk", json={"orders": [
+        {"customer_id": report_customer.id, "products": [{"product_id": shirt.id, "quantity": 1}, {"product_id": socks.id, "quantity": 2}]},
+        {"customer_id": report_customer.id, "products": [{"product_id": pants.id, "quantity": 3}]},
+    ]})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert_aggregates_match_orders(db_session)
+
+    deleted_id = response.json()["results"][1]["order_id"]
+    response = admin_authenticated_client.delete(f"/orders/{deleted_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert_aggregates_match_orders(db_session)
+    assert db_session.query(func.sum(SalesDailyModel.units)).filter(SalesDailyModel.section == "Pants").scalar() == 0
+
+def test_moving_a_product_leaves_its_past_sales_in_their_section(
+    admin_authenticated_client: TestClient, db_session: Session, report_customer: CustomerModel, report_products: list
+):
+    shirt, pants, socks = report_products
+    first = create_order(admin_authenticated_client, report_customer.id, [(shirt.id, 2), (pants.id, 1)])
+    second = create_order(admin_authenticated_client, report_customer.id, [(shirt.id, 1)])
+
+    response = admin_authenticated_client.put(f"/products/{shirt.id}", json={
+        "description": "Report Shirt", "price": 10.0, "barcode": "REPORTPROD001", "section": "Outlet", "stock": 47
+    })
+    assert response.status_code == status.HTTP_200_OK
+
+    response = admin_authenticated_client.patch(f"/orders/{first['id']}/status", json={"status": "processing"})
+    assert response.status_code == status.HTTP_200_OK
+    response = admin_authenticated_client.patch("/orders/status", json={"order_ids": [second["id"]], "status": "completed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert_aggregates_match_orders(db_session)
+
+    response = admin_authenticated_client.get("/reports/sales")
+    assert sorted((row["section"], row["status"], row["units"]) for row in response.json()) == [
+        ("Pants", "processing", 1), ("Shirts", "completed", 1), ("Shirts", "processing", 2)
+    ]
+
+    third = create_order(admin_authenticated_client, report_customer.id, [(shirt.id, 1)])
+    assert db_session.get(OrderModel, third["id"]).order_products[0].section == "Outlet"
+    assert_aggregates_match_orders(db_session)
+
+def test_sales_deltas_are_upserted_in_key_order(db_session: Session, report_products: list):
+    upserted = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("INSERT INTO"):
+            upserted.append([row[:3] for row in parameters])
+
+    shirt, pants, socks = report_products
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        ReportRepository(db_session).apply_sales_deltas(
+            {
+                (date(2025, 1, 2), "Shirts", "pending"): (1, 1, 10.0),
+                (date(2025, 1, 1), "Shirts", "pending"): (1, 1, 10.0),
+                (date(2025, 1, 1), "Pants", "pending"): (1, 1, 40.0),
+            },
+            {
+                (date(2025, 1, 1), socks.id, "pending"): (1, 5.0),
+                (date(2025, 1, 1), shirt.id, "pending"): (1, 10.0),
+                (date(2025, 1, 1), pants.id, "canceled"): (1, 40.0),
+                (date(2025, 1, 1), pants.id, "pending"): (1, 40.0),
+            }
+        )
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    section_rows, product_rows = upserted
+    assert section_rows == [("2025-01-01", "Pants", "pending"), ("2025-01-01", "Shirts", "pending"), ("2025-01-02", "Shirts", "pending")]
+    assert product_rows == [
+        ("2025-01-01", shirt.id, "pending"), ("2025-01-01", pants.id, "canceled"),
+        ("2025-01-01", pants.id, "pending"), ("2025-01-01", socks.id, "pending"),
+    ]
+
+def test_sales_report_rejects_invalid_filters(authenticated_client: TestClient):
+    response = authenticated_client.get("/reports/sales", params={"start_date": "16/10/2026"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Invalid start_date format" in response.json()["errors"][0]
+
+    response = authenticated_client.get("/reports/top-products", params={"status": "lost"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -29,7 +29,7 @@ class TestCustomerService:
         
         result = customer_service.get_customers(order_by="name", skip=5, limit=10)
 
-        mock_customer_repo.get_customers.assert_called_once_with("name", 5, 10)
+        mock_customer_repo.get_customers.assert_called_once_with("name", 5, 10, None)
         assert result == ["customer1", "customer2"]
 
     def test_get_customer_by_id(self, customer_service: CustomerService, mock_customer_repo: Mock, sample_customer_model: CustomerModel):
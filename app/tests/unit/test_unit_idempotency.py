@@ -0,0 +1,145 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status as http_status
+from fastapi.responses import JSONResponse
+
+from app.models.domain.idempotency_key import IdempotencyKeyModel
+from app.models.schemas.order import OrderStatusUpdate
+from app.services import idempotency as idempotency_module
+from app.services.idempotency import IdempotencyService, request_fingerprint
+
+
+ENDPOINT = "PATCH /orders/1/status"
+PAYLOAD = OrderStatusUpdate(status="completed")
+
+
+@pytest.fixture
+def mock_idempotency_repo(mocker):
+    return mocker.Mock()
+
+@pytest.fixture
+def idempotency_service(mock_idempotency_repo):
+    return IdempotencyService(mock_idempotency_repo, user_id=7)
+
+def make_record(**kwargs) -> IdempotencyKeyModel:
+    defaults = dict(
+        user_id=7, key="k", request_hash=request_fingerprint(ENDPOINT, PAYLOAD), status_code=None, response_body=None,
+        expires_at=datetime(2026, 10, 18, 12, 0, 0, 123456)
+    )
+    defaults.update(kwargs)
+    return IdempotencyKeyModel(**defaults)
+
+
+@pytest.mark.asyncio
+async def test_run_without_key_calls_operation_directly(idempotency_service, mock_idempotency_repo, mocker):
+    operation = mocker.AsyncMock(return_value="order")
+
+    result = await idempotency_service.run(None, ENDPOINT, PAYLOAD, operation, mocker.Mock(), 200)
+
+    assert result == "order"
+    mock_idempotency_repo.claim_key.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_run_waits_for_concurrent_duplicate_and_replays_its_response(idempotency_service, mock_idempotency_repo, mocker):
+    mocker.patch.object(idempotency_module, "LOCK_POLL_INTERVAL_SECONDS", 0)
+    in_progress = make_record(locked_until=datetime.utcnow() + timedelta(seconds=10))
+    finished = make_record(status_code=201, response_body={"id": 5})
+    # Primeira tentativa encontra a chave travada; depois do poll a resposta já está gravada.
+    mock_idempotency_repo.claim_key.side_effect = [(in_progress, False), (finished, False)]
+    mock_idempotency_repo.get_key.side_effect = [in_progress, finished]
+    operation = mocker.AsyncMock()
+
+    response = await idempotency_service.run("k", ENDPOINT, PAYLOAD, operation, mocker.Mock(), 201)
+
+    assert isinstance(response, JSONResponse)
+    assert response.status_code == http_status.HTTP_201_CREATED
+    assert json.loads(response.body) == {"id": 5}
+    assert response.headers["Idempotent-Replayed"] == "true"
+    operation.assert_not_called()
+    assert mock_idempotency_repo.get_key.call_count == 2
+
+@pytest.mark.asyncio
+async def test_run_takes_over_key_when_lock_lapses(idempotency_service, mock_idempotency_repo, mocker):
+    abandoned = make_record(locked_until=datetime.utcnow() - timedelta(seconds=1))
+    claimed = make_record(locked_until=datetime.utcnow() + timedelta(seconds=10))
+    mock_idempotency_repo.claim_key.side_effect = [(abandoned, False), (claimed, True)]
+    operation = mocker.AsyncMock(return_value=mocker.Mock())
+    response_model = mocker.Mock()
+    response_model.model_validate.return_value.model_dump.return_value = {"id": 1}
+
+    await idempotency_service.run("k", ENDPOINT, PAYLOAD, operation, response_model, 200)
+
+    operation.assert_awaited_once()
+    mock_idempotency_repo.get_key.assert_not_called()
+    mock_idempotency_repo.store_response.assert_called_once_with(claimed, 200, {"id": 1})
+    mock_idempotency_repo.commit.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_run_releases_key_when_operation_fails(idempotency_service, mock_idempotency_repo, mocker):
+    mock_idempotency_repo.claim_key.return_value = (make_record(), True)
+    operation = mocker.AsyncMock(side_effect=HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Insufficient stock"))
+
+    with pytest.raises(HTTPException):
+        await idempotency_service.run("k", ENDPOINT, PAYLOAD, operation, mocker.Mock(), 200)
+
+    mock_idempotency_repo.release_key.assert_called_once_with(7, "k", datetime(2026, 10, 18, 12, 0, 0, 123456))
+    mock_idempotency_repo.store_response.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_operation_stages_response_in_its_own_transaction(idempotency_service, mock_idempotency_repo, mocker):
+    claimed = make_record()
+    mock_idempotency_repo.claim_key.return_value = (claimed, True)
+    response_model = mocker.Mock()
+    response_model.model_validate.return_value.model_dump.return_value = {"id": 1}
+    commits = []
+
+    async def operation(stage_response):
+        stage_response("order")
+        commits.append("order")
+        return "order"
+
+    assert await idempotency_service.run("k", ENDPOINT, PAYLOAD, operation, response_model, 201) == "order"
+
+    mock_idempotency_repo.store_response.assert_called_once_with(claimed, 201, {"id": 1})
+    # The operation committed the response with its own work; nothing is committed on its own.
+    mock_idempotency_repo.commit.assert_not_called()
+    assert commits == ["order"]
+
+@pytest.mark.asyncio
+async def test_response_for_a_key_taken_over_aborts_the_write(idempotency_service, mock_idempotency_repo, mocker):
+    mock_idempotency_repo.claim_key.return_value = (make_record(), True)
+    mock_idempotency_repo.store_response.return_value = False
+    committed = mocker.Mock()
+
+    async def operation(stage_response):
+        stage_response("order")
+        committed()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await idempotency_service.run("k", ENDPOINT, PAYLOAD, operation, mocker.Mock(), 201)
+
+    assert exc_info.value.status_code == http_status.HTTP_409_CONFLICT
+    committed.assert_not_called()
+    mock_idempotency_repo.release_key.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_lock_is_extended_while_the_operation_runs(mock_idempotency_repo, mocker):
+    mocker.patch.object(idempotency_module.settings, "IDEMPOTENCY_LOCK_SECONDS", 0.02)
+    extend_lock = mocker.patch.object(idempotency_module.IdempotencyRepository, "extend_lock", return_value=True)
+    service = IdempotencyService(mock_idempotency_repo, user_id=7, session_factory=mocker.MagicMock())
+    claimed = make_record()
+    mock_idempotency_repo.claim_key.return_value = (claimed, True)
+
+    async def operation(stage_response):
+        await asyncio.sleep(0.05)
+        return "order"
+
+    await service.run("k", ENDPOINT, PAYLOAD, operation, mocker.Mock(), 201)
+    calls = extend_lock.call_count
+    await asyncio.sleep(0.03)
+
+    assert calls >= 2
+    assert extend_lock.call_count == calls
+    assert extend_lock.call_args.args[:3] == (7, "k", claimed.expires_at)
@@ -8,7 +8,7 @@ from app.services.order import OrderService
 from app.models.domain.order import OrderModel, OrderProduct, OrderStatus
 from app.models.domain.product import ProductModel
 from app.models.domain.customer import CustomerModel
-from app.models.schemas.order import OrderCreate, OrderProductCreate
+from app.models.schemas.order import OrderBulkStatusUpdate, OrderCreate, OrderProductCreate
 from app.services import WhatsappService
 
 
@@ -121,7 +121,10 @@ class TestOrderService:
             OrderProductCreate(product_id=sample_product2_model.id, quantity=1)
         ]
         
-        mock_product_service.get_product_by_id.side_effect = [sample_product1_model, sample_product2_model]
+        mock_product_service.get_products_by_ids.return_value = {
+            sample_product1_model.id: sample_product1_model,
+            sample_product2_model.id: sample_product2_model
+        }
 
         prepared_items, total_amount = order_service._prepare_order_items_and_calc_total(order_product_inputs)
 
@@ -139,19 +142,37 @@ class TestOrderService:
         expected_total = (sample_product1_model.price * 2) + (sample_product2_model.price * 1)
         assert total_amount == expected_total
 
-        mock_product_service.get_product_by_id.assert_has_calls([
-            call(sample_product1_model.id),
-            call(sample_product2_model.id)
-        ])
-        mock_product_service.update_product_stock.assert_has_calls([
-            call(product_id=sample_product1_model.id, quantity_change=2, increase=False),
-            call(product_id=sample_product2_model.id, quantity_change=1, increase=False)
-        ])
+        mock_product_service.get_products_by_ids.assert_called_once_with({
+            sample_product1_model.id: 2,
+            sample_product2_model.id: 1
+        })
+        mock_product_service.decrease_stock.assert_called_once_with({
+            sample_product1_model.id: 2,
+            sample_product2_model.id: 1
+        })
+        mock_product_service.get_product_by_id.assert_not_called()
+        mock_product_service.update_product_stock.assert_not_called()
+
+    def test_prepare_order_items_merges_repeated_products_for_stock_check(
+        self, order_service: OrderService, mock_product_service: Mock, sample_product1_model: Mock
+    ):
+        sample_product1_model.stock = 3
+        order_product_inputs = [
+            OrderProductCreate(product_id=sample_product1_model.id, quantity=2),
+            OrderProductCreate(product_id=sample_product1_model.id, quantity=2)
+        ]
+        mock_product_service.get_products_by_ids.return_value = {sample_product1_model.id: sample_product1_model}
+
+        with pytest.raises(HTTPException) as exc_info:
+            order_service._prepare_order_items_and_calc_total(order_product_inputs)
+        assert exc_info.value.status_code == http_status.HTTP_400_BAD_REQUEST
+        assert "Available: 3, Requested: 4" in exc_info.value.detail
+        mock_product_service.decrease_stock.assert_not_called()
 
     def test_prepare_order_items_product_not_found(self, order_service: OrderService, mock_product_service: Mock):
         order_product_inputs = [OrderProductCreate(product_id=999, quantity=1)]
-        mock_product_service.get_product_by_id.side_effect = HTTPException(
-            status_code=http_status.HTTP_404_NOT_FOUND, detail="Product not found"
+        mock_product_service.get_products_by_ids.side_effect = HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND, detail="Product not found: 999"
         )
         
         with pytest.raises(HTTPException) as exc_info:
@@ -163,12 +184,13 @@ class TestOrderService:
     ):
         sample_product1_model.stock = 1 
         order_product_inputs = [OrderProductCreate(product_id=sample_product1_model.id, quantity=2)]
-        mock_product_service.get_product_by_id.return_value = sample_product1_model
+        mock_product_service.get_products_by_ids.return_value = {sample_product1_model.id: sample_product1_model}
         
         with pytest.raises(HTTPException) as exc_info:
             order_service._prepare_order_items_and_calc_total(order_product_inputs)
         assert exc_info.value.status_code == http_status.HTTP_400_BAD_REQUEST
         assert f"Insufficient stock for product ID {sample_product1_model.id}" in exc_info.value.detail
+        mock_product_service.decrease_stock.assert_not_called()
 
 
 
@@ -208,6 +230,122 @@ class TestOrderService:
         
         assert created_order == sample_order_model
 
+    async def test_create_order_queues_notification_in_outbox_instead_of_sending(
+        self, mock_order_repo: Mock, mock_product_service: Mock, mock_customer_repo: Mock,
+        mock_whatsapp_service: Mock, sample_order_create_schema: OrderCreate,
+        sample_customer_model: Mock, sample_order_model: Mock, mocker
+    ):
+        mock_event_repo = mocker.Mock()
+        order_service = OrderService(
+            mock_order_repo, mock_product_service, mock_customer_repo, mock_whatsapp_service,
+            event_repository=mock_event_repo
+        )
+        sample_customer_model.phone_number = "+5511999999999"
+        mock_customer_repo.get_customer_by_id.return_value = sample_customer_model
+        mocker.patch.object(order_service, '_prepare_order_items_and_calc_total', return_value=([], 70.0))
+        mock_order_repo.create_order.return_value = sample_order_model
+        # The event must be part of the order's transaction, so it is added before the commit.
+        calls = mocker.Mock()
+        calls.attach_mock(mock_event_repo.add_events, "add_events")
+        calls.attach_mock(mock_order_repo.commit, "commit")
+
+        await order_service.create_order(sample_order_create_schema)
+
+        assert [name for name, _, _ in calls.mock_calls] == ["add_events", "commit"]
+        [event] = mock_event_repo.add_events.call_args[0][0]
+        assert (event.order_id, event.event_type) == (sample_order_model.id, "order_created")
+        assert event.payload["phone_number"] == "+5511999999999"
+        mock_whatsapp_service.send_message.assert_not_called()
+
+    async def test_create_order_hands_notification_to_in_process_dispatcher_after_commit(
+        self, mock_order_repo: Mock, mock_product_service: Mock, mock_customer_repo: Mock,
+        mock_whatsapp_service: Mock, sample_order_create_schema: OrderCreate,
+        sample_customer_model: Mock, sample_order_model: Mock, mocker
+    ):
+        mock_dispatcher = mocker.Mock()
+        order_service = OrderService(
+            mock_order_repo, mock_product_service, mock_customer_repo, mock_whatsapp_service,
+            event_dispatcher=mock_dispatcher
+        )
+        sample_customer_model.phone_number = "+5511999999999"
+        mock_customer_repo.get_customer_by_id.return_value = sample_customer_model
+        mocker.patch.object(order_service, '_prepare_order_items_and_calc_total', return_value=([], 70.0))
+        mock_order_repo.create_order.return_value = sample_order_model
+        calls = mocker.Mock()
+        calls.attach_mock(mock_order_repo.commit, "commit")
+        calls.attach_mock(mock_dispatcher.enqueue, "enqueue")
+
+        await order_service.create_order(sample_order_create_schema)
+
+        assert [name for name, _, _ in calls.mock_calls] == ["commit", "enqueue"]
+        [event] = mock_dispatcher.enqueue.call_args[0][0]
+        assert event.order_id == sample_order_model.id
+        mock_whatsapp_service.send_message.assert_not_called()
+
+    async def test_create_orders_bulk_drops_orders_when_stock_runs_out_concurrently(
+        self, order_service: OrderService, mock_order_repo: Mock, mock_customer_repo: Mock,
+        mock_product_service: Mock, sample_customer_model: Mock,
+        sample_product1_model: Mock, sample_product2_model: Mock
+    ):
+        sample_customer_model.phone_number = None
+        mock_customer_repo.get_customers_by_ids.return_value = [sample_customer_model]
+        mock_product_service.get_products_by_ids.return_value = {
+            sample_product1_model.id: sample_product1_model,
+            sample_product2_model.id: sample_product2_model
+        }
+        # Product 2 was sold out by another request between the read and the UPDATE
+        mock_product_service.decrease_stock.side_effect = [{sample_product1_model.id: 48}, {sample_product1_model.id: 49}]
+        mock_order_repo.create_orders_bulk.side_effect = lambda orders: orders
+        orders_data = [
+            OrderCreate(customer_id=sample_customer_model.id, products=[OrderProductCreate(product_id=sample_product1_model.id, quantity=1)]),
+            OrderCreate(customer_id=sample_customer_model.id, products=[
+                OrderProductCreate(product_id=sample_product1_model.id, quantity=1),
+                OrderProductCreate(product_id=sample_product2_model.id, quantity=1)
+            ]),
+        ]
+
+        results = await order_service.create_orders_bulk(orders_data)
+
+        assert [result.status_code for result in results] == [http_status.HTTP_201_CREATED, http_status.HTTP_400_BAD_REQUEST]
+        assert results[1].error == f"Insufficient stock for product ID {sample_product2_model.id}"
+        assert mock_product_service.decrease_stock.call_args_list == [
+            call({sample_product1_model.id: 2, sample_product2_model.id: 1}, require_all=False),
+            call({sample_product1_model.id: 1}, require_all=False)
+        ]
+        mock_product_service.increase_stock.assert_called_once_with({sample_product1_model.id: 2})
+        created_orders = mock_order_repo.create_orders_bulk.call_args[0][0]
+        assert len(created_orders) == 1
+        assert created_orders[0].total_amount == sample_product1_model.price
+        mock_order_repo.commit.assert_called_once()
+
+    async def test_update_orders_status_cancels_set_wise_and_notifies_in_one_batch(
+        self, order_service: OrderService, mock_order_repo: Mock, mock_customer_repo: Mock,
+        mock_product_service: Mock, mock_whatsapp_service: Mock, sample_customer_model: Mock, mocker
+    ):
+        sample_customer_model.phone_number = "+5511999999999"
+        mock_customer_repo.get_customers_by_ids.return_value = [sample_customer_model]
+        mock_order_repo.lock_order_statuses.return_value = {1: OrderStatus.PENDING, 2: OrderStatus.PROCESSING, 3: OrderStatus.CANCELED}
+        created_at = datetime(2026, 10, 16)
+        mock_order_repo.update_orders_status.return_value = [
+            mocker.Mock(id=1, customer_id=sample_customer_model.id, created_at=created_at),
+            mocker.Mock(id=2, customer_id=sample_customer_model.id, created_at=created_at)
+        ]
+        mock_order_repo.get_order_lines.return_value = [
+            mocker.Mock(order_id=1, product_id=101, quantity=2, unit_price=20.0, section="A"),
+            mocker.Mock(order_id=2, product_id=101, quantity=1, unit_price=20.0, section="A"),
+            mocker.Mock(order_id=2, product_id=102, quantity=4, unit_price=5.0, section="B")
+        ]
+        mock_whatsapp_service.send_message = mocker.AsyncMock(return_value=True)
+
+        result = await order_service.update_orders_status(OrderBulkStatusUpdate(order_ids=[1, 2, 3, 4], status="canceled"))
+
+        assert (result.updated, result.unchanged, result.not_found) == ([1, 2], [3], [4])
+        mock_order_repo.update_orders_status.assert_called_once_with([1, 2], OrderStatus.CANCELED)
+        mock_product_service.increase_stock.assert_called_once_with({101: 3, 102: 4})
+        mock_order_repo.commit.assert_called_once()
+        assert mock_whatsapp_service.send_message.await_count == 2
+        mock_customer_repo.get_customers_by_ids.assert_called_once_with([sample_customer_model.id])
+
     def test_get_order_by_id_found(
         self, order_service: OrderService, mock_order_repo: Mock, sample_order_model: Mock
     ):
@@ -245,13 +383,26 @@ class TestOrderService:
         order_service.get_orders(
             limit=50, skip=10, customer_id=1, status_filter="pending",
             start_date_str="2023-01-01", end_date_str="2023-01-31",
-            order_by_field="total_amount", order_direction="asc", product_section="Eletronicos"
+            order_by_field="total_amount", order_direction="asc", product_section="Eletronicos",
+            after=None
         )
         mock_order_repo.get_orders.assert_called_once_with(
             limit=50, skip=10, customer_id=1, status_filter="pending",
             start_date=PyDate(2023,1,1), end_date=PyDate(2023,1,31),
-            order_by_field="total_amount", order_direction="asc", product_section="Eletronicos"
+            order_by_field="total_amount", order_direction="asc", product_section="Eletronicos",
+            after=None
+        )
+
+    def test_get_orders_summary_uses_projection_query(self, order_service: OrderService, mock_order_repo: Mock):
+        mock_order_repo.get_order_summaries.return_value = []
+        order_service.get_orders(limit=20, status_filter="completed", summary=True)
+        mock_order_repo.get_order_summaries.assert_called_once_with(
+            limit=20, skip=0, customer_id=None, status_filter="completed",
+            start_date=None, end_date=None,
+            order_by_field="created_at", order_direction="desc", product_section=None,
+            after=None
         )
+        mock_order_repo.get_orders.assert_not_called()
 
     def test_update_order_status_success(
         self, order_service: OrderService, mock_order_repo: Mock, sample_order_model: Mock, mocker
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from app.models.domain.customer import CustomerModel
+from app.models.domain.order_event import DELIVERY_FAILED, DELIVERY_PENDING, DELIVERY_SENT, DELIVERY_SUPERSEDED
+from app.services.order_events import (
+    OrderEventDispatcher, backoff_delay, deliver_event, order_created_event, record_attempt, status_changed_event
+)
+from app.services.resilience import CircuitOpenError
+from app.services.whatsapp_service import MessageRejectedError, WhatsappService
+
+
+@pytest.fixture
+def whatsapp_service(mocker):
+    service = mocker.Mock(spec=WhatsappService)
+    service.send_message = mocker.AsyncMock(return_value=True)
+    return service
+
+@pytest.fixture
+def db_session():
+    return Mock()
+
+@pytest.fixture
+async def make_dispatcher(whatsapp_service, db_session):
+    dispatchers = []
+
+    def make(**options) -> OrderEventDispatcher:
+        # Memory backend only: the session is used for nothing but dead letters.
+        dispatchers.append(OrderEventDispatcher(Mock(return_value=db_session), whatsapp_service, **options))
+        return dispatchers[-1]
+
+    yield make
+    for dispatcher in dispatchers:
+        await dispatcher.stop()
+
+def make_events(count: int) -> list:
+    customer = CustomerModel(id=1, name="Ana Souza", phone_number="+5511999999999")
+    return [order_created_event(customer, order_id, 10.0) for order_id in range(1, count + 1)]
+
+async def wait_until(condition, timeout: float = 2.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestOrderEventDispatcher:
+
+    def test_backoff_grows_exponentially_with_jitter_up_to_the_cap(self):
+        for attempts, step in [(1, 2.0), (2, 4.0), (3, 8.0), (10, 60.0)]:
+            delays = [backoff_delay(attempts, base=2.0, cap=60.0) for _ in range(50)]
+            assert all(step / 2 <= delay <= step for delay in delays)
+            assert len(set(delays)) > 1
+
+    async def test_open_circuit_defers_without_using_an_attempt(self, whatsapp_service):
+        whatsapp_service.send_message.side_effect = CircuitOpenError(retry_after=20)
+        [event] = make_events(1)
+        now = datetime(2026, 1, 1)
+
+        error = await deliver_event(whatsapp_service, event)
+        record_attempt(event, error, now, max_attempts=1, backoff=lambda attempts: 1.0)
+
+        assert (event.attempts, event.delivery_status) == (0, DELIVERY_PENDING)
+        assert event.available_at == now + timedelta(seconds=21)
+        assert event.last_error.startswith("circuit open")
+
+    async def test_refused_message_fails_without_retrying(self, whatsapp_service):
+        whatsapp_service.send_message.side_effect = MessageRejectedError(400, "Invalid 'To' Phone Number")
+        [event] = make_events(1)
+        now = datetime(2026, 1, 1)
+
+        error = await deliver_event(whatsapp_service, event)
+        record_attempt(event, error, now, max_attempts=5, backoff=lambda attempts: 1.0)
+
+        assert (event.attempts, event.delivery_status, event.processed_at) == (1, DELIVERY_FAILED, now)
+        assert event.last_error == "HTTP 400 Invalid 'To' Phone Number"
+
+    async def test_workers_bound_the_concurrent_sends(self, make_dispatcher, whatsapp_service):
+        in_flight, peak = 0, 0
+
+        async def send_message(phone_number, body):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        whatsapp_service.send_message.side_effect = send_message
+        dispatcher = make_dispatcher(workers=2)
+        errors = await dispatcher._send_all(make_events(6))
+
+        assert errors == [None] * 6
+        assert peak == 2
+
+    async def test_memory_backend_retries_failed_sends_with_backoff(self, make_dispatcher, whatsapp_service):
+        whatsapp_service.send_message.side_effect = [False, True]
+        dispatcher = make_dispatcher(workers=1, backoff_base=0.01, backoff_max=0.01)
+        [event] = make_events(1)
+
+        dispatcher.enqueue([event])
+        assert event.delivery_status == DELIVERY_PENDING
+        await wait_until(lambda: event.delivery_status != DELIVERY_PENDING)
+
+        assert (event.delivery_status, event.attempts, event.last_error) == (DELIVERY_SENT, 2, None)
+        assert whatsapp_service.send_message.await_count == 2
+
+    async def test_memory_backend_gives_up_after_max_attempts(self, make_dispatcher, whatsapp_service, db_session):
+        whatsapp_service.send_message.return_value = False
+        dispatcher = make_dispatcher(workers=1, max_attempts=3, backoff_base=0.01, backoff_max=0.01)
+        [event] = make_events(1)
+
+        dispatcher.enqueue([event])
+        await wait_until(lambda: event.delivery_status != DELIVERY_PENDING)
+
+        assert (event.delivery_status, event.attempts) == (DELIVERY_FAILED, 3)
+        assert event.last_error == "send_message returned False"
+        await dispatcher.stop()
+        [dead_letter] = db_session.add_all.call_args.args[0]
+        assert (dead_letter.order_id, dead_letter.attempts, dead_letter.error) == (1, 3, "send_message returned False")
+        db_session.commit.assert_called_once()
+
+    async def test_full_queue_fails_the_overflow_instead_of_blocking(self, make_dispatcher):
+        dispatcher = make_dispatcher(workers=0, queue_size=1)
+        first, second = make_events(2)
+
+        dispatcher.enqueue([first, second])
+
+        assert (first.delivery_status, second.delivery_status) == (DELIVERY_PENDING, DELIVERY_FAILED)
+        assert dispatcher.backlog() == 1
+
+    async def test_memory_backend_sends_only_the_latest_status_within_the_window(self, make_dispatcher, whatsapp_service):
+        customer = CustomerModel(id=1, name="Ana Souza", phone_number="+5511999999999")
+        dispatcher = make_dispatcher(workers=2, coalesce_window=0.05)
+        processing, completed, other = (
+            status_changed_event(customer, 1, "processing"),
+            status_changed_event(customer, 1, "completed"),
+            status_changed_event(customer, 2, "canceled")
+        )
+
+        dispatcher.enqueue([processing])
+        dispatcher.enqueue([completed, other])
+        whatsapp_service.send_message.assert_not_awaited()
+        await wait_until(lambda: DELIVERY_PENDING not in {completed.delivery_status, other.delivery_status})
+
+        assert (processing.delivery_status, processing.attempts) == (DELIVERY_SUPERSEDED, 0)
+        assert (completed.delivery_status, other.delivery_status) == (DELIVERY_SENT, DELIVERY_SENT)
+        assert whatsapp_service.send_message.await_count == 2
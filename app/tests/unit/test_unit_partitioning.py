@@ -0,0 +1,33 @@
+import pytest
+from datetime import date
+
+from app.db.partitioning import add_months, archive_cutoff, month_range, partition_month, partition_name
+
+
+class TestMonthHelpers:
+
+    def test_add_months_crosses_year_boundaries(self):
+        assert add_months(date(2026, 11, 20), 2) == date(2027, 1, 1)
+        assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+        assert add_months(date(2026, 10, 16), 0) == date(2026, 10, 1)
+
+    def test_month_range_is_inclusive(self):
+        assert month_range(date(2025, 11, 30), date(2026, 2, 1)) == [
+            date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)
+        ]
+        assert month_range(date(2026, 3, 5), date(2026, 2, 1)) == []
+
+    def test_partition_name_round_trip(self):
+        name = partition_name("orders", date(2026, 4, 1))
+        assert name == "orders_2026_04"
+        assert partition_month("orders", name) == date(2026, 4, 1)
+        # Neither the default partition nor other tables sharing the prefix are monthly partitions.
+        assert partition_month("orders", "orders_default") is None
+        assert partition_month("orders", "orders_archive_2026_04") is None
+        assert partition_month("orders", "order_products") is None
+
+    def test_archive_cutoff_covers_whole_months(self):
+        assert archive_cutoff(date(2026, 10, 16), 12) == date(2025, 10, 1)
+        assert archive_cutoff(date(2026, 3, 1), 3) == date(2025, 12, 1)
+        with pytest.raises(ValueError):
+            archive_cutoff(date(2026, 10, 16), 0)
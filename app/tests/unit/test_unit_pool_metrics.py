@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, pool_stats
+
+
+@pytest.fixture
+def instrumented_engine():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+
+    def test_histogram_is_cumulative(self):
+        metrics = PoolMetrics(buckets_ms=(1, 10))
+        metrics.observe_checkout_wait(0.5)
+        metrics.observe_checkout_wait(5)
+        metrics.observe_checkout_wait(50)
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["count"] == 3
+        assert snapshot["max_ms"] == 50
+        assert snapshot["buckets"] == [
+            {"le_ms": 1, "count": 1},
+            {"le_ms": 10, "count": 2},
+            {"le_ms": None, "count": 3},
+        ]
+
+    def test_pool_reports_checkouts_and_timeouts(self, instrumented_engine):
+        connection = instrumented_engine.connect()
+        connection.execute(text("SELECT 1"))
+
+        stats = pool_stats(instrumented_engine.pool)
+        assert stats["checked_out"] == 1
+        assert stats["overflow_in_use"] == 0
+        assert stats["checkout_wait"]["count"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            instrumented_engine.connect()
+        connection.close()
+
+        stats = pool_stats(instrumented_engine.pool)
+        assert stats["checked_out"] == 0
+        assert stats["checkout_wait"]["timeouts"] == 1
+        assert stats["checkout_wait"]["count"] == 2
@@ -94,7 +94,7 @@ class TestProductService:
         result = product_service.get_products(skip=5, limit=10, section="Test", min_price=5.0, max_price=20.0, available=True)
         
         mock_product_repo.get_products.assert_called_once_with(
-            skip=5, limit=10, section="Test", min_price=5.0, max_price=20.0, available=True
+            skip=5, limit=10, section="Test", min_price=5.0, max_price=20.0, available=True, after=None
         )
         assert result == mock_products_list
 
@@ -235,39 +235,28 @@ class TestProductService:
 
 
     def test_update_product_stock_decrease_success(
-        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock, mocker
+        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
     ):
         product_id = sample_product_model.id
-        initial_stock = sample_product_model.stock # 50
         quantity_change = 10
-        expected_new_stock = initial_stock - quantity_change # 40
-
-        # Mock get_product_by_id para retornar o produto com estoque inicial
-        # sample_product_model já tem o estoque inicial configurado
-        mock_product_repo.get_product_by_id.return_value = sample_product_model
-        
-        # Mock update_stock para retornar o produto com o estoque atualizado
-        updated_product_mock = mocker.Mock(spec=ProductModel) # Pode ser o mesmo sample_product_model modificado
-        # Copiar atributos e atualizar o estoque
-        for attr in ['id', 'description', 'price', 'barcode', 'section', 'expiry_date', 'images']:
-            setattr(updated_product_mock, attr, getattr(sample_product_model, attr))
-        updated_product_mock.stock = expected_new_stock
-        mock_product_repo.update_stock.return_value = updated_product_mock
+        expected_new_stock = sample_product_model.stock - quantity_change # 40
 
+        # Decremento atômico no banco: nada é lido antes do UPDATE
+        mock_product_repo.decrement_stock.return_value = expected_new_stock
 
         result = product_service.update_product_stock(product_id, quantity_change, increase=False)
 
-        mock_product_repo.get_product_by_id.assert_called_once_with(product_id)
-        mock_product_repo.update_stock.assert_called_once_with(sample_product_model, expected_new_stock)
-        assert result.stock == expected_new_stock
+        mock_product_repo.decrement_stock.assert_called_once_with(product_id, quantity_change)
+        mock_product_repo.get_product_by_id.assert_not_called()
+        assert result == expected_new_stock
 
     def test_update_product_stock_decrease_insufficient_stock(
         self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
     ):
         product_id = sample_product_model.id
-        initial_stock = sample_product_model.stock # 50
-        quantity_change = initial_stock + 1 # Tenta tirar mais do que tem
+        quantity_change = sample_product_model.stock + 1 # Tenta tirar mais do que tem
 
+        mock_product_repo.decrement_stock.return_value = None
         mock_product_repo.get_product_by_id.return_value = sample_product_model
 
         with pytest.raises(HTTPException) as exc_info:
@@ -276,46 +265,85 @@ class TestProductService:
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert exc_info.value.detail == "Insufficient stock"
 
+    def test_update_product_stock_decrease_product_not_found(self, product_service: ProductService, mock_product_repo: Mock):
+        mock_product_repo.decrement_stock.return_value = None
+        mock_product_repo.get_product_by_id.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            product_service.update_product_stock(999, 1, increase=False)
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert exc_info.value.detail == "Product not found"
+
     def test_update_product_stock_decrease_negative_quantity(
         self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
     ):
-        mock_product_repo.get_product_by_id.return_value = sample_product_model # get_product_by_id é chamado primeiro
         with pytest.raises(HTTPException) as exc_info:
             product_service.update_product_stock(sample_product_model.id, -5, increase=False)
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert exc_info.value.detail == "Quantity to decrease must be non-negative"
+        mock_product_repo.decrement_stock.assert_not_called()
 
     def test_update_product_stock_increase_success(
-        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock, mocker
+        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
     ):
         product_id = sample_product_model.id
-        initial_stock = sample_product_model.stock # 50
         quantity_change = 10
-        expected_new_stock = initial_stock + quantity_change # 60
+        expected_new_stock = sample_product_model.stock + quantity_change # 60
 
-        mock_product_repo.get_product_by_id.return_value = sample_product_model
-        
-        updated_product_mock = mocker.Mock(spec=ProductModel)
-        for attr in ['id', 'description', 'price', 'barcode', 'section', 'expiry_date', 'images']:
-            setattr(updated_product_mock, attr, getattr(sample_product_model, attr))
-        updated_product_mock.stock = expected_new_stock
-        mock_product_repo.update_stock.return_value = updated_product_mock
+        mock_product_repo.increment_stock.return_value = expected_new_stock
 
         result = product_service.update_product_stock(product_id, quantity_change, increase=True)
 
-        mock_product_repo.get_product_by_id.assert_called_once_with(product_id)
-        mock_product_repo.update_stock.assert_called_once_with(sample_product_model, expected_new_stock)
-        assert result.stock == expected_new_stock
+        mock_product_repo.increment_stock.assert_called_once_with(product_id, quantity_change)
+        assert result == expected_new_stock
 
     def test_update_product_stock_increase_negative_quantity(
         self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
     ):
-        mock_product_repo.get_product_by_id.return_value = sample_product_model
         with pytest.raises(HTTPException) as exc_info:
             product_service.update_product_stock(sample_product_model.id, -5, increase=True)
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert exc_info.value.detail == "Quantity to increase must be non-negative"
+        mock_product_repo.increment_stock.assert_not_called()
+
 
+    def test_get_products_by_ids_returns_products_by_id(
+        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
+    ):
+        mock_product_repo.get_products_by_ids.return_value = [sample_product_model]
+
+        products = product_service.get_products_by_ids({sample_product_model.id: 2})
+
+        mock_product_repo.get_products_by_ids.assert_called_once_with([sample_product_model.id])
+        assert products == {sample_product_model.id: sample_product_model}
+
+    def test_get_products_by_ids_missing_product(
+        self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
+    ):
+        mock_product_repo.get_products_by_ids.return_value = [sample_product_model]
+
+        with pytest.raises(HTTPException) as exc_info:
+            product_service.get_products_by_ids([999, sample_product_model.id])
+
+        mock_product_repo.get_products_by_ids.assert_called_once_with([sample_product_model.id, 999])
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        assert exc_info.value.detail == "Product not found: 999"
+
+    def test_decrease_stock_success(self, product_service: ProductService, mock_product_repo: Mock):
+        mock_product_repo.decrement_stock_bulk.return_value = {1: 8, 2: 0}
+
+        assert product_service.decrease_stock({1: 2, 2: 5}) == {1: 8, 2: 0}
+        mock_product_repo.decrement_stock_bulk.assert_called_once_with({1: 2, 2: 5})
+
+    def test_decrease_stock_insufficient_for_one_line(self, product_service: ProductService, mock_product_repo: Mock):
+        mock_product_repo.decrement_stock_bulk.return_value = {1: 8}
+
+        with pytest.raises(HTTPException) as exc_info:
+            product_service.decrease_stock({1: 2, 2: 5})
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert exc_info.value.detail == "Insufficient stock for product ID 2. Requested: 5"
 
     def test_delete_product_success(
         self, product_service: ProductService, mock_product_repo: Mock, sample_product_model: Mock
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.query_stats import QueryStats, current_query_stats, instrument_engines
+
+
+class TestQueryStats:
+
+    def test_counts_statements_inside_request_context(self):
+        instrument_engines()
+        engine = create_engine("sqlite://")
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+        finally:
+            current_query_stats.reset(token)
+
+        assert stats.count == 2
+        assert stats.duration_ms >= 0
+
+    def test_statements_outside_request_context_are_ignored(self):
+        instrument_engines()
+        engine = create_engine("sqlite://")
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert current_query_stats.get() is None
+
+    def test_instrumentation_is_installed_once(self):
+        instrument_engines()
+        instrument_engines()
+        engine = create_engine("sqlite://")
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count == 1
+
+    def test_failed_statement_does_not_leak_its_start_time(self):
+        instrument_engines()
+        engine = create_engine("sqlite://")
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            with engine.connect() as connection:
+                with pytest.raises(OperationalError):
+                    connection.execute(text("SELECT * FROM missing_table"))
+                connection.execute(text("SELECT 1"))
+                assert not connection.info["query_start_times"]
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count == 2
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import Mock
+
+from app.db.replicas import ReplicaRouter
+
+
+@pytest.fixture
+def replica_engines(mocker):
+    return [mocker.Mock(name="replica_a"), mocker.Mock(name="replica_b")]
+
+@pytest.fixture
+def router(replica_engines) -> ReplicaRouter:
+    return ReplicaRouter(replica_engines, max_lag_seconds=5.0, sticky_seconds=60.0, lag_check_interval=60.0)
+
+
+class TestReplicaRouter:
+
+    def test_no_replicas_reads_from_primary(self):
+        assert ReplicaRouter([]).session_for_read("client") is None
+
+    def test_round_robin_over_healthy_replicas(self, router: ReplicaRouter, replica_engines, mocker):
+        mocker.patch.object(router, "_measure_lag", return_value=0.0)
+
+        first = router.session_for_read("client")
+        second = router.session_for_read("client")
+
+        assert first.get_bind() is replica_engines[0]
+        assert second.get_bind() is replica_engines[1]
+
+    def test_lagging_replica_is_skipped(self, router: ReplicaRouter, replica_engines, mocker):
+        lags = {id(replica_engines[0]): 30.0, id(replica_engines[1]): 0.5}
+        mocker.patch.object(router, "_measure_lag", side_effect=lambda engine: lags[id(engine)])
+
+        for _ in range(3):
+            assert router.session_for_read("client").get_bind() is replica_engines[1]
+
+    def test_falls_back_to_primary_when_all_replicas_lag_or_fail(self, router: ReplicaRouter, mocker):
+        mocker.patch.object(router, "_measure_lag", side_effect=[30.0, None])
+        assert router.session_for_read("client") is None
+
+    def test_lag_is_cached_between_checks(self, router: ReplicaRouter, mocker):
+        measure = mocker.patch.object(router, "_measure_lag", return_value=0.0)
+        for _ in range(4):
+            router.session_for_read("client")
+        assert measure.call_count == 2
+
+    def test_recent_writer_reads_from_primary(self, router: ReplicaRouter, mocker):
+        mocker.patch.object(router, "_measure_lag", return_value=0.0)
+        router.mark_write("writer")
+
+        assert router.session_for_read("writer") is None
+        assert router.session_for_read("someone_else") is not None
+
+    def test_stickiness_expires(self, replica_engines, mocker):
+        router = ReplicaRouter(replica_engines, sticky_seconds=0.0)
+        mocker.patch.object(router, "_measure_lag", return_value=0.0)
+        router.mark_write("writer")
+
+        assert router.session_for_read("writer") is not None
@@ -0,0 +1,65 @@
+import pytest
+from datetime import date, datetime
+from fastapi import HTTPException, status as http_status
+
+from app.models.domain.order import OrderModel, OrderProduct
+from app.models.enum.order import OrderStatus
+from app.services.reports import ReportService, SalesDelta
+
+
+def make_order(status: OrderStatus, lines) -> OrderModel:
+    order = OrderModel(status=status, created_at=datetime(2026, 10, 16, 15, 30))
+    for product_id, section, quantity, unit_price in lines:
+        order.order_products.append(OrderProduct(
+            product_id=product_id, quantity=quantity, unit_price=unit_price, section=section
+        ))
+    return order
+
+
+def test_sales_delta_counts_each_section_once_per_order():
+    delta = SalesDelta()
+    delta.add(make_order(OrderStatus.PENDING, [(1, "Shirts", 2, 10.0), (2, "Shirts", 1, 5.0), (3, "Pants", 1, 40.0)]))
+
+    assert delta.section_deltas() == {
+        (date(2026, 10, 16), "Shirts", "pending"): (1, 3, 25.0),
+        (date(2026, 10, 16), "Pants", "pending"): (1, 1, 40.0),
+    }
+    assert delta.product_deltas()[(date(2026, 10, 16), 1, "pending")] == (2, 20.0)
+
+def test_sales_delta_keeps_only_the_net_change():
+    order = make_order(OrderStatus.PENDING, [(1, "Shirts", 2, 10.0), (3, "Pants", 1, 40.0)])
+    delta = SalesDelta()
+    delta.add(order, -1)
+    order.status = OrderStatus.COMPLETED
+    order.order_products[0].quantity = 3
+    delta.add(order)
+
+    assert delta.section_deltas() == {
+        (date(2026, 10, 16), "Shirts", "pending"): (-1, -2, -20.0),
+        (date(2026, 10, 16), "Pants", "pending"): (-1, -1, -40.0),
+        (date(2026, 10, 16), "Shirts", "completed"): (1, 3, 30.0),
+        (date(2026, 10, 16), "Pants", "completed"): (1, 1, 40.0),
+    }
+
+    unchanged = SalesDelta()
+    unchanged.add(order, -1)
+    unchanged.add(order)
+    assert unchanged.section_deltas() == {} and unchanged.product_deltas() == {}
+
+def test_disabled_sales_delta_ignores_orders(mocker):
+    delta = SalesDelta(enabled=False)
+    delta.add(mocker.Mock())
+    assert delta.section_deltas() == {}
+
+def test_top_products_excludes_canceled_by_default(mocker):
+    report_repository = mocker.Mock()
+    ReportService(report_repository).get_top_products(limit=5)
+    report_repository.get_top_products.assert_called_once_with(
+        limit=5, start_date=None, end_date=None,
+        statuses=["pending", "processing", "completed"], order_by_field="revenue"
+    )
+
+def test_get_sales_rejects_invalid_status(mocker):
+    with pytest.raises(HTTPException) as exc_info:
+        ReportService(mocker.Mock()).get_sales(status_filter="lost")
+    assert exc_info.value.status_code == http_status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,79 @@
+import pytest
+
+from app.services.resilience import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, CircuitBreaker, CircuitOpenError, TokenBucket
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+
+    async def test_bursts_up_to_capacity_then_paces_callers(self):
+        bucket = TokenBucket(rate=200, capacity=2)
+
+        waits = [await bucket.acquire() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert all(wait > 0 for wait in waits[2:])
+        snapshot = bucket.snapshot()
+        assert (snapshot["acquired"], snapshot["throttled"]) == (4, 2)
+        assert snapshot["wait_seconds_total"] > 0
+
+    def test_snapshot_reports_saturation_and_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=4, clock=clock)
+        bucket._tokens = -2
+
+        assert (bucket.snapshot()["waiting"], bucket.snapshot()["saturation"]) == (2, 1.0)
+        clock.now += 4
+        assert (bucket.snapshot()["tokens_available"], bucket.snapshot()["saturation"]) == (2.0, 0.5)
+        clock.now += 60
+        assert bucket.snapshot()["tokens_available"] == 4.0
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_OPEN
+        clock.now += 10
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_call()
+        assert error.value.retry_after == 20
+        assert breaker.snapshot()["rejected_calls"] == 1
+
+    def test_half_open_probe_closes_or_reopens_the_circuit(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, half_open_max_calls=1, clock=clock)
+        breaker.record_failure()
+        clock.now += 30
+
+        assert breaker.snapshot()["state"] == CIRCUIT_HALF_OPEN
+        breaker.before_call()
+        # Only one probe at a time.
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert (breaker.state, breaker.snapshot()["retry_after_seconds"]) == (CIRCUIT_OPEN, 30)
+
+        clock.now += 30
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.snapshot()["times_opened"] == 2
@@ -0,0 +1,98 @@
+import base64
+import httpx
+import pytest
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+from app.services.resilience import CIRCUIT_OPEN, CircuitOpenError
+from app.services.whatsapp_service import MessageRejectedError, WhatsappService
+
+
+@pytest.fixture
+def twilio_settings(monkeypatch):
+    monkeypatch.setattr(settings, "TWILIO_ACCOUNT_SID", "AC123")
+    monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", "secret")
+    monkeypatch.setattr(settings, "TWILIO_WHATSAPP_FROM_NUMBER", "+14155238886")
+    monkeypatch.setattr(settings, "TWILIO_WHATSAPP_TO_NUMBER", "+5511988887777")
+    monkeypatch.setattr(settings, "TWILIO_API_BASE_URL", "https://api.twilio.test")
+
+
+class TestWhatsappService:
+
+    async def test_send_message_posts_to_the_messages_api(self, twilio_settings):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(201, json={"sid": "SM1", "status": "queued"})
+
+        service = WhatsappService(transport=httpx.MockTransport(handler))
+        assert await service.send_message("+5511999999999", "Olá") is True
+        assert await service.send_message("+5511999999999", "De novo") is True
+        await service.close()
+
+        request = requests[0]
+        assert request.method == "POST"
+        assert str(request.url) == "https://api.twilio.test/2010-04-01/Accounts/AC123/Messages.json"
+        assert request.headers["Authorization"] == "Basic " + base64.b64encode(b"AC123:secret").decode()
+        assert parse_qs(request.content.decode()) == {
+            "From": ["whatsapp:+14155238886"], "Body": ["Olá"], "To": ["whatsapp:+5511988887777"]
+        }
+
+    async def test_server_error_and_timeout_are_reported_as_failures(self, twilio_settings):
+        responses = iter([
+            httpx.Response(500, json={"message": "Internal Server Error"}),
+            httpx.ReadTimeout("timed out"),
+        ])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        service = WhatsappService(transport=httpx.MockTransport(handler))
+        assert await service.send_message("+5511999999999", "Olá") is False
+        assert await service.send_message("+5511999999999", "Olá") is False
+        await service.close()
+
+    async def test_refused_message_raises_instead_of_failing(self, twilio_settings):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, json={"code": 21211, "message": "Invalid 'To' Phone Number"})
+
+        service = WhatsappService(transport=httpx.MockTransport(handler))
+        with pytest.raises(MessageRejectedError) as exc_info:
+            await service.send_message("+5511999999999", "Olá")
+        await service.close()
+
+        assert exc_info.value.status_code == 400
+        # The message was refused, but Twilio itself answered normally.
+        assert service.stats()["circuit_breaker"]["consecutive_failures"] == 0
+
+    async def test_repeated_provider_errors_open_the_circuit(self, twilio_settings, monkeypatch):
+        monkeypatch.setattr(settings, "TWILIO_CIRCUIT_FAILURE_THRESHOLD", 2)
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(503 if len(requests) <= 2 else 400, json={"message": "unavailable"})
+
+        service = WhatsappService(transport=httpx.MockTransport(handler))
+        assert await service.send_message("+5511999999999", "Olá") is False
+        assert await service.send_message("+5511999999999", "Olá") is False
+        # Twilio is no longer called until the reset timeout has passed.
+        with pytest.raises(CircuitOpenError):
+            await service.send_message("+5511999999999", "Olá")
+        assert len(requests) == 2
+        assert service.stats()["circuit_breaker"]["state"] == CIRCUIT_OPEN
+        await service.close()
+
+    async def test_without_credentials_the_message_is_only_simulated(self, monkeypatch):
+        monkeypatch.setattr(settings, "TWILIO_ACCOUNT_SID", None)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("no request expected")
+
+        service = WhatsappService(transport=httpx.MockTransport(handler))
+        assert service.client is None
+        assert await service.send_message("+5511999999999", "Olá") is True
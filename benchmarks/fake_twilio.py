@@ -0,0 +1,85 @@
+"""Local stand-in for Twilio's Messages API, to load-test the notification path offline.
+
+Accepts the same POST ``WhatsappService`` sends and answers like Twilio, after a
+configurable latency and with a configurable share of 500 and 429 responses:
+
+    python -m benchmarks.fake_twilio --port 8099 --latency-ms 150 --jitter-ms 50 --error-rate 0.02
+
+Then point the API at it with TWILIO_API_BASE_URL=http://127.0.0.1:8099 (any
+TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN and TWILIO_WHATSAPP_FROM_NUMBER will do).
+GET /stats returns what it received so far. ``benchmarks.notification_throughput``
+mounts the same app in-process when no --twilio-url is given.
+"""
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(
+    latency_ms: float = 100.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    seed: int = 42
+) -> FastAPI:
+    app = FastAPI(title="Fake Twilio")
+    rng = random.Random(seed)
+    app.state.stats = {"requests": 0, "accepted": 0, "errors": 0, "throttled": 0}
+
+    @app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+    async def create_message(account_sid: str, request: Request):
+        form = {key: values[0] for key, values in parse_qs((await request.body()).decode()).items()}
+        stats = request.app.state.stats
+        stats["requests"] += 1
+        await asyncio.sleep(max(latency_ms + rng.uniform(-jitter_ms, jitter_ms), 0) / 1000)
+
+        outcome = rng.random()
+        if outcome < throttle_rate:
+            stats["throttled"] += 1
+            return JSONResponse(status_code=429, content={"code": 20429, "message": "Too Many Requests", "status": 429})
+        if outcome < throttle_rate + error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=500, content={"code": 20500, "message": "Internal Server Error", "status": 500})
+        stats["accepted"] += 1
+        return JSONResponse(status_code=201, content={
+            "sid": f"SM{uuid4().hex}",
+            "account_sid": account_sid,
+            "from": form.get("From"),
+            "to": form.get("To"),
+            "body": form.get("Body"),
+            "status": "queued",
+            "date_created": time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime()),
+        })
+
+    @app.get("/stats")
+    async def get_stats(request: Request):
+        return request.app.state.stats
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="mean response time")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- spread around the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of HTTP 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of HTTP 429 responses")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
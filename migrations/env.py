@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from dotenv import load_dotenv
 from app.db.base import Base
-from app.models.domain import CustomerModel, ProductModel, OrderModel, OrderProduct, UserModel, RefreshTokenModel
+from app.models.domain import CustomerModel, ProductModel, OrderModel, OrderProduct, UserModel, RefreshTokenModel, IdempotencyKeyModel, SalesDailyModel, ProductSalesDailyModel, OrderEventModel, OrderEventDeadLetterModel
 
 load_dotenv()
 
@@ -14,7 +14,8 @@ from alembic import context
 # access to the values within the .ini file in use.
 config = context.config
 
-config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
+# ConfigParser interpolation: a URL-encoded password or socket path must not be read as %(...)s.
+config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL").replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,56 @@
+"""Add composite and partial indexes for order, product and image queries
+
+Revision ID: a3f9c2d81b47
+Revises: c1614b69720a
+Create Date: 2026-10-16 21:40:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2d81b47'
+down_revision: Union[str, None] = 'c1614b69720a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    # OrderRepository.get_orders: ORDER BY created_at, id with optional date range
+    ('ix_orders_created_at_id', 'orders', ['created_at', 'id'], None),
+    # ... filtered by customer_id or status
+    ('ix_orders_customer_id_created_at_id', 'orders', ['customer_id', 'created_at', 'id'], None),
+    ('ix_orders_status_created_at_id', 'orders', ['status', 'created_at', 'id'], None),
+    # section filter join and FK lookups; the PK only covers (order_id, product_id)
+    ('ix_order_products_product_id', 'order_products', ['product_id'], None),
+    # selectinload(ProductModel.images)
+    ('ix_product_images_product_id', 'product_images', ['product_id'], None),
+    # ProductRepository.get_products filters
+    ('ix_products_section_price', 'products', ['section', 'price'], None),
+    ('ix_products_in_stock_id', 'products', ['id'], 'stock > 0'),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
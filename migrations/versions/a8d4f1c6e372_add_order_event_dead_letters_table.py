@@ -0,0 +1,49 @@
+"""Add order_event_dead_letters table
+
+Revision ID: a8d4f1c6e372
+Revises: f6c2d8e4b179
+Create Date: 2026-10-17 02:41:09.318562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4f1c6e372'
+down_revision: Union[str, None] = 'f6c2d8e4b179'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('order_event_dead_letters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=True),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('replay_attempts', sa.Integer(), nullable=False),
+    sa.Column('failed_at', sa.DateTime(), nullable=False),
+    sa.Column('replayed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_event_dead_letters_unreplayed', 'order_event_dead_letters', ['id'], unique=False,
+                    postgresql_where=sa.text('replayed_at IS NULL'))
+    # Outbox rows that already failed before this table existed.
+    op.execute(
+        "INSERT INTO order_event_dead_letters "
+        "(event_id, order_id, event_type, payload, error, attempts, replay_attempts, failed_at) "
+        "SELECT id, order_id, event_type, payload, last_error, attempts, 0, processed_at "
+        "FROM order_events WHERE delivery_status = 'failed' AND processed_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_event_dead_letters_unreplayed', table_name='order_event_dead_letters',
+                  postgresql_where=sa.text('replayed_at IS NULL'))
+    op.drop_table('order_event_dead_letters')
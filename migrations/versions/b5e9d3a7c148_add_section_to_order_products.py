@@ -0,0 +1,46 @@
+"""Add section to order_products
+
+Revision ID: b5e9d3a7c148
+Revises: a8d4f1c6e372
+Create Date: 2026-10-17 03:26:47.105283
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e9d3a7c148'
+down_revision: Union[str, None] = 'a8d4f1c6e372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Created by ``python -m app.db.partitioning archive`` with the same columns as order_products.
+ARCHIVE_TABLE = 'order_products_archive'
+
+
+def _line_tables() -> list:
+    tables = ['order_products']
+    if sa.inspect(op.get_bind()).has_table(ARCHIVE_TABLE):
+        tables.append(ARCHIVE_TABLE)
+    return tables
+
+
+def upgrade() -> None:
+    # Existing lines take their product's current section, the best record there is of it.
+    for table in _line_tables():
+        op.add_column(table, sa.Column('section', sa.String(), nullable=True))
+        op.execute(f"""
+            UPDATE {table} op
+            SET section = p.section
+            FROM products p
+            WHERE p.id = op.product_id
+        """)
+        op.alter_column(table, 'section', nullable=False)
+
+
+def downgrade() -> None:
+    for table in _line_tables():
+        op.drop_column(table, 'section')
@@ -0,0 +1,66 @@
+"""Add sales_daily and product_sales_daily aggregate tables
+
+Revision ID: c52e8f1a7d3b
+Revises: b7e41d9a6c05
+Create Date: 2026-10-16 23:48:19.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e8f1a7d3b'
+down_revision: Union[str, None] = 'b7e41d9a6c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+order_status = postgresql.ENUM(name='order_status', create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('section', sa.String(), nullable=False),
+    sa.Column('status', order_status, nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'section', 'status')
+    )
+    op.create_table('product_sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('status', order_status, nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'product_id', 'status')
+    )
+
+    # Backfill from the existing orders; from here on OrderService keeps both tables current.
+    op.execute("""
+        INSERT INTO sales_daily (day, section, status, orders, units, revenue)
+        SELECT CAST(o.created_at AS DATE), p.section, o.status,
+               COUNT(DISTINCT o.id), SUM(op.quantity), SUM(op.quantity * op.unit_price)
+        FROM orders o
+        JOIN order_products op ON op.order_id = o.id
+        JOIN products p ON p.id = op.product_id
+        GROUP BY CAST(o.created_at AS DATE), p.section, o.status
+    """)
+    op.execute("""
+        INSERT INTO product_sales_daily (day, product_id, status, units, revenue)
+        SELECT CAST(o.created_at AS DATE), op.product_id, o.status,
+               SUM(op.quantity), SUM(op.quantity * op.unit_price)
+        FROM orders o
+        JOIN order_products op ON op.order_id = o.id
+        GROUP BY CAST(o.created_at AS DATE), op.product_id, o.status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('product_sales_daily')
+    op.drop_table('sales_daily')
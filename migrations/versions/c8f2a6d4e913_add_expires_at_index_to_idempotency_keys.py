@@ -0,0 +1,42 @@
+"""Add expires_at index to idempotency_keys
+
+Revision ID: c8f2a6d4e913
+Revises: b5e9d3a7c148
+Create Date: 2026-10-17 14:12:08.406531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6d4e913'
+down_revision: Union[str, None] = 'b5e9d3a7c148'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IdempotencyRepository.purge_expired: WHERE expires_at <= now ORDER BY expires_at LIMIT n
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_idempotency_keys_expires_at',
+            'idempotency_keys',
+            ['expires_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_idempotency_keys_expires_at',
+            table_name='idempotency_keys',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
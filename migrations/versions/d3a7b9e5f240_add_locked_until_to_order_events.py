@@ -0,0 +1,26 @@
+"""Add locked_until to order_events
+
+Revision ID: d3a7b9e5f240
+Revises: c8f2a6d4e913
+Create Date: 2026-10-17 15:04:51.772930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7b9e5f240'
+down_revision: Union[str, None] = 'c8f2a6d4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('order_events', sa.Column('locked_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('order_events', 'locked_until')
@@ -0,0 +1,45 @@
+"""Partition orders by created_at month (opt-in)
+
+Revision ID: d9e4f7a2b816
+Revises: c52e8f1a7d3b
+Create Date: 2026-10-17 00:41:07.318552
+
+Only converts the table when asked to:
+
+    alembic -x partition_orders=true upgrade head
+
+Otherwise the revision is recorded without touching ``orders``; it can be partitioned
+later with ``python -m app.db.partitioning partition``.
+
+Partitioning drops the ``order_products.order_id`` foreign key: PostgreSQL can only
+reference a partitioned table through a unique key that includes ``created_at``, which
+``order_products`` does not store. While ``orders`` is partitioned, integrity rests on the
+application, which writes, deletes (ORM cascade) and archives the lines together with their
+order. The downgrade converts the table back and restores the key, checking first that no
+line points at a missing order.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+from app.db.partitioning import partition_orders, restore_order_lines_foreign_key, unpartition_orders
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4f7a2b816'
+down_revision: Union[str, None] = 'c52e8f1a7d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    opt_in = context.get_x_argument(as_dictionary=True).get('partition_orders', '')
+    if opt_in.lower() not in ('1', 'true', 'yes'):
+        return
+    partition_orders(op.get_bind())
+
+
+def downgrade() -> None:
+    # unpartition_orders restores the key itself; this also covers a table converted back by hand.
+    unpartition_orders(op.get_bind())
+    restore_order_lines_foreign_key(op.get_bind())
@@ -0,0 +1,41 @@
+"""Add order_events outbox table
+
+Revision ID: e3b8c1f5a924
+Revises: d9e4f7a2b816
+Create Date: 2026-10-17 01:12:36.904218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8c1f5a924'
+down_revision: Union[str, None] = 'd9e4f7a2b816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('order_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_events_pending', 'order_events', ['available_at', 'id'], unique=False,
+                    postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_events_pending', table_name='order_events',
+                  postgresql_where=sa.text('processed_at IS NULL'))
+    op.drop_table('order_events')
@@ -0,0 +1,42 @@
+"""Add section index to order_products
+
+Revision ID: e7c4f1a9b352
+Revises: d3a7b9e5f240
+Create Date: 2026-10-17 16:21:37.590214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c4f1a9b352'
+down_revision: Union[str, None] = 'd3a7b9e5f240'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # OrderRepository.get_orders(product_section=...): EXISTS on order_products.section, per order or per section.
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_products_section_order_id',
+            'order_products',
+            ['section', 'order_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_order_products_section_order_id',
+            table_name='order_products',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,32 @@
+"""Add delivery_status to order_events
+
+Revision ID: f6c2d8e4b179
+Revises: e3b8c1f5a924
+Create Date: 2026-10-17 01:58:22.410937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8e4b179'
+down_revision: Union[str, None] = 'e3b8c1f5a924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('order_events', sa.Column('delivery_status', sa.String(length=20), nullable=False, server_default='pending'))
+    op.execute("""
+        UPDATE order_events
+        SET delivery_status = CASE WHEN last_error IS NULL THEN 'sent' ELSE 'failed' END
+        WHERE processed_at IS NOT NULL
+    """)
+    op.alter_column('order_events', 'delivery_status', server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('order_events', 'delivery_status')